@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: compiled register decoder vs per-field lookup path
+
+For every profile in custom_components/growatt_modbus/profiles, fills a raw
+register image with pseudo-random values and times:
+
+  legacy   - per-field linear name scan + dict-based pair decode (the decode
+             path used by read_all_data() before the compiled decoder)
+  python   - compiled decoder, pure-Python fallback
+  numpy    - compiled decoder, NumPy-backed (if NumPy is installed)
+
+All paths are checked to produce identical values before timing.
+
+Usage:
+    python bench_decoder.py [iterations]
+"""
+
+import importlib
+import os
+import random
+import sys
+import timeit
+import types
+
+# Load the integration modules without importing Home Assistant
+base_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'custom_components', 'growatt_modbus')
+package = types.ModuleType('_growatt_bench')
+package.__path__ = [base_path]
+sys.modules['_growatt_bench'] = package
+
+decoder = importlib.import_module('_growatt_bench.decoder')
+const = importlib.import_module('_growatt_bench.const')
+REGISTER_MAPS = const.REGISTER_MAPS
+
+
+def legacy_find(input_regs, name):
+    """Linear name/alias scan (old _find_register_by_name)"""
+    for addr, reg_info in input_regs.items():
+        if reg_info['name'] == name or reg_info.get('alias') == name:
+            return addr
+    return None
+
+
+def legacy_value(input_regs, cache, address):
+    """Dict-based decode (old _get_register_value)"""
+    reg_info = input_regs.get(address)
+    if not reg_info:
+        return None
+    raw_value = cache.get(address)
+    if raw_value is None:
+        return None
+    pair_addr = reg_info.get('pair')
+    if pair_addr is not None:
+        pair_info = input_regs.get(pair_addr)
+        if not pair_info:
+            return raw_value * reg_info.get('scale', 1)
+        if address < pair_addr:
+            combined = (raw_value << 16) | cache.get(pair_addr, 0)
+            combined_scale = pair_info.get('combined_scale', 1)
+        else:
+            combined = (cache.get(pair_addr, 0) << 16) | raw_value
+            combined_scale = reg_info.get('combined_scale', 1)
+        if (reg_info.get('signed') or pair_info.get('signed')) and combined > 0x7FFFFFFF:
+            combined -= 0x100000000
+        return combined * combined_scale
+    if reg_info.get('signed') and raw_value > 0x7FFF:
+        raw_value -= 0x10000
+    return raw_value * reg_info.get('scale', 1)
+
+
+def legacy_decode(input_regs, cache):
+    """Decode every field the way read_all_data() used to, one lookup at a time"""
+    values = {'status': legacy_value(input_regs, cache, min(input_regs))}
+    for field, names in decoder.FIELD_REGISTERS:
+        for name in names:
+            addr = legacy_find(input_regs, name)
+            if addr is not None:
+                values[field] = legacy_value(input_regs, cache, addr)
+                break
+    return values
+
+
+def bench_profile(key, iterations):
+    input_regs = REGISTER_MAPS[key]['input_registers']
+    compiled = decoder.get_decoder(key)
+
+    rng = random.Random(key)
+    cache = {}
+    for first, last, _offset in compiled.layout.spans:
+        for addr in range(first, last + 1):
+            cache[addr] = rng.randrange(0x10000)
+
+    images = {}
+    for use_numpy in ([False, True] if decoder.NUMPY_AVAILABLE else [False]):
+        image = decoder.RegisterImage(compiled.layout, use_numpy=use_numpy)
+        for first, last, _offset in compiled.layout.spans:
+            image.store(first, [cache[addr] for addr in range(first, last + 1)])
+        images['numpy' if use_numpy else 'python'] = image
+
+    # Correctness: every path must agree
+    expected = legacy_decode(input_regs, cache)
+    for label, image in images.items():
+        got = dict(zip(compiled.fields, compiled.decode_values(image)))
+        if got != expected:
+            raise AssertionError(f"{key}: {label} decoder disagrees with legacy path")
+
+    timings = {'legacy': timeit.timeit(lambda: legacy_decode(input_regs, cache), number=iterations)}
+    for label, image in images.items():
+        timings[label] = timeit.timeit(lambda: compiled.decode_values(image), number=iterations)
+    return len(compiled.fields), {label: t / iterations * 1e6 for label, t in timings.items()}
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    columns = ['legacy', 'python'] + (['numpy'] if decoder.NUMPY_AVAILABLE else [])
+
+    print(f"Decoder microbenchmark ({iterations} iterations, µs per poll)")
+    print(f"{'Profile':<32} {'fields':>6} " + " ".join(f"{c:>9}" for c in columns) + f" {'speedup':>8}")
+    print("-" * (49 + 10 * len(columns)))
+    for key in REGISTER_MAPS:
+        fields, timings = bench_profile(key, iterations)
+        best = min(timings[c] for c in columns if c != 'legacy')
+        print(f"{key:<32} {fields:>6} " + " ".join(f"{timings[c]:>9.1f}" for c in columns)
+              + f" {timings['legacy'] / best:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Test setup.
+
+The integration package's __init__ sets up the Home Assistant entry points,
+but the protocol modules (read plan, decoder, client, write queue, ...) do
+not import Home Assistant. Without Home Assistant installed, the package is
+registered without running its __init__, so those modules can be tested on
+their own.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+if importlib.util.find_spec('homeassistant') is None:
+    for name, path in (
+        ('custom_components', os.path.join(ROOT, 'custom_components')),
+        ('custom_components.growatt_modbus', os.path.join(ROOT, 'custom_components', 'growatt_modbus')),
+    ):
+        if name not in sys.modules:
+            package = types.ModuleType(name)
+            package.__path__ = [path]
+            sys.modules[name] = package
@@ -0,0 +1,327 @@
+"""
+Asyncio Growatt Modbus client.
+
+Mirrors GrowattModbus - same profiles, read plan, decoder and poll logic -
+on top of pymodbus's asyncio clients, so the coordinator polls from the event
+loop instead of holding an executor thread for the length of every poll
+(including the read interval sleeps). The blocking GrowattModbus remains for
+the config flow probes and command line tools.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .connection_pool import (
+    AsyncSharedConnection,
+    acquire_async_connection,
+    release_async_connection,
+)
+from .const import DEFAULT_MIN_READ_INTERVAL
+from .growatt_modbus import GrowattData, GrowattModbusBase, response_timeout
+from .read_plan import ReadBlock, REGISTER_TYPE_HOLDING
+from .write_queue import plan_write_runs
+
+logger = logging.getLogger(__name__)
+
+try:
+    # Asyncio clients are only available in pymodbus 3.x+
+    from pymodbus.client import AsyncModbusTcpClient, AsyncModbusSerialClient
+    ASYNC_AVAILABLE = True
+except ImportError:
+    ASYNC_AVAILABLE = False
+
+try:
+    # Serial transport additionally needs pyserial
+    import serial  # noqa: F401
+    ASYNC_SERIAL_AVAILABLE = ASYNC_AVAILABLE
+except ImportError:
+    ASYNC_SERIAL_AVAILABLE = False
+
+
+def async_supported(connection_type: str) -> bool:
+    """True if an asyncio client can be used for this connection type"""
+    if connection_type == 'serial':
+        return ASYNC_SERIAL_AVAILABLE
+    return ASYNC_AVAILABLE
+
+
+class AsyncGrowattModbus(GrowattModbusBase):
+    """Growatt Modbus client for use from the event loop"""
+
+    def __init__(self, connection_type='tcp', host='192.168.1.100', port=502,
+                 device='/dev/ttyUSB0', baudrate=9600, slave_id=1,
+                 register_map='MIN_7000_10000TL_X', timeout=10,
+                 persistent=False, idle_timeout=120, shared=False,
+                 min_read_interval=DEFAULT_MIN_READ_INTERVAL):
+        """Same arguments as GrowattModbus"""
+        self._connection: Optional[AsyncSharedConnection] = None
+        super().__init__(connection_type, host, port, device, baudrate, slave_id,
+                         register_map, timeout, persistent, idle_timeout, shared,
+                         min_read_interval)
+
+        if connection_type not in ('tcp', 'serial'):
+            raise ValueError("connection_type must be 'tcp' or 'serial'")
+        if not async_supported(connection_type):
+            raise ImportError(f"pymodbus asyncio client not available for {connection_type} connection")
+
+        factory = lambda: self._create_client(connection_type, host, port, device, baudrate)
+        if shared:
+            self._connection = acquire_async_connection(self.connection_key, factory, self.transport_settings,
+                                                        self.pacer)
+        else:
+            self._connection = AsyncSharedConnection(self.connection_key, factory(), self.transport_settings,
+                                                     self.pacer)
+            self._connection.users = 1
+        self.pacer = self._connection.pacer
+
+    def _create_client(self, connection_type, host, port, device, baudrate):
+        """Create the underlying pymodbus asyncio client"""
+        # reconnect_delay=0: reconnects are driven by ensure_connected/connect,
+        # not by pymodbus in the background. retries=0: failed blocks are only
+        # retried by RetryPolicy, not re-sent by pymodbus first
+        if connection_type == 'tcp':
+            logger.info(f"Connecting to Growatt via TCP (async): {host}:{port} (timeout: {self._timeout}s)")
+            return AsyncModbusTcpClient(host, port=port, timeout=self._timeout, retries=0, reconnect_delay=0)
+
+        logger.info(f"Connecting to Growatt via Serial (async): {device} @ {baudrate} baud (timeout: {self._timeout}s)")
+        return AsyncModbusSerialClient(
+            device,
+            baudrate=baudrate,
+            timeout=self._timeout,
+            retries=0,
+            parity='N',
+            stopbits=1,
+            bytesize=8,
+            reconnect_delay=0,
+        )
+
+    @property
+    def client(self):
+        """Underlying pymodbus asyncio client (shared with other inverters on the same link)"""
+        return self._connection.client if self._connection is not None else None
+
+    @client.setter
+    def client(self, value) -> None:
+        self._connection.client = value
+
+    @property
+    def bus_lock(self) -> asyncio.Lock:
+        """Lock serializing transactions on this client's bus"""
+        return self._connection.lock
+
+    async def connect(self) -> bool:
+        """Establish connection to inverter"""
+        try:
+            if self._holding_connection:
+                # Reconnect: drop our hold so a dead transport can be reopened
+                await self._connection.close()
+                self._holding_connection = False
+            result = await self._connection.open()
+            self._holding_connection = result
+            self._record_connect(result)
+            return result
+        except Exception as e:
+            self._record_connect(False, e)
+            return False
+
+    async def disconnect(self) -> None:
+        """Close connection"""
+        self._connected = False
+        if self._holding_connection:
+            # The transport stays open while other inverters on the link hold it
+            await self._connection.close()
+            self._holding_connection = False
+            logger.info(f"[{self.register_map['name']}@{self.connection_id}] Disconnected")
+
+    async def release(self) -> None:
+        """Disconnect and give up this client's share of the connection"""
+        if self._connection is None:
+            return
+        await self.disconnect()
+        if self.shared:
+            release_async_connection(self._connection)
+        else:
+            self._connection.client.close()
+        self._connection = None
+
+    async def ensure_connected(self) -> bool:
+        """Persistent mode: reuse the open connection if it is still healthy"""
+        now = time.monotonic()
+
+        if self._connected:
+            if self._connection_reusable(now):
+                return True
+            if self._connection_suspect:
+                await self._connection.reset()
+            await self.disconnect()
+
+        if not self._reconnect_allowed(now):
+            return False
+
+        result = await self.connect()
+        self._record_reconnect(result)
+        return result
+
+    async def _enforce_read_interval(self) -> float:
+        """Wait out the adaptive gap before the next read (without blocking the loop), returns the time slept"""
+        sleep_time = self._read_interval_delay()
+        if sleep_time > 0:
+            await asyncio.sleep(sleep_time)
+        return sleep_time
+
+    async def read_input_registers(self, start_address: int, count: int,
+                                   deadline: Optional[float] = None) -> Optional[list]:
+        """Read input registers with error handling, waiting for the response until the deadline at most"""
+        queued = started = time.monotonic()
+        pacing = 0.0
+        try:
+            async with self.bus_lock:
+                # The quiet gap follows the last response on the link, whichever inverter it was for
+                pacing = await self._enforce_read_interval()
+                started = time.monotonic()
+                with response_timeout(self.client, self._response_timeout(deadline)):
+                    response = await self._call_with_slave(self.client.read_input_registers,
+                                                           address=start_address, count=count)
+                latency = time.monotonic() - started
+            return self._registers_from_response(response, 'input', start_address, count, latency,
+                                                 started - queued - pacing, pacing)
+        except Exception as e:
+            logger.debug(f"Exception reading input registers: {e}")
+            self._transaction_failed('input', start_address, count,
+                                     started - queued - pacing, pacing, time.monotonic() - started)
+            return None
+
+    async def read_holding_registers(self, start_address: int, count: int,
+                                     deadline: Optional[float] = None) -> Optional[list]:
+        """Read holding registers with error handling, waiting for the response until the deadline at most"""
+        queued = started = time.monotonic()
+        pacing = 0.0
+        try:
+            async with self.bus_lock:
+                # The quiet gap follows the last response on the link, whichever inverter it was for
+                pacing = await self._enforce_read_interval()
+                started = time.monotonic()
+                with response_timeout(self.client, self._response_timeout(deadline)):
+                    response = await self._call_with_slave(self.client.read_holding_registers,
+                                                           address=start_address, count=count)
+                latency = time.monotonic() - started
+            return self._registers_from_response(response, REGISTER_TYPE_HOLDING, start_address, count, latency,
+                                                 started - queued - pacing, pacing)
+        except Exception as e:
+            logger.debug("Exception reading holding registers %d-%d: %s", start_address, start_address + count - 1, e)
+            self._transaction_failed(REGISTER_TYPE_HOLDING, start_address, count,
+                                     started - queued - pacing, pacing, time.monotonic() - started)
+            return None
+
+    async def _read_block(self, block: ReadBlock, deadline: Optional[float]) -> Optional[list]:
+        """Execute a single read plan transaction (see GrowattModbus._read_block)"""
+        if block.required:
+            deadline = None
+        if block.register_type == REGISTER_TYPE_HOLDING:
+            return await self.read_holding_registers(block.start, block.count, deadline)
+        return await self.read_input_registers(block.start, block.count, deadline)
+
+    async def _read_block_retrying(self, block: ReadBlock, deadline: float) -> Optional[list]:
+        """Execute a read plan transaction, retrying transient failures until the deadline"""
+        registers = await self._read_block(block, deadline)
+        attempt = 0
+        while registers is None:
+            delay = self._retry_delay(block, attempt, deadline)
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+            if not self._socket_open() and not await self.connect():
+                break
+            attempt += 1
+            self.last_exception_code = None
+            registers = await self._read_block(block, deadline)
+        return registers
+
+    async def read_all_data(self, tiers: Optional[Iterable[str]] = None,
+                            deadline: Optional[float] = None) -> Optional[GrowattData]:
+        """Read all relevant data from inverter (see GrowattModbus.read_all_data)"""
+        if deadline is None:
+            deadline = time.monotonic() + self.poll_budget
+        self.metrics.begin_poll()
+        poll = self._poll(tiers, deadline)
+        try:
+            block = next(poll)
+            while True:
+                block = poll.send(await self._read_block_retrying(block, deadline))
+        except StopIteration as done:
+            self.metrics.end_poll(done.value is not None)
+            return done.value
+
+    async def _prepare_write(self) -> bool:
+        """Make sure the connection is usable before a write, reconnecting if needed"""
+        if not self.client:
+            logger.error("[WRITE] Cannot write register - client not initialized")
+            return False
+
+        if not self._socket_open():
+            logger.warning("[WRITE] Socket not open, attempting reconnect...")
+            if not await self.connect():
+                logger.error("[WRITE] Reconnect failed - not connected")
+                return False
+            logger.info("[WRITE] Reconnect successful, proceeding with write")
+        return True
+
+    async def write_register(self, register: int, value: int) -> bool:
+        """Write a single holding register (see GrowattModbus.write_register)"""
+        try:
+            logger.debug(f"[WRITE] Request to write register {register} with value {value}")
+
+            if not await self._prepare_write():
+                return False
+
+            logger.debug(f"[WRITE] Sending write_register({register}, {value}) to inverter")
+            async with self.bus_lock:
+                result = await self._call_with_slave(self.client.write_register, address=register, value=value)
+            return self._write_succeeded(result, register, value)
+
+        except Exception as e:
+            logger.error(f"[WRITE] Exception writing register {register}: {e}")
+            self._mark_activity(False)
+            return False
+
+    async def write_registers(self, register: int, values: List[int]) -> bool:
+        """Write consecutive holding registers in one request (see GrowattModbus.write_registers)"""
+        try:
+            logger.debug(f"[WRITE] Request to write registers {register}-{register + len(values) - 1} with values {values}")
+            self.last_exception_code = None
+
+            if not await self._prepare_write():
+                return False
+
+            async with self.bus_lock:
+                result = await self._call_with_slave(self.client.write_registers, address=register, values=values)
+            return self._write_succeeded(result, register, values)
+
+        except Exception as e:
+            logger.error(f"[WRITE] Exception writing registers {register}-{register + len(values) - 1}: {e}")
+            self._mark_activity(False)
+            return False
+
+    async def write_batch(self, writes: Dict[int, int]) -> Dict[int, bool]:
+        """Write several holding registers and read them back (see GrowattModbus.write_batch)"""
+        results: Dict[int, bool] = {}
+        written: Dict[int, int] = {}
+        for start, values in self._write_runs(writes):
+            if len(values) == 1:
+                outcomes = [await self.write_register(start, values[0])]
+            else:
+                success = await self.write_registers(start, values)
+                if not success and self._write_multiple_refused(start, values):
+                    outcomes = [await self.write_register(start + offset, value) for offset, value in enumerate(values)]
+                else:
+                    outcomes = [success] * len(values)
+            for offset, (value, success) in enumerate(zip(values, outcomes)):
+                results[start + offset] = success
+                if success:
+                    written[start + offset] = value
+        # Read back only the written registers, adjacent ones in one request
+        for start, values in plan_write_runs(written):
+            self._store_read_back(start, values, await self.read_holding_registers(start, len(values)))
+        return results
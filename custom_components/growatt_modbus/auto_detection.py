@@ -6,15 +6,23 @@ solax-modbus plugin's async_determineInverterType function.
 
 It reads the inverter's serial number and model information to automatically
 select the correct profile.
+
+Detection is a single discovery pass in one executor job. Every profile
+signature - DTC, protocol version, model name, range presence - is evaluated
+against a probe table that reads each register at most once, together with
+the other registers of its probe (wide where the registers belong to one
+range, narrow where a register's presence is the signal). Spans the device
+rejects are retried register by register.
 """
 
 import logging
-from typing import Optional, Tuple
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
 
 from homeassistant.core import HomeAssistant
 
 from .device_profiles import INVERTER_PROFILES, get_profile
 from .growatt_modbus import GrowattModbus
+from .read_plan import REGISTER_TYPE_HOLDING, REGISTER_TYPE_INPUT
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -169,152 +177,170 @@ async def async_read_serial_number(
         return None
 
 
-async def async_read_model_name(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    device_id: int = 1
-) -> Optional[str]:
-    """
-    Read inverter model name from holding registers.
-    
-    Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        device_id: Modbus device ID (default 1)
-    
-    Returns:
-        Model name string or None
-    """
-    try:
-        # Read 5 registers starting at address 0
-        result = await hass.async_add_executor_job(
-            lambda: client.client.read_holding_registers(address=0, count=5)
-        )
-        
-        if result.isError():
-            _LOGGER.debug(f"Error reading model name: {result}")
-            return None
-        
-        # Convert registers to string
-        model_bytes = []
-        for register in result.registers:
-            high_byte = (register >> 8) & 0xFF
-            low_byte = register & 0xFF
-            model_bytes.extend([high_byte, low_byte])
-        
-        # Convert bytes to string and strip null characters
-        model_name = bytes(model_bytes).decode('ascii', errors='ignore').strip('\x00').strip()
-        
-        if model_name:
-            _LOGGER.debug(f"Read model name: {model_name}")
-            return model_name
-        
-        return None
-        
-    except Exception as e:
-        _LOGGER.debug(f"Exception reading model name: {str(e)}")
-        return None
 
+class ProbeRead(NamedTuple):
+    """One discovery read covering `addresses` (in a single request where possible)"""
+    register_type: str
+    addresses: Tuple[int, ...]
+    split_on_error: bool = True  # Retry one register at a time if the span is rejected
 
-async def async_read_dtc_code_offgrid(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    device_id: int = 1
-) -> Optional[int]:
-    """
-    Read DTC (Device Type Code) from OffGrid protocol registers.
+    @property
+    def start(self) -> int:
+        return self.addresses[0]
 
-    OffGrid inverters (SPF series) use a different register layout than VPP 2.01.
-    CRITICAL: Reading VPP registers (30000+, 31000+) causes POWER RESETS on SPF inverters!
+    @property
+    def count(self) -> int:
+        return self.addresses[-1] - self.addresses[0] + 1
 
-    OffGrid DTC locations:
-    - Input register 34 (PRIMARY - safe, read-only)
-    - Holding register 43 (FALLBACK)
 
-    Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        device_id: Modbus device ID (default 1)
+# Discovery reads. Registers are read on first use together with the rest of
+# their probe. Registers whose mere presence identifies a model are probed on
+# their own - a wider read could succeed on a device that lacks them.
+PROBES = (
+    # Safe for every inverter, including OffGrid (SPF) models
+    ProbeRead(REGISTER_TYPE_INPUT, (11, 34, 38, 42, 46)),  # PV3 voltage, OffGrid DTC, phase voltages
+    ProbeRead(REGISTER_TYPE_HOLDING, (0, 1, 2, 3, 4), split_on_error=False),  # Model name
+    ProbeRead(REGISTER_TYPE_HOLDING, (43,)),           # OffGrid DTC fallback
+    ProbeRead(REGISTER_TYPE_INPUT, (1000,)),           # Storage range (SPH TL3)
+    ProbeRead(REGISTER_TYPE_INPUT, (3003,)),           # MIN/MOD 3000 range (PV1 voltage)
+    ProbeRead(REGISTER_TYPE_INPUT, (3011,)),           # PV3 voltage (MIN 7-10kW)
+    ProbeRead(REGISTER_TYPE_INPUT, (3169,)),           # Battery voltage (SPH/TL-XH/MOD)
+    # VPP registers - only once the inverter is known not to be OffGrid
+    ProbeRead(REGISTER_TYPE_HOLDING, (30000, 30099)),  # VPP DTC, protocol version
+    ProbeRead(REGISTER_TYPE_INPUT, (31010, 31018)),    # V2.01 PV1 / PV3 voltage
+    ProbeRead(REGISTER_TYPE_INPUT, (31200, 31217)),    # V2.01 battery power / SOC
+)
 
-    Returns:
-        DTC code (int) or None if read fails
+# CRITICAL: OffGrid inverters (SPF) will RESET if VPP registers (30000+, 31000+)
+# are accessed! The probe table refuses them until vpp_allowed is set.
+VPP_REGISTER_START = 30000
+
+
+class ProbeTable:
     """
-    # Try input register 34 first (safest - read-only)
-    try:
-        result = await hass.async_add_executor_job(
-            client.read_input_registers, 34, 1
-        )
+    Results of the discovery reads: register value by address, None if not readable.
 
-        if result is not None and len(result) > 0:
-            dtc_code = result[0]
-            if dtc_code and dtc_code > 0:
-                _LOGGER.info(f"✓ OffGrid DTC Detection - Read DTC code: {dtc_code} from input register 34")
-                return dtc_code
+    Every register is read at most once; the first lookup of a register reads
+    its whole probe. Lookups block on Modbus I/O - evaluate in the executor.
+    """
 
-    except Exception as e:
-        _LOGGER.debug(f"Could not read DTC from input register 34: {str(e)}")
+    def __init__(self, client: GrowattModbus, probes: Iterable[ProbeRead] = PROBES):
+        self._client = client
+        self._probes = {(probe.register_type, address): probe
+                        for probe in probes for address in probe.addresses}
+        self._values: Dict[Tuple[str, int], Optional[int]] = {}
+        self._rejected = set()  # Probes whose span was rejected - read per register
+        self.vpp_allowed = False
+        self.reads = 0
+
+    def value(self, register_type: str, address: int) -> Optional[int]:
+        """Value read from a register, None if it was not readable"""
+        key = (register_type, address)
+        if key not in self._values:
+            if address >= VPP_REGISTER_START and not self.vpp_allowed:
+                _LOGGER.error(f"Refusing to probe VPP register {address} before the OffGrid check")
+                return None
+            self._fetch(register_type, address)
+        return self._values.get(key)
+
+    def _fetch(self, register_type: str, address: int) -> None:
+        probe = self._probes.get((register_type, address))
+        if probe is None or len(probe.addresses) == 1 or probe in self._rejected:
+            registers = self._read(register_type, address, 1)
+            self._values[(register_type, address)] = registers[0] if registers is not None else None
+            return
+
+        registers = self._read(register_type, probe.start, probe.count)
+        if registers is not None:
+            for probe_address in probe.addresses:
+                self._values[(register_type, probe_address)] = registers[probe_address - probe.start]
+        elif probe.split_on_error:
+            _LOGGER.debug(f"Probe {register_type} {probe.start}-{probe.start + probe.count - 1} rejected, reading registers individually")
+            self._rejected.add(probe)
+            self._fetch(register_type, address)
+        else:
+            for probe_address in probe.addresses:
+                self._values[(register_type, probe_address)] = None
 
-    # Fallback to holding register 43
-    try:
-        result = await hass.async_add_executor_job(
-            lambda: client.client.read_holding_registers(address=43, count=1)
-        )
+    def _read(self, register_type: str, start: int, count: int) -> Optional[list]:
+        self.reads += 1
+        if register_type == REGISTER_TYPE_HOLDING:
+            registers = self._client.read_holding_registers(start, count)
+        else:
+            registers = self._client.read_input_registers(start, count)
+        if registers is None or len(registers) < count:
+            return None
+        return registers
 
-        if not result.isError():
-            dtc_code = result.registers[0]
-            if dtc_code and dtc_code > 0:
-                _LOGGER.info(f"✓ OffGrid DTC Detection - Read DTC code: {dtc_code} from holding register 43")
-                return dtc_code
+    def present(self, register_type: str, address: int) -> bool:
+        """Register exists (even if its value is 0)"""
+        return self.value(register_type, address) is not None
 
-    except Exception as e:
-        _LOGGER.debug(f"Could not read DTC from holding register 43: {str(e)}")
+    def positive(self, register_type: str, address: int) -> bool:
+        """Register exists and holds a non-zero value"""
+        value = self.value(register_type, address)
+        return value is not None and value > 0
 
-    _LOGGER.debug("No OffGrid DTC found in registers 34 or 43")
-    return None
+    def ascii(self, register_type: str, addresses: Iterable[int]) -> Optional[str]:
+        """Decode registers as an ASCII string (None if any is missing)"""
+        values = [self.value(register_type, address) for address in addresses]
+        if not values or any(value is None for value in values):
+            return None
+        raw = bytes(byte for value in values for byte in ((value >> 8) & 0xFF, value & 0xFF))
+        return raw.decode('ascii', errors='ignore').strip('\x00').strip() or None
 
 
-async def async_read_dtc_code(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    device_id: int = 1
-) -> Optional[int]:
+def model_name_from_probes(table: ProbeTable) -> Optional[str]:
+    """Inverter model name from holding registers 0-4"""
+    model_name = table.ascii(REGISTER_TYPE_HOLDING, range(0, 5))
+    if model_name:
+        _LOGGER.debug(f"Read model name: {model_name}")
+    return model_name
+
+
+def offgrid_dtc_from_probes(table: ProbeTable) -> Optional[int]:
     """
-    Read DTC (Device Type Code) from VPP 2.01 holding register 30000.
+    DTC (Device Type Code) from the OffGrid protocol registers.
 
-    WARNING: This register causes POWER RESETS on OffGrid inverters (SPF series)!
-    Use async_read_dtc_code_offgrid() first to safely detect OffGrid models.
+    OffGrid inverters (SPF series) use a different register layout than VPP 2.01.
+    OffGrid DTC locations:
+    - Input register 34 (PRIMARY - safe, read-only)
+    - Holding register 43 (FALLBACK)
+    """
+    if table.positive(REGISTER_TYPE_INPUT, 34):
+        dtc_code = table.value(REGISTER_TYPE_INPUT, 34)
+        _LOGGER.info(f"✓ OffGrid DTC Detection - Read DTC code: {dtc_code} from input register 34")
+        return dtc_code
+    if table.positive(REGISTER_TYPE_HOLDING, 43):
+        dtc_code = table.value(REGISTER_TYPE_HOLDING, 43)
+        _LOGGER.info(f"✓ OffGrid DTC Detection - Read DTC code: {dtc_code} from holding register 43")
+        return dtc_code
 
-    This is the standard DTC location for VPP 2.01 protocol inverters.
+    _LOGGER.debug("No OffGrid DTC found in registers 34 or 43")
+    return None
 
-    Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        device_id: Modbus device ID (default 1)
 
-    Returns:
-        DTC code (int) or None if read fails
+def vpp_dtc_from_probes(table: ProbeTable) -> Optional[int]:
     """
-    try:
-        # Read DTC from holding register 30000
-        result = await hass.async_add_executor_job(
-            lambda: client.client.read_holding_registers(address=30000, count=1)
-        )
+    DTC (Device Type Code) from VPP 2.01 holding register 30000.
 
-        if result.isError():
-            _LOGGER.warning(f"Failed to read DTC code from register 30000: {result}")
-            return None
+    Only readable once the OffGrid check allowed VPP registers.
+    """
+    dtc_code = table.value(REGISTER_TYPE_HOLDING, 30000)
+    if dtc_code is None:
+        _LOGGER.warning("Failed to read DTC code from register 30000")
+        return None
+    if dtc_code > 0:
+        _LOGGER.info(f"✓ VPP DTC Detection - Read DTC code: {dtc_code} from holding register 30000")
+        return dtc_code
+    _LOGGER.warning(f"DTC code register 30000 returned 0 or invalid value: {dtc_code}")
+    return None
 
-        dtc_code = result.registers[0]
-        if dtc_code and dtc_code > 0:
-            _LOGGER.info(f"✓ VPP DTC Detection - Read DTC code: {dtc_code} from holding register 30000")
-            return dtc_code
-        else:
-            _LOGGER.warning(f"DTC code register 30000 returned 0 or invalid value: {dtc_code}")
-            return None
 
-    except Exception as e:
-        _LOGGER.warning(f"Exception reading DTC code from register 30000: {str(e)}")
-        return None
+def protocol_version_from_probes(table: ProbeTable) -> Optional[int]:
+    """VPP protocol version from holding register 30099 (e.g. 201 = V2.01), None if legacy"""
+    version = table.value(REGISTER_TYPE_HOLDING, 30099)
+    return version if version else None
 
 
 def detect_profile_from_dtc(dtc_code: int) -> Optional[str]:
@@ -388,369 +414,264 @@ def detect_profile_from_dtc(dtc_code: int) -> Optional[str]:
     return None
 
 
-async def async_detect_inverter_series(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    device_id: int = 1
-) -> Optional[str]:
+def detect_series_from_probes(table: ProbeTable) -> str:
     """
-    Detect inverter series by probing different register ranges.
-    
-    Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        device_id: Modbus device ID
-    
-    Returns:
-        Profile key or None
+    Detect inverter series from the register ranges present in the probe table.
+
+    Used when neither a DTC nor the model name identified the inverter.
     """
-    try:
-        # Ensure client is connected
-        if not await hass.async_add_executor_job(client.connect):
-            _LOGGER.error("Failed to connect to inverter for detection")
-            return None
-        
-        # CHECK MIN SERIES FIRST (uses 3000 range)
-        # Test for PV1 at register 3003 to confirm MIN series
-        min_test = await hass.async_add_executor_job(
-            client.read_input_registers, 3003, 1
-        )
-        if min_test is not None:
-            _LOGGER.debug("Detected 3000-range registers - MIN series inverter")
-
-            # Check for battery in VPP range (31200+) to detect MIN TL-XH hybrid variant
-            battery_test = await hass.async_add_executor_job(
-                client.read_input_registers, 31217, 1  # Battery SOC in VPP range
-            )
-            if battery_test is not None and len(battery_test) > 0 and battery_test[0] > 0:
-                _LOGGER.debug("Detected battery in 31200+ range - MIN TL-XH hybrid variant")
-                await hass.async_add_executor_job(client.disconnect)
-                return 'min_tl_xh_3000_10000_v201'
-
-            # Test for PV3 at register 3011 (MIN 7-10k has 3 strings)
-            pv3_test = await hass.async_add_executor_job(
-                client.read_input_registers, 3011, 1
-            )
-            if pv3_test is not None:  # Register exists, even if value is 0
-                _LOGGER.debug("Detected PV3 register - MIN 7000-10000TL-X")
-                await hass.async_add_executor_job(client.disconnect)
-                return 'min_7000_10000_tl_x'
-            else:
-                _LOGGER.debug("No PV3 register - MIN 3000-6000TL-X")
-                await hass.async_add_executor_job(client.disconnect)
-                return 'min_3000_6000_tl_x'
-        
-        # Test for battery registers at 3169 (SPH/TL-XH/MOD specific)
-        result = await hass.async_add_executor_job(
-            client.read_input_registers, 3169, 1
-        )
-        if result is not None:
-            _LOGGER.debug("Detected battery voltage register returns value")
-            
-            # Check for 3-phase at register 42 (S-phase voltage)
-            phase_s_test = await hass.async_add_executor_job(
-                client.read_input_registers, 42, 1
-            )
-            # Check for 3-phase at register 46 (T-phase voltage)
-            phase_t_test = await hass.async_add_executor_job(
-                client.read_input_registers, 46, 1
-            )
-            
-            if phase_s_test and phase_t_test:
-                _LOGGER.debug("Detected 3-phase with battery register - SPH TL3 or MOD series")
-
-                # Check for MOD-specific 31200 range (battery power per VPP Protocol V2.01)
-                mod_test = await hass.async_add_executor_job(
-                    client.read_input_registers, 31200, 1
-                )
-                if mod_test is not None:
-                    _LOGGER.debug("Detected 31200 range (VPP Protocol) - MOD-XH hybrid")
-                    await hass.async_add_executor_job(client.disconnect)
-                    return 'mod_6000_15000tl3_xh'
-
-                # Check for register 1000 range (SPH TL3 specific)
-                storage_test = await hass.async_add_executor_job(
-                    client.read_input_registers, 1000, 1
-                )
-                if storage_test is not None:
-                    _LOGGER.debug("Detected storage range - SPH TL3 series")
-                    await hass.async_add_executor_job(client.disconnect)
-                    return 'sph_tl3_3000_10000'
-                else:
-                    _LOGGER.info("No distinctive registers found - defaulting to MOD-XH hybrid")
-                    await hass.async_add_executor_job(client.disconnect)
-                    return 'mod_6000_15000tl3_xh'
-            else:
-                _LOGGER.debug("Detected single-phase hybrid - SPH or TL-XH series")
-                await hass.async_add_executor_job(client.disconnect)
-                return 'sph_7000_10000'  # Default to SPH 7-10k
-        
-        # Test for 3-phase at register 38 (MID/MAX/MOD-X grid-tied)
-        result = await hass.async_add_executor_job(
-            client.read_input_registers, 38, 1
-        )
-        if result:
-            # Check register 42 for second phase
-            phase2 = await hass.async_add_executor_job(
-                client.read_input_registers, 42, 1
-            )
-            if phase2:
-                _LOGGER.debug("Detected 3-phase grid-tied inverter")
-
-                # Check for 3000 range (MOD-X uses 3000 range, MID uses 0-124)
-                mod_range_test = await hass.async_add_executor_job(
-                    client.read_input_registers, 3003, 1
-                )
-                if mod_range_test is not None:
-                    _LOGGER.debug("Detected 3000 range - MOD-X grid-tied (no battery)")
-                    await hass.async_add_executor_job(client.disconnect)
-                    return 'mod_6000_15000tl3_x'
-                else:
-                    _LOGGER.debug("No 3000 range - MID series")
-                    await hass.async_add_executor_job(client.disconnect)
-                    return 'mid_15000_25000tl3_x'
-        
-        # Default fallback
-        _LOGGER.warning("Could not definitively detect inverter series, defaulting to MIN 3000-6000TL-X")
-        await hass.async_add_executor_job(client.disconnect)
+    present = lambda address: table.present(REGISTER_TYPE_INPUT, address)
+
+    # CHECK MIN SERIES FIRST (uses 3000 range) - PV1 at register 3003
+    if present(3003):
+        _LOGGER.debug("Detected 3000-range registers - MIN series inverter")
+
+        # Battery in VPP range (31200+) means the MIN TL-XH hybrid variant
+        if table.positive(REGISTER_TYPE_INPUT, 31217):
+            _LOGGER.debug("Detected battery in 31200+ range - MIN TL-XH hybrid variant")
+            return 'min_tl_xh_3000_10000_v201'
+
+        # PV3 at register 3011 (MIN 7-10k has 3 strings) - exists even if value is 0
+        if present(3011):
+            _LOGGER.debug("Detected PV3 register - MIN 7000-10000TL-X")
+            return 'min_7000_10000_tl_x'
+        _LOGGER.debug("No PV3 register - MIN 3000-6000TL-X")
         return 'min_3000_6000_tl_x'
-        
-    except Exception as e:
-        _LOGGER.error(f"Exception detecting inverter series: {str(e)}")
-        try:
-            await hass.async_add_executor_job(client.disconnect)
-        except:
-            pass
-        return None
 
-async def async_refine_dtc_detection(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    dtc_code: int,
-    initial_profile_key: str,
-    device_id: int = 1
-) -> str:
+    # Battery register at 3169 (SPH/TL-XH/MOD specific)
+    if present(3169):
+        _LOGGER.debug("Detected battery voltage register returns value")
+
+        # 3-phase: S-phase (42) and T-phase (46) voltage registers
+        if present(42) and present(46):
+            _LOGGER.debug("Detected 3-phase with battery register - SPH TL3 or MOD series")
+
+            # MOD-specific 31200 range (battery power per VPP Protocol V2.01)
+            if present(31200):
+                _LOGGER.debug("Detected 31200 range (VPP Protocol) - MOD-XH hybrid")
+                return 'mod_6000_15000tl3_xh'
+
+            # Register 1000 range (SPH TL3 specific)
+            if present(1000):
+                _LOGGER.debug("Detected storage range - SPH TL3 series")
+                return 'sph_tl3_3000_10000'
+
+            _LOGGER.info("No distinctive registers found - defaulting to MOD-XH hybrid")
+            return 'mod_6000_15000tl3_xh'
+
+        _LOGGER.debug("Detected single-phase hybrid - SPH or TL-XH series")
+        return 'sph_7000_10000'  # Default to SPH 7-10k
+
+    # 3-phase grid-tied (MID/MAX/MOD-X): phase voltages at 38 and 42
+    if present(38) and present(42):
+        _LOGGER.debug("Detected 3-phase grid-tied inverter")
+        # MID uses 0-124 only (a 3000 range would have been caught above)
+        _LOGGER.debug("No 3000 range - MID series")
+        return 'mid_15000_25000tl3_x'
+
+    _LOGGER.warning("Could not definitively detect inverter series, defaulting to MIN 3000-6000TL-X")
+    return 'min_3000_6000_tl_x'
+
+
+def refine_dtc_detection(table: ProbeTable, dtc_code: int, initial_profile_key: str) -> str:
     """
     Refine DTC detection for models that share the same DTC code.
 
     Uses additional V2.01 register checks to differentiate (with legacy fallback):
     - SPH 3-6kW vs 7-10kW (DTC 3502): Check PV3 presence (31018 or 11)
     - MOD vs MID (DTC 5400): Check battery SOC (31217) or voltage (3169)
+    - TL-XH vs MIN TL-XH (DTC 5100): Check MIN range (3003)
     - MIC vs MIN (DTC 5200): Check MIN range (31010 or 3003)
 
-    Since DTC exists, prefer V2.01 registers (30000+ range) first, then
-    fallback to legacy registers for robustness.
-
     Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        dtc_code: DTC code from register 30000
+        table: Probe table (VPP registers allowed)
+        dtc_code: DTC code from register 30000 (or the OffGrid registers)
         initial_profile_key: Initial profile from DTC mapping
-        device_id: Modbus device ID
 
     Returns:
         Refined profile key
     """
-    try:
-        # DTC 3502: SPH 3-6kW vs 7-10kW - Check for PV3 (3PV = 7-10kW, 2PV = 3-6kW)
-        if dtc_code == 3502:
-            # Check V2.01 PV3 voltage register first (31018)
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 31018, 1  # V2.01 PV3 voltage
-            )
-            if result is not None and len(result) > 0 and result[0] > 0:
-                _LOGGER.info("Detected PV3 in V2.01 range (3PV) - SPH 7-10kW")
-                return 'sph_7000_10000_v201'
-
-            # Fallback to legacy register 11 (base range)
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 11, 1  # Legacy PV3 voltage
-            )
-            if result is not None and len(result) > 0 and result[0] > 0:
-                _LOGGER.info("Detected PV3 in legacy range (3PV) - SPH 7-10kW")
-                return 'sph_7000_10000_v201'
-            else:
-                _LOGGER.info("No PV3 string (2PV) - SPH 3-6kW")
-                return 'sph_3000_6000_v201'
-
-        # DTC 5400: MOD-XH (hybrid) vs MOD-X (grid-tied) vs MID
-        # Check V2.01 battery registers (MOD-XH has battery, MOD-X/MID don't)
-        elif dtc_code == 5400:
-            # Try V2.01 battery SOC register (31217)
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 31217, 1  # V2.01 Battery SOC
-            )
-            if result is not None and len(result) > 0 and result[0] > 0:
-                _LOGGER.info("Detected V2.01 battery SOC register (31217) with valid value - MOD-XH hybrid")
-                return 'mod_6000_15000tl3_xh_v201'
-
-            # Fallback to legacy battery register (3169)
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 3169, 1  # Legacy battery voltage
-            )
-            if result is not None and len(result) > 0 and result[0] > 0:
-                _LOGGER.info("Detected legacy battery voltage register (3169) with valid value - MOD-XH hybrid")
-                return 'mod_6000_15000tl3_xh_v201'
-
-            # Check for 3000+ range to distinguish MOD (grid-tied) from MID
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 3003, 1  # MOD uses 3000 range, MID uses 0-124
-            )
-            if result is not None:
-                _LOGGER.info("No battery but 3000+ range detected - MOD-X grid-tied")
-                return 'mod_6000_15000tl3_x'  # Grid-tied MOD without V2.01 suffix (uses legacy registers)
-            else:
-                _LOGGER.info("No battery, no 3000+ range - MID series")
-                return 'mid_15000_25000tl3_x_v201'
-
-        # DTC 5100: TL-XH standard (0-124 range) vs MIN TL-XH hybrid (3000+ range)
-        # Check if inverter uses MIN series 3000+ range instead of standard TL-XH 0-124 range
-        elif dtc_code == 5100:
-            # Check for MIN range (3000+) - PV1 voltage at 3003
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 3003, 1  # MIN PV1 voltage
-            )
-            if result is not None and len(result) > 0:
-                # This is MIN TL-XH variant using 3000+ range with battery in 31200+ range
-                _LOGGER.info("Detected 3000+ range with DTC 5100 - MIN TL-XH hybrid variant")
-                # Verify battery registers exist in VPP range (31200+)
-                battery_test = await hass.async_add_executor_job(
-                    client.read_input_registers, 31217, 1  # Battery SOC in VPP range
-                )
-                if battery_test is not None:
-                    _LOGGER.info("Confirmed battery in 31200+ range - MIN TL-XH V2.01")
-                    return 'min_tl_xh_3000_10000_v201'
-                else:
-                    _LOGGER.warning("No battery found in 31200+ range despite 3000+ base range")
-                    return 'min_tl_xh_3000_10000_v201'  # Still use MIN TL-XH profile
+    positive = lambda address: table.positive(REGISTER_TYPE_INPUT, address)
+    present = lambda address: table.present(REGISTER_TYPE_INPUT, address)
+
+    # DTC 3502: SPH 3-6kW vs 7-10kW - Check for PV3 (3PV = 7-10kW, 2PV = 3-6kW)
+    if dtc_code == 3502:
+        if positive(31018):
+            _LOGGER.info("Detected PV3 in V2.01 range (3PV) - SPH 7-10kW")
+            return 'sph_7000_10000_v201'
+        if positive(11):
+            _LOGGER.info("Detected PV3 in legacy range (3PV) - SPH 7-10kW")
+            return 'sph_7000_10000_v201'
+        _LOGGER.info("No PV3 string (2PV) - SPH 3-6kW")
+        return 'sph_3000_6000_v201'
+
+    # DTC 5400: MOD-XH (hybrid) vs MOD-X (grid-tied) vs MID
+    # MOD-XH has a battery, MOD-X/MID don't
+    if dtc_code == 5400:
+        if positive(31217):
+            _LOGGER.info("Detected V2.01 battery SOC register (31217) with valid value - MOD-XH hybrid")
+            return 'mod_6000_15000tl3_xh_v201'
+        if positive(3169):
+            _LOGGER.info("Detected legacy battery voltage register (3169) with valid value - MOD-XH hybrid")
+            return 'mod_6000_15000tl3_xh_v201'
+        # MOD uses the 3000 range, MID uses 0-124
+        if present(3003):
+            _LOGGER.info("No battery but 3000+ range detected - MOD-X grid-tied")
+            return 'mod_6000_15000tl3_x'  # Grid-tied MOD without V2.01 suffix (uses legacy registers)
+        _LOGGER.info("No battery, no 3000+ range - MID series")
+        return 'mid_15000_25000tl3_x_v201'
+
+    # DTC 5100: TL-XH standard (0-124 range) vs MIN TL-XH hybrid (3000+ range)
+    if dtc_code == 5100:
+        if present(3003):
+            _LOGGER.info("Detected 3000+ range with DTC 5100 - MIN TL-XH hybrid variant")
+            if present(31217):
+                _LOGGER.info("Confirmed battery in 31200+ range - MIN TL-XH V2.01")
             else:
-                # Standard TL-XH using 0-124 range
-                _LOGGER.info("No 3000+ range detected - Standard TL-XH with 0-124 range")
-                return 'tl_xh_3000_10000_v201'
-
-        # DTC 5200: MIC vs MIN - Check register range (MIC uses 0-179, MIN uses 3000+)
-        elif dtc_code == 5200:
-            # Try V2.01 MIN range first (31010 - PV1 voltage in V2.01)
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 31010, 1  # V2.01 MIN PV1 voltage
-            )
-            if result is not None:
-                _LOGGER.info("Detected V2.01 31000+ range - MIN series")
-                return 'min_3000_6000_tl_x_v201'
-
-            # Fallback to legacy MIN's 3000 range
-            result = await hass.async_add_executor_job(
-                client.read_input_registers, 3003, 1  # Legacy MIN PV1 voltage
-            )
-            if result is not None:
-                _LOGGER.info("Detected legacy 3000+ range - MIN series")
-                return 'min_3000_6000_tl_x_v201'
-            else:
-                _LOGGER.info("No 3000+ range - MIC series")
-                return 'mic_600_3300tl_x_v201'
-
-    except Exception as e:
-        _LOGGER.debug(f"Error during DTC refinement: {e}")
-
-    # Return initial profile if refinement fails or not applicable
+                _LOGGER.warning("No battery found in 31200+ range despite 3000+ base range")
+            return 'min_tl_xh_3000_10000_v201'
+        _LOGGER.info("No 3000+ range detected - Standard TL-XH with 0-124 range")
+        return 'tl_xh_3000_10000_v201'
+
+    # DTC 5200: MIC vs MIN - Check register range (MIC uses 0-179, MIN uses 3000+)
+    if dtc_code == 5200:
+        if present(31010):
+            _LOGGER.info("Detected V2.01 31000+ range - MIN series")
+            return 'min_3000_6000_tl_x_v201'
+        if present(3003):
+            _LOGGER.info("Detected legacy 3000+ range - MIN series")
+            return 'min_3000_6000_tl_x_v201'
+        _LOGGER.info("No 3000+ range - MIC series")
+        return 'mic_600_3300tl_x_v201'
+
+    # Not ambiguous
     return initial_profile_key
 
 
-async def async_determine_inverter_type(
-    hass: HomeAssistant,
-    client: GrowattModbus,
-    device_id: int = 1
-) -> Tuple[Optional[str], Optional[dict]]:
+def determine_inverter_type(client: GrowattModbus) -> Tuple[Optional[str], Optional[dict]]:
     """
     Automatically determine the inverter type and return appropriate profile.
 
-    Process:
-    1. Try OffGrid DTC (register 34/43) FIRST - prevents SPF power resets
-    2. Try VPP DTC (register 30000) if OffGrid fails - standard method
-    3. For ambiguous DTCs (shared codes), refine with additional register checks
-    4. Read model name from holding registers and match
-    5. If no match, detect series by probing registers
-    6. Return the appropriate profile
+    Process (every register read once, see ProbeTable):
+    1. OffGrid DTC (input 34 / holding 43) - SPF stops here, VPP registers are never read
+    2. VPP DTC (register 30000), refined by range presence for shared codes
+    3. Model name from holding registers 0-4
+    4. Series from range presence (V2.01 variant if register 30099 reports
+       a V2.01+ protocol)
 
     CRITICAL: OffGrid inverters (SPF) will RESET if VPP registers (30000+, 31000+)
     are accessed! We detect OffGrid models first to prevent this.
 
+    Blocking - call from the executor (see async_determine_inverter_type).
+
     Args:
-        hass: HomeAssistant instance
-        client: GrowattModbus client
-        device_id: Modbus device ID (default 1)
+        client: GrowattModbus client (connected)
 
     Returns:
         Tuple of (profile_key, profile_dict) or (None, None) if detection fails
     """
     _LOGGER.info("Starting automatic inverter type detection")
 
-    # Step 1: Try OffGrid DTC first (registers 34/43) - SAFE for all inverters
-    # This prevents SPF inverters from power reset when reading VPP registers
-    dtc_code = await async_read_dtc_code_offgrid(hass, client, device_id)
-
-    if dtc_code:
-        profile_key = detect_profile_from_dtc(dtc_code)
-
-        if profile_key:
-            # Check if this is an SPF (OffGrid) inverter
-            if profile_key.startswith('spf_'):
-                # SPF detected - skip VPP register probing to prevent resets
-                profile = get_profile(profile_key)
-                if profile:
-                    _LOGGER.info(f"✓ Auto-detected OffGrid inverter from DTC code {dtc_code}: {profile['name']}")
-                    _LOGGER.info("⚠ Skipping VPP register probing to prevent power reset on OffGrid inverter")
-                    return profile_key, profile
-
-            # Non-SPF OffGrid DTC or ambiguous - proceed with refinement
-            profile_key = await async_refine_dtc_detection(hass, client, dtc_code, profile_key, device_id)
+    table = ProbeTable(client)
+    # Short, known set of reads - start at the pacing floor (the pacer still
+    # backs off if the device struggles) instead of the conservative default
+    client.restore_pacing(client.min_read_interval)
 
-            profile = get_profile(profile_key)
+    try:
+        profile_key, profile = _determine_from_probes(table)
+    except Exception as e:
+        _LOGGER.error(f"Exception detecting inverter type: {str(e)}")
+        profile_key, profile = None, None
+
+    _LOGGER.debug(f"Discovery complete after {table.reads} reads")
+    if not profile_key:
+        _LOGGER.error("❌ Could not auto-detect inverter type")
+    return profile_key, profile
+
+
+def _determine_from_probes(table: ProbeTable) -> Tuple[Optional[str], Optional[dict]]:
+    """Evaluate the profile signatures against the probe table"""
+    # Step 1: OffGrid DTC first (registers 34/43) - SAFE for all inverters
+    offgrid_profile_key = None
+    offgrid_dtc = offgrid_dtc_from_probes(table)
+    if offgrid_dtc:
+        offgrid_profile_key = detect_profile_from_dtc(offgrid_dtc)
+        if offgrid_profile_key and offgrid_profile_key.startswith('spf_'):
+            # SPF detected - skip VPP register probing to prevent resets
+            profile = get_profile(offgrid_profile_key)
             if profile:
-                _LOGGER.info(f"✓ Auto-detected from OffGrid DTC code {dtc_code}: {profile['name']}")
-                return profile_key, profile
+                _LOGGER.info(f"✓ Auto-detected OffGrid inverter from DTC code {offgrid_dtc}: {profile['name']}")
+                _LOGGER.info("⚠ Skipping VPP register probing to prevent power reset on OffGrid inverter")
+                return offgrid_profile_key, profile
+
+    # Safe now because SPF would have been detected above
+    table.vpp_allowed = True
 
-    # Step 2: Try VPP 2.01 DTC (register 30000) if OffGrid detection failed
-    # Safe now because SPF would have been detected in Step 1
-    dtc_code = await async_read_dtc_code(hass, client, device_id)
+    # Non-SPF OffGrid DTC - refine with range presence
+    if offgrid_profile_key:
+        profile_key = refine_dtc_detection(table, offgrid_dtc, offgrid_profile_key)
+        profile = get_profile(profile_key)
+        if profile:
+            _LOGGER.info(f"✓ Auto-detected from OffGrid DTC code {offgrid_dtc}: {profile['name']}")
+            return profile_key, profile
 
+    # Step 2: VPP 2.01 DTC (register 30000)
+    dtc_code = vpp_dtc_from_probes(table)
     if dtc_code:
         profile_key = detect_profile_from_dtc(dtc_code)
-
         if profile_key:
-            # Step 2.5: Refine DTC detection for ambiguous codes
-            profile_key = await async_refine_dtc_detection(hass, client, dtc_code, profile_key, device_id)
-
+            # Refine DTC detection for ambiguous codes
+            profile_key = refine_dtc_detection(table, dtc_code, profile_key)
             profile = get_profile(profile_key)
             if profile:
                 _LOGGER.info(f"✓ Auto-detected from VPP DTC code {dtc_code}: {profile['name']}")
                 return profile_key, profile
 
-    # Step 2: Try to read model name
-    model_name = await async_read_model_name(hass, client, device_id)
-
+    # Step 3: Model name
+    model_name = model_name_from_probes(table)
     if model_name:
         profile_key = detect_profile_from_model_name(model_name)
-
         if profile_key:
             profile = get_profile(profile_key)
             if profile:
                 _LOGGER.info(f"✓ Auto-detected from model name: {profile['name']}")
                 return profile_key, profile
 
-    # Step 3: DTC and model name didn't work, try register probing
-    _LOGGER.info("DTC and model name detection failed, trying register-based detection...")
-    profile_key = await async_detect_inverter_series(hass, client, device_id)
+    # Step 4: DTC and model name didn't work, use range presence
+    _LOGGER.info("DTC and model name detection failed, using register-based detection...")
+    profile_key = detect_series_from_probes(table)
 
-    if profile_key:
-        profile = get_profile(profile_key)
-        if profile:
-            _LOGGER.warning(
-                f"⚠ Auto-detected by probing registers: {profile['name']}. "
-                "Consider manually verifying the exact model for best accuracy."
-            )
-            return profile_key, profile
-    
-    # Step 4: Everything failed
-    _LOGGER.error("❌ Could not auto-detect inverter type")
+    protocol = protocol_version_from_probes(table)
+    if protocol and protocol >= 201 and f"{profile_key}_v201" in INVERTER_PROFILES:
+        _LOGGER.info(f"Register 30099 reports protocol {protocol // 100}.{protocol % 100:02d} - using V2.01 profile")
+        profile_key = f"{profile_key}_v201"
+
+    profile = get_profile(profile_key)
+    if profile:
+        _LOGGER.warning(
+            f"⚠ Auto-detected by probing registers: {profile['name']}. "
+            "Consider manually verifying the exact model for best accuracy."
+        )
+        return profile_key, profile
     return None, None
+
+
+async def async_determine_inverter_type(
+    hass: HomeAssistant,
+    client: GrowattModbus,
+    device_id: int = 1
+) -> Tuple[Optional[str], Optional[dict]]:
+    """
+    Automatically determine the inverter type (see determine_inverter_type).
+
+    The whole discovery pass runs as one executor job.
+
+    Args:
+        hass: HomeAssistant instance
+        client: GrowattModbus client (connected)
+        device_id: Modbus device ID (default 1)
+
+    Returns:
+        Tuple of (profile_key, profile_dict) or (None, None) if detection fails
+    """
+    return await hass.async_add_executor_job(determine_inverter_type, client)
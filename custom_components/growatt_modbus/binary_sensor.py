@@ -82,4 +82,5 @@ class GrowattInverterOnlineSensor(CoordinatorEntity, BinarySensorEntity):
         return {
             "last_successful_update": self.coordinator.last_successful_update.isoformat(),
             "seconds_since_update": int(time_since_update.total_seconds()),
+            **self.coordinator.connection_stats,
         }
\ No newline at end of file
@@ -20,9 +20,17 @@ from .const import (
     CONF_CONNECTION_TYPE,
     CONF_DEVICE_PATH,
     CONF_BAUDRATE,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_IDLE_TIMEOUT,
+    CONF_MIN_READ_INTERVAL,
+    CONF_PUBLISH_DEADBAND,
     DEFAULT_PORT,
     DEFAULT_SLAVE_ID,
     DEFAULT_BAUDRATE,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MIN_READ_INTERVAL,
+    DEFAULT_PUBLISH_DEADBAND,
     DOMAIN,
 )
 from .device_profiles import get_available_profiles, get_profile
@@ -790,6 +798,10 @@ class GrowattModbusOptionsFlow(config_entries.OptionsFlow):
         current_offline_scan_interval = self.config_entry.options.get("offline_scan_interval", 300)
         current_timeout = self.config_entry.options.get("timeout", 10)
         current_invert = self.config_entry.options.get("invert_grid_power", False)
+        current_persistent = self.config_entry.options.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION)
+        current_idle_timeout = self.config_entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+        current_min_read_interval = self.config_entry.options.get(CONF_MIN_READ_INTERVAL, DEFAULT_MIN_READ_INTERVAL)
+        current_publish_deadband = self.config_entry.options.get(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND)
 
         available_profiles = get_available_profiles()
 
@@ -818,6 +830,22 @@ class GrowattModbusOptionsFlow(config_entries.OptionsFlow):
                 "invert_grid_power",
                 default=current_invert
             ): bool,
+            vol.Required(
+                CONF_PERSISTENT_CONNECTION,
+                default=current_persistent
+            ): bool,
+            vol.Required(
+                CONF_IDLE_TIMEOUT,
+                default=current_idle_timeout
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+            vol.Required(
+                CONF_MIN_READ_INTERVAL,
+                default=current_min_read_interval
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=5.0)),
+            vol.Required(
+                CONF_PUBLISH_DEADBAND,
+                default=current_publish_deadband
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.0, max=10.0)),
         })
 
         return self.async_show_form(
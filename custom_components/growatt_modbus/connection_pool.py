@@ -0,0 +1,259 @@
+"""
+Process-wide Modbus connection sharing.
+
+Several inverters (different slave IDs) often sit behind one RS485-to-TCP
+gateway or one USB-RS485 adapter. Giving each config entry its own client
+means several sockets to the same gateway fighting over a single RS485 bus.
+The pool keeps one transport per (host, port) or serial device, multiplexes
+requests by slave ID over it and serializes bus access first-come,
+first-served so no inverter can starve the others.
+
+A link has one set of transport settings (baud rate, timeout, minimum read
+interval): the first client creates the transport, and clients joining it
+with different settings are warned that theirs are not used.
+
+Request pacing is per link too. The quiet gap a device needs after a
+response applies to the next request on the bus, whichever inverter sends
+it, so the time of the last transaction and the learned request interval
+(the first client's AdaptivePacer) live on the connection.
+
+Blocking clients (GrowattModbus) and asyncio clients (AsyncGrowattModbus) use
+separate pools: a pymodbus transport belongs to one or the other.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .pacing import AdaptivePacer
+
+TransportSettings = Dict[str, Any]  # Settings the transport was created with (baudrate, timeout, ...)
+
+logger = logging.getLogger(__name__)
+
+
+class FairLock:
+    """FIFO lock - waiters acquire in arrival order"""
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._next_ticket = 0
+        self._now_serving = 0
+        self._owner: Optional[int] = None
+        self._depth = 0
+
+    def acquire(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            # Re-entrant for the owning thread (connect inside a locked section)
+            if self._owner == me:
+                self._depth += 1
+                return
+            ticket = self._next_ticket
+            self._next_ticket += 1
+            while ticket != self._now_serving:
+                self._cond.wait()
+            self._owner = me
+            self._depth = 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._depth -= 1
+            if self._depth:
+                return
+            self._owner = None
+            self._now_serving += 1
+            self._cond.notify_all()
+
+    @property
+    def waiting(self) -> int:
+        """Number of threads queued for the lock (excluding the owner)"""
+        with self._cond:
+            return self._next_ticket - self._now_serving - (1 if self._owner is not None else 0)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedConnection:
+    """A pymodbus client shared by every inverter on one gateway or serial port"""
+
+    def __init__(self, key: Tuple, client: Any, settings: Optional[TransportSettings] = None,
+                 pacer: Optional[AdaptivePacer] = None):
+        self.key = key
+        self.client = client
+        self.settings = dict(settings or {})
+        self.pacer = pacer            # Request pacing of the link, shared by its users
+        self.last_transaction = 0.0   # time.monotonic() of the last response on the link
+        self.lock = FairLock()
+        self.users = 0     # GrowattModbus instances registered on this connection
+        self._holders = 0  # Instances that currently want the transport open
+
+    def open(self) -> bool:
+        """Take a hold on the transport, connecting it if nobody has"""
+        with self.lock:
+            if self._holders == 0 or not self.is_open():
+                if not self.client.connect():
+                    return False
+            self._holders += 1
+            return True
+
+    def close(self) -> None:
+        """Drop a hold; the transport is closed when the last holder leaves"""
+        with self.lock:
+            self._holders = max(self._holders - 1, 0)
+            if self._holders == 0:
+                self.client.close()
+
+    def reset(self) -> None:
+        """Force the transport closed after a failure; the next open() reconnects"""
+        with self.lock:
+            self.client.close()
+
+    def is_open(self) -> bool:
+        """Local transport state check (no bus traffic)"""
+        if not hasattr(self.client, 'is_socket_open'):
+            return True
+        try:
+            return bool(self.client.is_socket_open())
+        except Exception:
+            return False
+
+
+# One shared connection per gateway / serial device
+_CONNECTIONS: Dict[Tuple, SharedConnection] = {}
+_CONNECTIONS_LOCK = threading.Lock()
+
+
+def connection_key(connection_type: str, host: str = '', port: int = 502, device: str = '') -> Tuple:
+    """Identify the physical link a client talks over"""
+    if connection_type == 'tcp':
+        return ('tcp', host, int(port))
+    return ('serial', device)
+
+
+def _check_settings(connection, settings: Optional[TransportSettings]) -> None:
+    """Warn if a client joins a connection created with other transport settings"""
+    differing = {
+        name: (connection.settings[name], value) for name, value in (settings or {}).items()
+        if name in connection.settings and connection.settings[name] != value
+    }
+    if differing:
+        details = ', '.join(f"{name} {used} (configured {value})" for name, (used, value) in sorted(differing.items()))
+        logger.warning(f"Modbus connection {connection.key} is shared with settings of the first inverter on it: "
+                       f"{details}. All inverters on one link must use the same settings.")
+
+
+def acquire_connection(key: Tuple, factory: Callable[[], Any],
+                       settings: Optional[TransportSettings] = None,
+                       pacer: Optional[AdaptivePacer] = None) -> SharedConnection:
+    """
+    Register a user of the shared connection for `key`, creating it if needed
+    (with the given settings and pacer - a user joining later gets the existing ones)
+    """
+    with _CONNECTIONS_LOCK:
+        connection = _CONNECTIONS.get(key)
+        if connection is None:
+            connection = SharedConnection(key, factory(), settings, pacer)
+            _CONNECTIONS[key] = connection
+            logger.debug(f"Created shared Modbus connection for {key}")
+        else:
+            _check_settings(connection, settings)
+        connection.users += 1
+        if connection.users > 1:
+            logger.debug(f"Sharing Modbus connection {key} between {connection.users} inverters")
+        return connection
+
+
+def release_connection(connection: SharedConnection) -> None:
+    """Unregister a user; the connection is dropped when nobody uses it"""
+    with _CONNECTIONS_LOCK:
+        connection.users = max(connection.users - 1, 0)
+        if connection.users == 0 and _CONNECTIONS.get(connection.key) is connection:
+            del _CONNECTIONS[connection.key]
+            try:
+                connection.client.close()
+            except Exception:
+                pass
+            logger.debug(f"Released shared Modbus connection for {connection.key}")
+
+
+class AsyncSharedConnection:
+    """Asyncio counterpart of SharedConnection (asyncio.Lock is already FIFO)"""
+
+    def __init__(self, key: Tuple, client: Any, settings: Optional[TransportSettings] = None,
+                 pacer: Optional[AdaptivePacer] = None):
+        self.key = key
+        self.client = client
+        self.settings = dict(settings or {})
+        self.pacer = pacer
+        self.last_transaction = 0.0
+        self.lock = asyncio.Lock()
+        self.users = 0
+        self._holders = 0
+
+    async def open(self) -> bool:
+        """Take a hold on the transport, connecting it if nobody has"""
+        async with self.lock:
+            if self._holders == 0 or not self.is_open():
+                if not await self.client.connect():
+                    return False
+            self._holders += 1
+            return True
+
+    async def close(self) -> None:
+        """Drop a hold; the transport is closed when the last holder leaves"""
+        async with self.lock:
+            self._holders = max(self._holders - 1, 0)
+            if self._holders == 0:
+                self.client.close()
+
+    async def reset(self) -> None:
+        """Force the transport closed after a failure; the next open() reconnects"""
+        async with self.lock:
+            self.client.close()
+
+    def is_open(self) -> bool:
+        """Local transport state check (no bus traffic)"""
+        try:
+            return bool(self.client.connected)
+        except Exception:
+            return False
+
+
+# Asyncio connections are only touched from the event loop, no lock needed
+_ASYNC_CONNECTIONS: Dict[Tuple, AsyncSharedConnection] = {}
+
+
+def acquire_async_connection(key: Tuple, factory: Callable[[], Any],
+                             settings: Optional[TransportSettings] = None,
+                             pacer: Optional[AdaptivePacer] = None) -> AsyncSharedConnection:
+    """Register a user of the shared asyncio connection for `key`, creating it if needed (see acquire_connection)"""
+    connection = _ASYNC_CONNECTIONS.get(key)
+    if connection is None:
+        connection = AsyncSharedConnection(key, factory(), settings, pacer)
+        _ASYNC_CONNECTIONS[key] = connection
+        logger.debug(f"Created shared async Modbus connection for {key}")
+    else:
+        _check_settings(connection, settings)
+    connection.users += 1
+    if connection.users > 1:
+        logger.debug(f"Sharing async Modbus connection {key} between {connection.users} inverters")
+    return connection
+
+
+def release_async_connection(connection: AsyncSharedConnection) -> None:
+    """Unregister a user; the connection is dropped when nobody uses it"""
+    connection.users = max(connection.users - 1, 0)
+    if connection.users == 0 and _ASYNC_CONNECTIONS.get(connection.key) is connection:
+        del _ASYNC_CONNECTIONS[connection.key]
+        try:
+            connection.client.close()
+        except Exception:
+            pass
+        logger.debug(f"Released shared async Modbus connection for {connection.key}")
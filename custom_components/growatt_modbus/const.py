@@ -47,11 +47,30 @@ CONF_REGISTER_MAP = "register_map"
 CONF_INVERTER_SERIES = "inverter_series"
 CONF_INVERT_GRID_POWER = "invert_grid_power"  # For reversed CT clamps
 CONF_DEVICE_STRUCTURE_VERSION = "device_structure_version"
+CONF_PERSISTENT_CONNECTION = "persistent_connection"  # Keep socket open between polls
+CONF_IDLE_TIMEOUT = "idle_timeout"  # Reopen persistent connections idle longer than this
+CONF_MIN_READ_INTERVAL = "min_read_interval"  # Floor for the adaptive gap between requests
+CONF_PUBLISH_DEADBAND = "publish_deadband"  # Relative change (%) before a measurement is published again
 
 # Default Values
 DEFAULT_PORT = 502
 DEFAULT_SLAVE_ID = 1
 DEFAULT_BAUDRATE = 9600
+DEFAULT_PERSISTENT_CONNECTION = False
+DEFAULT_IDLE_TIMEOUT = 120  # seconds - many RS485 gateways drop idle sockets after a few minutes
+DEFAULT_MIN_READ_INTERVAL = 0.2  # seconds - pacing adapts upwards from here if the device struggles
+DEFAULT_PUBLISH_DEADBAND = 0.0  # percent - 0 publishes every change, unchanged values are never published
+
+# Poll tiers - registers are grouped by how quickly their values change, and
+# slow tiers are only re-read when due (cached values are reused in between)
+POLL_TIER_FAST = "fast"      # Power, voltage, current, status - every update
+POLL_TIER_ENERGY = "energy"  # Energy counters
+POLL_TIER_CONFIG = "config"  # Identity and settings (holding registers) - also re-read after a write
+DEFAULT_POLL_INTERVALS = {  # seconds, profiles can override with 'poll_intervals'
+    POLL_TIER_FAST: 0,
+    POLL_TIER_ENERGY: 60,
+    POLL_TIER_CONFIG: 900,
+}
 
 # Device Structure Version
 # Version 1: Single device (legacy)
@@ -8,6 +8,7 @@ from typing import Any, Dict
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_HOST, CONF_PORT, CONF_NAME
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.event import async_track_time_change
 
@@ -19,7 +20,16 @@ from .const import (
     CONF_DEVICE_PATH,
     CONF_BAUDRATE,
     CONF_DEVICE_STRUCTURE_VERSION,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_IDLE_TIMEOUT,
+    CONF_MIN_READ_INTERVAL,
+    CONF_PUBLISH_DEADBAND,
     CURRENT_DEVICE_STRUCTURE_VERSION,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_MIN_READ_INTERVAL,
+    DEFAULT_PUBLISH_DEADBAND,
+    POLL_TIER_CONFIG,
     get_sensor_type,
     SENSOR_OFFLINE_BEHAVIOR,
     DEVICE_TYPE_INVERTER,
@@ -32,9 +42,25 @@ from .const import (
 from .const import REGISTER_MAPS
 
 from .growatt_modbus import GrowattModbus, GrowattData
+from .async_client import AsyncGrowattModbus, async_supported
+from .read_plan import TierSchedule
+from .storage import DeviceStore, SECTION_IDENTITY, SECTION_PACING, SECTION_UNSUPPORTED_BLOCKS
+from .write_queue import WriteQueue
+from .history import SampleHistory
+from .publish import ChangeTracker
 
 _LOGGER = logging.getLogger(__name__)
 
+# Stored device identification is re-read after this long (firmware updates)
+IDENTITY_MAX_AGE = 7 * 24 * 3600  # seconds
+# Wait before retrying an identification that could not read anything
+IDENTITY_RETRY_DELAY = 3600  # seconds
+# Connection attempts per poll (failed reads are retried per transaction by the client)
+CONNECT_ATTEMPTS = 3
+# A poll must finish within this fraction of the update interval, so it never
+# overlaps the next one (also capped by the client's poll budget)
+POLL_DEADLINE_FRACTION = 0.8
+
 def test_connection(config: dict) -> dict:
     """Test the connection to the Growatt inverter (TCP or Serial)."""
     try:
@@ -108,6 +134,13 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
         self._inverter_type = None
         self._model_name = None
         self._protocol_version = None  # VPP Protocol version (from register 30099)
+        # Identification is cached in the device store and re-read during a
+        # regular poll when missing, old, or the polled serial number changes
+        self._identity_refresh = True
+        self._identity_retry_after = 0.0
+        self._identity_updated = False
+        self._identity_poll_serial = None  # Serial from holding registers 9-13 when identified
+        self._identity_results: Dict[str, Any] = {}  # Reads done so far, spread over polls short of time
 
         # Handle register map key (might be dict or string due to old bug)
         raw_register_map = entry.data.get(CONF_REGISTER_MAP, 'MIN_7000_10000TL_X')
@@ -156,9 +189,26 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
             update_interval=self._normal_update_interval,
         )
         
+        # State learned at runtime (request pacing), persisted per device
+        self._store = DeviceStore(hass, entry.entry_id)
+
         # Initialize the Growatt client
         self._client = None
+        self._use_async = False
         self._initialize_client()
+
+        # Slow register tiers (energy, identity/settings) are only re-read when due
+        self._poll_schedule = TierSchedule(self._client.poll_intervals if self._client else {})
+        # Register writes are debounced and written in batches
+        self._write_queue = WriteQueue(self._async_write_batch)
+        # Recent samples for windowed statistics (see history.py)
+        self.history = SampleHistory()
+        # Fields that changed in the last update, so sensors can skip unchanged
+        # state writes (None = every entity updates, e.g. on online/offline changes)
+        self._change_tracker = ChangeTracker(
+            entry.options.get(CONF_PUBLISH_DEADBAND, DEFAULT_PUBLISH_DEADBAND)
+        )
+        self.changed_fields = None
         
         # Set up midnight callback for daily total resets
         self._setup_midnight_callback()
@@ -208,34 +258,56 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
             # Get timeout from options (default 10 seconds)
             timeout = self.entry.options.get("timeout", 10)
 
+            # Persistent connection mode (opt-in)
+            persistent = self.entry.options.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION)
+            idle_timeout = self.entry.options.get(CONF_IDLE_TIMEOUT, DEFAULT_IDLE_TIMEOUT)
+
+            # Floor for the adaptive gap between requests
+            min_read_interval = self.entry.options.get(CONF_MIN_READ_INTERVAL, DEFAULT_MIN_READ_INTERVAL)
+
             # Get connection type (default to tcp for backward compatibility)
             connection_type = self.config.get(CONF_CONNECTION_TYPE, "tcp")
 
+            # Poll from the event loop when pymodbus provides asyncio clients
+            self._use_async = async_supported(connection_type)
+            client_class = AsyncGrowattModbus if self._use_async else GrowattModbus
+
             # Create client based on connection type
             if connection_type == "tcp":
-                self._client = GrowattModbus(
+                self._client = client_class(
                     connection_type="tcp",
                     host=self.config[CONF_HOST],
                     port=self.config[CONF_PORT],
                     slave_id=self.config[CONF_SLAVE_ID],
                     register_map=register_map,
-                    timeout=timeout
+                    timeout=timeout,
+                    persistent=persistent,
+                    idle_timeout=idle_timeout,
+                    shared=True,
+                    min_read_interval=min_read_interval,
                 )
                 _LOGGER.debug("Initialized TCP Growatt client at %s:%s",
                              self.config[CONF_HOST], self.config[CONF_PORT])
             else:  # serial
-                self._client = GrowattModbus(
+                self._client = client_class(
                     connection_type="serial",
                     device=self.config[CONF_DEVICE_PATH],
                     baudrate=self.config[CONF_BAUDRATE],
                     slave_id=self.config[CONF_SLAVE_ID],
                     register_map=register_map,
-                    timeout=timeout
+                    timeout=timeout,
+                    persistent=persistent,
+                    idle_timeout=idle_timeout,
+                    shared=True,
+                    min_read_interval=min_read_interval,
                 )
                 _LOGGER.debug("Initialized Serial Growatt client at %s @ %s baud",
                              self.config[CONF_DEVICE_PATH], self.config[CONF_BAUDRATE])
 
-            _LOGGER.debug("Using register map: %s", register_map)
+            _LOGGER.debug("Using register map: %s (%s client)", register_map,
+                          "asyncio" if self._use_async else "executor")
+            if persistent:
+                _LOGGER.debug("Persistent connection enabled (idle timeout %ss)", idle_timeout)
 
         except Exception as err:
             _LOGGER.error("Failed to initialize Growatt client: %s", err)
@@ -283,6 +355,7 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
             self.data.energy_to_user_today = 0
             
             # Trigger update to notify sensors
+            self._track_changes(self.data, self._inverter_online)
             self.async_set_updated_data(self.data)
 
     @property
@@ -324,6 +397,12 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
         
         return raw_value
 
+    def _track_changes(self, data: GrowattData, was_online: bool) -> None:
+        """Record which fields changed before listeners are notified of data."""
+        changed = self._change_tracker.update(data)
+        # Going online or offline changes what every sensor shows (get_sensor_value)
+        self.changed_fields = changed if was_online == self._inverter_online else None
+
     @property
     def is_online(self) -> bool:
         """Return whether the inverter is currently online."""
@@ -334,9 +413,28 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
         if self._client is None:
             raise UpdateFailed("Growatt client not initialized")
 
+        was_online = self._inverter_online
         try:
-            # Run the blocking operations in executor
-            data = await self.hass.async_add_executor_job(self._fetch_data)
+            poll_started = time.monotonic()
+            interval = self.update_interval.total_seconds()
+            tiers = self._poll_schedule.due(poll_started, interval)
+            deadline = poll_started + min(self._client.poll_budget, interval * POLL_DEADLINE_FRACTION)
+            if self._use_async:
+                data = await self._async_fetch_data(tiers, deadline)
+            else:
+                # Run the blocking operations in executor
+                data = await self.hass.async_add_executor_job(self._fetch_data, tiers, deadline)
+
+            self._save_pacing()
+            if data is None:
+                # Read everything again once the inverter answers
+                self._poll_schedule.invalidate()
+            else:
+                self._poll_schedule.mark_refreshed(self._client.refreshed_tiers, poll_started)
+            if self._identity_updated:
+                self._identity_updated = False
+                self._save_identity()
+                self._update_device_registry()
 
             if data is None:
                 # Inverter not responding (probably night time or powered off)
@@ -374,6 +472,7 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
                         self._current_date = current_date
 
                     # Return existing data (sensors will apply offline behavior via get_sensor_value)
+                    self._track_changes(self.data, was_online)
                     return self.data
                 else:
                     # First connection attempt failed
@@ -451,6 +550,8 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
                 _LOGGER.debug("Debounce window expired - normal operation resumed")
                 self._just_came_online_time = None
 
+            self.history.append(data, stale=self._client.last_poll_report.stale_fields)
+            self._track_changes(data, was_online)
             return data
 
         except Exception as err:
@@ -470,154 +571,398 @@ class GrowattModbusCoordinator(DataUpdateCoordinator[GrowattData]):
             # Keep last data if available
             if self.data is not None:
                 _LOGGER.debug("Error fetching data, keeping last known data with offline behavior")
+                self._track_changes(self.data, was_online)
                 return self.data
             raise UpdateFailed(f"Error communicating with inverter: {err}")
 
-    def _fetch_data(self) -> GrowattData | None:
-        """Fetch data from the inverter (runs in executor)."""
-        max_retries = 3
-        retry_delay = 3  # seconds - increased from 2
-        
-        for attempt in range(max_retries):
-            try:
-                if not self._client.connect():
-                    _LOGGER.warning(
-                        "Failed to connect to Growatt inverter (attempt %d/%d)", 
-                        attempt + 1, max_retries
-                    )
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)  # constant delay, not exponential
-                        continue
+    def _fetch_data(self, tiers=None, deadline: float | None = None) -> GrowattData | None:
+        """Fetch data from the inverter (runs in executor).
+
+        Failed reads are retried per transaction inside read_all_data, so a
+        failed poll is not repeated as a whole; only connecting is retried here.
+        Nothing is read or retried after the deadline (time.monotonic()).
+        """
+        persistent = self._client.persistent
+        if deadline is None:
+            deadline = time.monotonic() + self._client.poll_budget
+
+        try:
+            for attempt in range(CONNECT_ATTEMPTS):
+                # Persistent mode reuses a healthy connection, otherwise connect per poll
+                if self._client.ensure_connected() if persistent else self._client.connect():
+                    break
+                _LOGGER.warning(
+                    "Failed to connect to Growatt inverter (attempt %d/%d)",
+                    attempt + 1, CONNECT_ATTEMPTS
+                )
+                delay = self._connect_retry_delay(attempt, deadline)
+                if delay is None:
                     _LOGGER.error("All connection attempts failed")
                     return None
-                    
-                data = self._client.read_all_data()
-                if data is not None:  # Success!
-                    self._client.disconnect()
-                    return data
+                time.sleep(delay)
 
-                # Read failed - disconnect before retrying to avoid stale connections
-                _LOGGER.warning("Read returned None (attempt %d/%d)", attempt + 1, max_retries)
-                try:
+            data = self._client.read_all_data(tiers, deadline)
+            if data is not None:
+                # Identification reads what fits before the deadline, the rest next poll
+                if self._identity_due(data):
+                    self._read_device_identification(data, deadline)
+                if not persistent:
                     self._client.disconnect()
-                except:
-                    pass
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                    
-            except Exception as err:
+                return data
+
+            # Read failed - disconnect to avoid a stale connection on the next poll
+            _LOGGER.warning("Read returned None after %d retries", self._client.last_poll_report.retries)
+        except Exception as err:
+            _LOGGER.warning("Error during data fetch: %s", err)
+
+        try:
+            self._client.disconnect()
+        except Exception:
+            pass
+        return None
+
+    async def _async_fetch_data(self, tiers=None, deadline: float | None = None) -> GrowattData | None:
+        """Fetch data from the inverter on the event loop (asyncio client)."""
+        persistent = self._client.persistent
+        if deadline is None:
+            deadline = time.monotonic() + self._client.poll_budget
+
+        try:
+            for attempt in range(CONNECT_ATTEMPTS):
+                # Persistent mode reuses a healthy connection, otherwise connect per poll
+                if await (self._client.ensure_connected() if persistent else self._client.connect()):
+                    break
                 _LOGGER.warning(
-                    "Error during data fetch (attempt %d/%d): %s", 
-                    attempt + 1, max_retries, err
+                    "Failed to connect to Growatt inverter (attempt %d/%d)",
+                    attempt + 1, CONNECT_ATTEMPTS
                 )
-                if self._client:
-                    try:
-                        self._client.disconnect()
-                    except:
-                        pass
-                
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    _LOGGER.error("All fetch attempts failed after %d retries", max_retries)
+                delay = self._connect_retry_delay(attempt, deadline)
+                if delay is None:
+                    _LOGGER.error("All connection attempts failed")
                     return None
-        
-        # Final disconnect if we get here
+                await asyncio.sleep(delay)
+
+            data = await self._client.read_all_data(tiers, deadline)
+            if data is not None:
+                # Identification reads what fits before the deadline, the rest next poll
+                if self._identity_due(data):
+                    await self._async_read_device_identification(data, deadline)
+                if not persistent:
+                    await self._client.disconnect()
+                return data
+
+            # Read failed - disconnect to avoid a stale connection on the next poll
+            _LOGGER.warning("Read returned None after %d retries", self._client.last_poll_report.retries)
+        except Exception as err:
+            _LOGGER.warning("Error during data fetch: %s", err)
+
         try:
-            self._client.disconnect()
-        except:
+            await self._client.disconnect()
+        except Exception:
             pass
         return None
 
+    def _connect_retry_delay(self, attempt: int, deadline: float) -> float | None:
+        """Jittered delay before another connection attempt, None when out of attempts or budget."""
+        if attempt + 1 >= CONNECT_ATTEMPTS:
+            return None
+        delay = self._client.retry_policy.delay(attempt)
+        if time.monotonic() + delay >= deadline:
+            return None
+        self._client.metrics.record_retry()
+        return delay
+
+    async def async_write_register(self, register: int, value: int) -> bool:
+        """Write a holding register (queued and batched with other writes, see write_queue.py)."""
+        if self._client is None:
+            _LOGGER.error("Cannot write register %d - client not initialized", register)
+            return False
+        return await self._write_queue.write(register, value)
+
+    async def _async_write_batch(self, writes: Dict[int, int]) -> Dict[int, bool]:
+        """Write a batch of holding registers through whichever client this coordinator uses."""
+        if self._client is None:
+            return {}
+        self._client.read_back_failed = False
+        if self._use_async:
+            results = await self._client.write_batch(writes)
+        else:
+            results = await self.hass.async_add_executor_job(self._client.write_batch, writes)
+        if not any(results.values()):
+            return results
+        if self._client.read_back_failed:
+            # Written values could not be confirmed - read the settings in a full refresh
+            self._poll_schedule.invalidate(POLL_TIER_CONFIG)
+            await self.async_request_refresh()
+        elif self.data is not None:
+            # Patch the read-back values into the current data and push them to the entities
+            self._client.apply_holding_cache(self.data)
+            self._track_changes(self.data, self._inverter_online)
+            self.async_set_updated_data(self.data)
+        return results
+
+    async def _async_restore_state(self) -> None:
+        """Load persisted device state and apply it to the client."""
+        await self._store.async_load()
+        pacing = self._store.get(SECTION_PACING)
+        if self._client is not None and isinstance(pacing, dict) and "interval" in pacing:
+            self._client.restore_pacing(pacing["interval"])
+        unsupported = self._store.get(SECTION_UNSUPPORTED_BLOCKS)
+        if self._client is not None and isinstance(unsupported, dict):
+            self._client.unsupported_blocks.restore(unsupported, time.monotonic())
+        self._restore_identity(self._store.get(SECTION_IDENTITY))
+
+    def _identity_key(self) -> str:
+        """Which inverter a stored identity belongs to (connection and slave ID)."""
+        connection_id = self._client.connection_id if self._client is not None else ""
+        return f"{connection_id}/{self._slave_id}"
+
+    def _restore_identity(self, identity: Any) -> None:
+        """Use the identification stored for this inverter instead of re-reading it."""
+        if not isinstance(identity, dict) or identity.get("device") != self._identity_key():
+            return
+        self._serial_number = identity.get("serial")
+        self._firmware_version = identity.get("firmware")
+        self._inverter_type = identity.get("inverter_type")
+        self._model_name = identity.get("model")
+        self._protocol_version = identity.get("protocol")
+        self._identity_poll_serial = identity.get("poll_serial")
+        self._identity_refresh = time.time() - identity.get("updated", 0) > IDENTITY_MAX_AGE
+        _LOGGER.debug("Restored device identification: serial=%s, model=%s", self._serial_number, self._model_name)
+
+    def _save_identity(self) -> None:
+        """Persist the device identification (written lazily by the store)."""
+        self._store.set(SECTION_IDENTITY, {
+            "device": self._identity_key(),
+            "serial": self._serial_number,
+            "firmware": self._firmware_version,
+            "inverter_type": self._inverter_type,
+            "model": self._model_name,
+            "protocol": self._protocol_version,
+            "poll_serial": self._identity_poll_serial,
+            "updated": int(time.time()),
+        })
+
+    def _identity_due(self, data: GrowattData) -> bool:
+        """Whether this poll should also read the device identification."""
+        poll_serial = data.serial_number
+        if poll_serial and self._identity_poll_serial and poll_serial != self._identity_poll_serial:
+            _LOGGER.info("Serial number changed (%s -> %s) - re-reading device identification",
+                         self._identity_poll_serial, poll_serial)
+            self._identity_poll_serial = poll_serial
+            self._identity_refresh = True
+            self._identity_retry_after = 0.0
+            self._identity_results = {}
+        return self._identity_refresh and time.monotonic() >= self._identity_retry_after
+
+    def _update_device_registry(self) -> None:
+        """Push re-read identification to the inverter device (if already registered)."""
+        device_reg = dr.async_get(self.hass)
+        device = device_reg.async_get_device(identifiers={(DOMAIN, f"{self.entry.entry_id}_inverter")})
+        if device is None:
+            return
+        info = self.get_device_info(DEVICE_TYPE_INVERTER)
+        device_reg.async_update_device(
+            device.id,
+            model=info["model"],
+            serial_number=info.get("serial_number"),
+            sw_version=info.get("sw_version"),
+            hw_version=info.get("hw_version"),
+        )
+
+    def _save_pacing(self) -> None:
+        """Persist the learned request interval and unsupported blocks (written lazily by the store)."""
+        if self._client is not None:
+            self._store.set(SECTION_PACING, {"interval": round(self._client.pacer.interval, 3)})
+            self._store.set(SECTION_UNSUPPORTED_BLOCKS, self._client.unsupported_blocks.as_dict())
+
+    @property
+    def connection_stats(self) -> Dict[str, Any]:
+        """Connection reuse counters for diagnostics."""
+        if self._client is None:
+            return {}
+        return {
+            "persistent_connection": self._client.persistent,
+            **self._client.connection_stats.as_dict(),
+            "read_interval": round(self._client.pacer.interval, 3),
+            "read_backoffs": self._client.pacer.backoffs,
+            "skipped_blocks": self._client.unsupported_blocks.skipped,
+            "stale_blocks": self._client.last_poll_report.stale_blocks,
+            "stale_fields": sorted(self._client.last_poll_report.stale_fields),
+            "unread_blocks": self._client.last_poll_report.unread_blocks,
+        }
+
+    @property
+    def poll_metrics(self) -> Dict[str, Any]:
+        """Poll timing and error aggregates over the client's recent history."""
+        if self._client is None:
+            return {}
+        return self._client.metrics.summary()
+
+    @property
+    def block_metrics(self) -> Dict[str, Dict[str, int]]:
+        """Per read block success / exception code / timeout counts."""
+        if self._client is None:
+            return {}
+        return self._client.metrics.block_summary()
+
+    async def async_shutdown(self) -> None:
+        """Close the connection when the config entry is unloaded."""
+        # Queued writes go out before the connection is released
+        await self._write_queue.async_shutdown()
+        await super().async_shutdown()
+        if self._client is not None:
+            # Drops this inverter's share; the gateway connection closes with the last one
+            if self._use_async:
+                await self._client.release()
+            else:
+                await self.hass.async_add_executor_job(self._client.release)
+
     async def async_config_entry_first_refresh(self) -> None:
         """Perform first refresh and handle setup errors."""
         try:
-            # Read device identification before first data refresh
-            await self.hass.async_add_executor_job(self._read_device_identification)
-            
+            # Start from the request pacing learned before the restart
+            await self._async_restore_state()
+
+            # Device identification is restored from storage; if there is none
+            # it is read during the first successful poll instead of up front
             await super().async_config_entry_first_refresh()
         except UpdateFailed as err:
             _LOGGER.error("Initial setup failed: %s", err)
             raise
     
-    def _read_device_identification(self):
-        """Read device identification info (serial, firmware, inverter type)."""
+    def _device_identification_reads(self) -> list:
+        """(key, address, count) holding register reads used to identify the device."""
+        profile_key = self._register_map_key
+
+        # Determine which serial number registers to use
+        # TL-X and TL-XH models use 3000-3015, others use 23-27
+        is_tl_x_model = 'tl_x' in profile_key or 'tl_xh' in profile_key
+        if is_tl_x_model:
+            # TL-X/TL-XH: registers 3000-3015 (30 characters)
+            serial_read = ("serial", 3000, 15)
+        else:
+            # Standard: registers 23-27 (10 characters)
+            serial_read = ("serial", 23, 5)
+
+        return [
+            serial_read,
+            ("firmware", 9, 3),          # Firmware version (registers 9-11)
+            ("inverter_type", 125, 8),   # Inverter type (registers 125-132)
+            ("protocol", 30099, 1),      # Protocol version (register 30099)
+        ]
+
+    def _read_device_identification(self, data: GrowattData, deadline: float):
+        """
+        Read device identification info (serial, firmware, inverter type) while
+        connected for a poll. Reads that do not fit before the deadline are
+        left to the next poll.
+        """
         try:
             if not self._client:
                 _LOGGER.warning("Cannot read device ID - client not initialized")
                 return
-            
-            profile_key = self._register_map_key
-            profile = REGISTER_MAPS.get(profile_key, {})
-            
-            # Determine which serial number registers to use
-            # TL-X and TL-XH models use 3000-3015, others use 23-27
-            is_tl_x_model = 'tl_x' in profile_key or 'tl_xh' in profile_key
-            
-            # Read serial number
-            try:
-                if is_tl_x_model:
-                    # TL-X/TL-XH: registers 3000-3015 (30 characters)
-                    result = self._client.client.read_holding_registers(address=3000, count=15, device_id=self._slave_id)
-                else:
-                    # Standard: registers 23-27 (10 characters)
-                    result = self._client.client.read_holding_registers(address=23, count=5, device_id=self._slave_id)
-                
-                if not result.isError():
-                    self._serial_number = self._registers_to_ascii(result.registers)
-                    _LOGGER.debug(f"Read serial number: {self._serial_number}")
-            except Exception as e:
-                _LOGGER.debug(f"Could not read serial number: {e}")
-            
-            # Read firmware version (registers 9-11)
-            try:
-                result = self._client.client.read_holding_registers(address=9, count=3, device_id=self._slave_id)
-                if not result.isError():
-                    self._firmware_version = self._registers_to_ascii(result.registers)
-                    _LOGGER.debug(f"Read firmware version: {self._firmware_version}")
-            except Exception as e:
-                _LOGGER.debug(f"Could not read firmware version: {e}")
-            
-            # Read inverter type (registers 125-132)
-            try:
-                result = self._client.client.read_holding_registers(address=125, count=8, device_id=self._slave_id)
-                if not result.isError():
-                    self._inverter_type = self._registers_to_ascii(result.registers)
-                    _LOGGER.debug(f"Read inverter type: {self._inverter_type}")
-
-                    # Parse model name from inverter type
-                    self._model_name = self._parse_model_name(self._inverter_type, profile)
-            except Exception as e:
-                _LOGGER.debug(f"Could not read inverter type: {e}")
-                # Fallback to profile name
-                self._model_name = profile.get("name", "Unknown Model")
-
-            # Read Protocol version (register 30099)
-            # If readable, shows actual protocol version (e.g., 2.01, 2.02, etc.)
-            try:
-                result = self._client.client.read_holding_registers(address=30099, count=1, device_id=self._slave_id)
-                if not result.isError() and len(result.registers) > 0:
-                    version_value = result.registers[0]
-                    if version_value > 0:
-                        # Format as version string (e.g., 201 -> "Protocol 2.01", 202 -> "Protocol 2.02")
-                        major = version_value // 100
-                        minor = version_value % 100
-                        self._protocol_version = f"Protocol {major}.{minor:02d}"
-                        _LOGGER.info(f"Detected protocol version: {self._protocol_version} (register 30099 = {version_value})")
-                    else:
-                        self._protocol_version = "Protocol Legacy"
-                        _LOGGER.info("Protocol version register returned 0, using Protocol Legacy")
+
+            for key, address, count in self._device_identification_reads():
+                if key in self._identity_results:
+                    continue
+                if not self._client.read_fits(count, deadline):
+                    break
+                self._identity_results[key] = self._client.read_holding_registers(address, count, deadline)
+            self._identification_read(data)
+
+        except Exception as e:
+            _LOGGER.error(f"Error reading device identification: {e}")
+
+    async def _async_read_device_identification(self, data: GrowattData, deadline: float):
+        """Read device identification info using the asyncio client (see _read_device_identification)."""
+        try:
+            if not self._client:
+                _LOGGER.warning("Cannot read device ID - client not initialized")
+                return
+
+            for key, address, count in self._device_identification_reads():
+                if key in self._identity_results:
+                    continue
+                if not self._client.read_fits(count, deadline):
+                    break
+                self._identity_results[key] = await self._client.read_holding_registers(address, count, deadline)
+            self._identification_read(data)
+
+        except Exception as e:
+            _LOGGER.error(f"Error reading device identification: {e}")
+
+    def _identification_read(self, data: GrowattData) -> None:
+        """Apply identification reads once all are done; schedule a retry if none of them succeeded."""
+        results = self._identity_results
+        if len(results) < len(self._device_identification_reads()):
+            _LOGGER.debug("Poll deadline reached - device identification continues with the next poll")
+            return
+        self._identity_results = {}
+        if all(result is None for result in results.values()):
+            _LOGGER.debug("Device identification not readable, retrying in %ds", IDENTITY_RETRY_DELAY)
+            self._identity_retry_after = time.monotonic() + IDENTITY_RETRY_DELAY
+            return
+        self._apply_device_identification(results)
+        self._identity_poll_serial = data.serial_number or None
+        self._identity_refresh = False
+        self._identity_updated = True
+
+    def _apply_device_identification(self, results: Dict[str, Any]) -> None:
+        """Decode device identification registers (None for reads that failed)."""
+        profile = REGISTER_MAPS.get(self._register_map_key, {})
+
+        # Serial number
+        try:
+            if results.get("serial") is not None:
+                self._serial_number = self._registers_to_ascii(results["serial"])
+                _LOGGER.debug(f"Read serial number: {self._serial_number}")
+        except Exception as e:
+            _LOGGER.debug(f"Could not read serial number: {e}")
+
+        # Firmware version
+        try:
+            if results.get("firmware") is not None:
+                self._firmware_version = self._registers_to_ascii(results["firmware"])
+                _LOGGER.debug(f"Read firmware version: {self._firmware_version}")
+        except Exception as e:
+            _LOGGER.debug(f"Could not read firmware version: {e}")
+
+        # Inverter type
+        try:
+            if results.get("inverter_type") is not None:
+                self._inverter_type = self._registers_to_ascii(results["inverter_type"])
+                _LOGGER.debug(f"Read inverter type: {self._inverter_type}")
+
+                # Parse model name from inverter type
+                self._model_name = self._parse_model_name(self._inverter_type, profile)
+        except Exception as e:
+            _LOGGER.debug(f"Could not read inverter type: {e}")
+            # Fallback to profile name
+            self._model_name = profile.get("name", "Unknown Model")
+
+        # Protocol version
+        # If readable, shows actual protocol version (e.g., 2.01, 2.02, etc.)
+        try:
+            result = results.get("protocol")
+            if result:
+                version_value = result[0]
+                if version_value > 0:
+                    # Format as version string (e.g., 201 -> "Protocol 2.01", 202 -> "Protocol 2.02")
+                    major = version_value // 100
+                    minor = version_value % 100
+                    self._protocol_version = f"Protocol {major}.{minor:02d}"
+                    _LOGGER.info(f"Detected protocol version: {self._protocol_version} (register 30099 = {version_value})")
                 else:
-                    # Register not available - likely legacy protocol
                     self._protocol_version = "Protocol Legacy"
-                    _LOGGER.debug("Could not read register 30099, assuming Protocol Legacy")
-            except Exception as e:
-                _LOGGER.debug(f"Could not read protocol version (30099): {e}")
+                    _LOGGER.info("Protocol version register returned 0, using Protocol Legacy")
+            else:
+                # Register not available - likely legacy protocol
                 self._protocol_version = "Protocol Legacy"
-
+                _LOGGER.debug("Could not read register 30099, assuming Protocol Legacy")
         except Exception as e:
-            _LOGGER.error(f"Error reading device identification: {e}")
+            _LOGGER.debug(f"Could not read protocol version (30099): {e}")
+            self._protocol_version = "Protocol Legacy"
 
     def _registers_to_ascii(self, registers):
         """Convert list of 16-bit registers to ASCII string."""
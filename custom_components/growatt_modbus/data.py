@@ -0,0 +1,218 @@
+"""
+Compact container for one poll's inverter values.
+
+GrowattData used to be a dataclass with a per-instance __dict__ holding
+~75 boxed numbers. With history kept per inverter across a fleet, that adds
+up, so the snapshot is now slotted and array-backed:
+
+- the decoder hands over the raw uint16 words of the fields the profile
+  decodes (two per field: the register and its 32-bit partner) plus a
+  validity flag per field; a field is scaled from them on first access,
+- values assigned afterwards (derived values, holding register settings,
+  debounce resets) go into a float64 array with a per-field state byte that
+  also remembers whether an int or a float was stored.
+
+Attribute access is unchanged (data.pv1_power, getattr(data, name, default)),
+and so are the value types: ints stay ints, floats stay floats. Attributes
+that only some code paths set (e.g. battery_charge_today in the daily
+total debounce) are slots without a default, so hasattr() is False until
+they are assigned, as before.
+"""
+
+from array import array
+from typing import Any, Dict, Tuple
+
+# Numeric fields and their defaults, in storage order. An int default makes
+# the field an integer field.
+FIELDS: Tuple[Tuple[str, Any], ...] = (
+    # Solar Input
+    ('pv1_voltage', 0.0),           # V
+    ('pv1_current', 0.0),           # A
+    ('pv1_power', 0.0),             # W
+    ('pv2_voltage', 0.0),           # V
+    ('pv2_current', 0.0),           # A
+    ('pv2_power', 0.0),             # W
+    ('pv3_voltage', 0.0),           # V
+    ('pv3_current', 0.0),           # A
+    ('pv3_power', 0.0),             # W
+    ('pv_total_power', 0.0),        # W
+
+    # AC Output (generic - usually Phase R for 3-phase)
+    ('ac_voltage', 0.0),            # V
+    ('ac_current', 0.0),            # A
+    ('ac_power', 0.0),              # W
+    ('ac_frequency', 0.0),          # Hz
+
+    # Three-Phase AC Output (individual phases)
+    ('ac_voltage_r', 0.0),          # V (Phase R/L1)
+    ('ac_current_r', 0.0),          # A (Phase R/L1)
+    ('ac_power_r', 0.0),            # W (Phase R/L1)
+    ('ac_voltage_s', 0.0),          # V (Phase S/L2)
+    ('ac_current_s', 0.0),          # A (Phase S/L2)
+    ('ac_power_s', 0.0),            # W (Phase S/L2)
+    ('ac_voltage_t', 0.0),          # V (Phase T/L3)
+    ('ac_current_t', 0.0),          # A (Phase T/L3)
+    ('ac_power_t', 0.0),            # W (Phase T/L3)
+
+    # Line-to-Line Voltages (3-phase only)
+    ('ac_voltage_rs', 0.0),         # V
+    ('ac_voltage_st', 0.0),         # V
+    ('ac_voltage_tr', 0.0),         # V
+
+    # Power Flow (storage/hybrid models)
+    ('power_to_user', 0.0),         # W
+    ('power_to_grid', 0.0),         # W (export)
+    ('power_to_load', 0.0),         # W
+    ('system_output_power', 0.0),   # W (total system output per inverter)
+
+    # Energy & Status
+    ('energy_today', 0.0),          # kWh
+    ('energy_total', 0.0),          # kWh
+    ('energy_to_user_today', 0.0),  # kWh
+    ('energy_to_user_total', 0.0),  # kWh
+    ('energy_to_grid_today', 0.0),  # kWh
+    ('energy_to_grid_total', 0.0),  # kWh
+    ('load_energy_today', 0.0),     # kWh
+    ('load_energy_total', 0.0),     # kWh
+
+    # Temperatures
+    ('inverter_temp', 0.0),         # °C
+    ('ipm_temp', 0.0),              # °C
+    ('boost_temp', 0.0),            # °C
+
+    # Battery (storage/hybrid models)
+    ('battery_voltage', 0.0),       # V
+    ('battery_current', 0.0),       # A (signed: +discharge, -charge)
+    ('battery_soc', 0.0),           # %
+    ('battery_temp', 0.0),          # °C
+    ('charge_power', 0.0),          # W
+    ('discharge_power', 0.0),       # W
+    ('charge_energy_today', 0.0),   # kWh
+    ('discharge_energy_today', 0.0),  # kWh
+    ('charge_energy_total', 0.0),   # kWh
+    ('discharge_energy_total', 0.0),  # kWh
+
+    # Diagnostics
+    ('status', 0),                  # Inverter status
+    ('derating_mode', 0),
+    ('fault_code', 0),
+    ('warning_code', 0),
+
+    # Control registers (writable holding registers)
+    ('export_limit_mode', 0),       # 0=Disabled, 1=RS485, 2=RS232, 3=CT
+    ('export_limit_power', 0),      # 0-1000 (0-100.0%)
+    ('active_power_rate', 100),     # 0-100 (max output power %)
+
+    # SPF Off-Grid Control registers
+    ('output_config', 0),           # 0=SBU, 1=SOL, 2=UTI, 3=SUB
+    ('charge_config', 0),           # 0=CSO, 1=SNU, 2=OSO
+    ('ac_input_mode', 0),           # 0=APL, 1=UPS, 2=GEN
+    ('battery_type', 0),            # 0=AGM, 1=FLD, 2=USE, 3=Lithium, 4=USE2
+    ('ac_charge_current', 0),       # 0-400 A
+    ('gen_charge_current', 0),      # 0-400 A
+    ('bat_low_to_uti', 0),          # Battery-dependent: Non-Lithium 200-640 (20-64V), Lithium 5-100 (0.5-10%)
+    ('ac_to_bat_volt', 0),          # Battery-dependent: Non-Lithium 200-640 (20-64V), Lithium 5-100 (0.5-10%)
+)
+
+FIELD_INDEX: Dict[str, int] = {name: index for index, (name, _default) in enumerate(FIELDS)}
+
+# Device info strings
+STRING_FIELDS = ('firmware_version', 'serial_number')
+
+# Set by some code paths only (daily total debounce) - no default
+OPTIONAL_FIELDS = (
+    'battery_charge_today',
+    'battery_discharge_today',
+    'grid_energy_today',
+    'grid_import_energy_today',
+)
+
+# Per-field state
+_UNSET = 0       # Default, or scaled from the raw words on first access
+_FLOAT = 1
+_INT = 2
+
+_EMPTY_RAW = array('H')
+
+
+class _Field:
+    """Descriptor for one numeric field"""
+    __slots__ = ('index', 'name', 'default', 'is_int')
+
+    def __init__(self, index: int, name: str, default):
+        self.index = index
+        self.name = name
+        self.default = default
+        self.is_int = isinstance(default, int)
+
+    def __get__(self, data, owner=None):
+        if data is None:
+            return self
+        state = data._state[self.index]
+        if state == _FLOAT:
+            return data._values[self.index]
+        if state == _INT:
+            return int(data._values[self.index])
+        return data._resolve(self)
+
+    def __set__(self, data, value) -> None:
+        data._values[self.index] = value
+        data._state[self.index] = _INT if isinstance(value, int) else _FLOAT
+
+
+class GrowattData:
+    """Container for Growatt inverter data"""
+
+    __slots__ = ('_values', '_state', '_decoder', '_raw', '_valid') + STRING_FIELDS + OPTIONAL_FIELDS
+
+    def __init__(self, **values):
+        self._values = array('d', bytes(8 * len(FIELDS)))
+        self._state = bytearray(len(FIELDS))
+        self._decoder = None
+        self._raw = _EMPTY_RAW
+        self._valid = b''
+        self.firmware_version = ""
+        self.serial_number = ""
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    def load_raw(self, decoder, raw: array, valid: bytes) -> None:
+        """Attach the raw register words captured by a CompiledDecoder (see decoder.py)"""
+        self._decoder = decoder
+        self._raw = raw
+        self._valid = valid
+
+    def _resolve(self, field: _Field):
+        """Value of a field nothing was assigned to: decoded from the raw words, or its default"""
+        decoder = self._decoder
+        entry = decoder.data_entries[field.index] if decoder is not None else -1
+        if entry < 0:
+            return field.default
+        value = decoder.entry_value(self._raw, self._valid, entry)
+        value = int(value or 0) if field.is_int else (value or 0.0)
+        field.__set__(self, value)
+        return value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """All fields (optional ones only if set)"""
+        result = {name: getattr(self, name) for name, _default in FIELDS}
+        for name in STRING_FIELDS + OPTIONAL_FIELDS:
+            if hasattr(self, name):
+                result[name] = getattr(self, name)
+        return result
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GrowattData):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{name}={value!r}" for name, value in self.as_dict().items())
+        return f"GrowattData({fields})"
+
+
+for _index, (_name, _default) in enumerate(FIELDS):
+    setattr(GrowattData, _name, _Field(_index, _name, _default))
+del _index, _name, _default
@@ -0,0 +1,409 @@
+"""
+Table-driven decoder from raw input registers to GrowattData.
+
+Each profile is compiled once into flat tables of buffer offsets, scales,
+signedness and 32-bit pairing. A poll writes its read blocks into a
+contiguous register image and the decoder turns that image into every
+GrowattData field in one pass.
+
+Two backends produce identical values: a pure-Python loop over the tables and
+a NumPy-vectorized version (when NumPy is installed). A profile only decodes
+15-55 fields, where NumPy's per-call overhead outweighs the vectorization, so
+the pure-Python backend is the default. See bench_decoder.py for timings.
+
+GrowattData (data.py) does not receive decoded values: decode() copies the
+raw words of every field into the snapshot and each field is scaled on first
+access with entry_value().
+"""
+
+import logging
+import time
+from array import array
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .const import REGISTER_MAPS
+from .data import FIELDS as DATA_FIELDS
+from .read_plan import segment_spans
+from .register_index import RegisterIndex, get_register_index
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# GrowattData field -> candidate register names, first match in the profile wins
+FIELD_REGISTERS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # Solar input
+    ('pv1_voltage', ('pv1_voltage',)),
+    ('pv1_current', ('pv1_current',)),
+    ('pv1_power', ('pv1_power_low',)),
+    ('pv2_voltage', ('pv2_voltage',)),
+    ('pv2_current', ('pv2_current',)),
+    ('pv2_power', ('pv2_power_low',)),
+    ('pv3_voltage', ('pv3_voltage',)),
+    ('pv3_current', ('pv3_current',)),
+    ('pv3_power', ('pv3_power_low',)),
+    ('pv_total_power', ('pv_total_power_low',)),
+    # AC output (generic - Phase R via alias for 3-phase)
+    ('ac_voltage', ('ac_voltage',)),
+    ('ac_current', ('ac_current',)),
+    ('ac_power', ('ac_power_low',)),
+    ('ac_frequency', ('ac_frequency',)),
+    # Three-phase AC output
+    ('ac_voltage_r', ('ac_voltage_r',)),
+    ('ac_current_r', ('ac_current_r',)),
+    ('ac_power_r', ('ac_power_r_low',)),
+    ('ac_voltage_s', ('ac_voltage_s',)),
+    ('ac_current_s', ('ac_current_s',)),
+    ('ac_power_s', ('ac_power_s_low',)),
+    ('ac_voltage_t', ('ac_voltage_t',)),
+    ('ac_current_t', ('ac_current_t',)),
+    ('ac_power_t', ('ac_power_t_low',)),
+    # Line-to-line voltages
+    ('ac_voltage_rs', ('line_voltage_rs',)),
+    ('ac_voltage_st', ('line_voltage_st',)),
+    ('ac_voltage_tr', ('line_voltage_tr',)),
+    # Power flow
+    ('system_output_power', ('system_output_power_low',)),
+    ('power_to_user', ('power_to_user_low',)),
+    ('power_to_grid', ('power_to_grid_low',)),
+    ('power_to_load', ('power_to_load_low',)),
+    # Energy
+    ('energy_today', ('energy_today_low',)),
+    ('energy_total', ('energy_total_low',)),
+    ('energy_to_user_today', ('energy_to_user_today_low',)),
+    ('energy_to_user_total', ('energy_to_user_total_low',)),
+    ('energy_to_grid_today', ('energy_to_grid_today_low',)),
+    ('energy_to_grid_total', ('energy_to_grid_total_low',)),
+    ('load_energy_today', ('load_energy_today_low',)),
+    ('load_energy_total', ('load_energy_total_low',)),
+    # Battery
+    ('battery_voltage', ('battery_voltage',)),
+    ('battery_current', ('battery_current_low', 'battery_current', 'battery_current_legacy')),
+    ('battery_soc', ('battery_soc',)),
+    ('battery_temp', ('battery_temp',)),
+    ('battery_power', ('battery_power_low',)),   # Signed, split into charge/discharge
+    ('charge_power', ('charge_power_low',)),
+    ('discharge_power', ('discharge_power_low',)),
+    ('charge_energy_today', ('charge_energy_today_low',)),
+    ('discharge_energy_today', ('discharge_energy_today_low',)),
+    ('charge_energy_total', ('charge_energy_total_low',)),
+    ('discharge_energy_total', ('discharge_energy_total_low',)),
+    # Temperatures
+    ('inverter_temp', ('inverter_temp',)),
+    ('ipm_temp', ('ipm_temp',)),
+    ('boost_temp', ('boost_temp',)),
+    # Diagnostics
+    ('derating_mode', ('derating_mode',)),
+    ('fault_code', ('fault_code',)),
+    ('warning_code', ('warning_code',)),
+)
+
+# Fields stored as integers
+INT_FIELDS = frozenset({'status', 'derating_mode', 'fault_code', 'warning_code'})
+
+# Decoded but not GrowattData attributes (post-processed into other fields)
+VIRTUAL_FIELDS = frozenset({'battery_power'})
+
+
+class RegisterLayout(NamedTuple):
+    """Placement of input register segments in a contiguous image"""
+    spans: Tuple[Tuple[int, int, int], ...]   # (first address, last address, offset)
+    size: int                                 # Slots in use; slot `size` is never valid
+
+    def offset(self, address: int) -> Optional[int]:
+        """Image offset of an address, or None if it is not polled"""
+        for first, last, offset in self.spans:
+            if first <= address <= last:
+                return offset + address - first
+        return None
+
+
+def build_layout(addresses) -> RegisterLayout:
+    """Lay out the polled input register segments back to back"""
+    spans = []
+    offset = 0
+    for first, last in segment_spans(addresses):
+        spans.append((first, last, offset))
+        offset += last - first + 1
+    return RegisterLayout(spans=tuple(spans), size=offset)
+
+
+class RegisterImage:
+    """Raw uint16 input register values for one inverter, a validity mask and read times"""
+
+    def __init__(self, layout: RegisterLayout, use_numpy: bool = False):
+        self.layout = layout
+        use_numpy = use_numpy and NUMPY_AVAILABLE
+        # One extra slot that is never written, used for unpolled addresses
+        size = layout.size + 1
+        if use_numpy:
+            self.values = np.zeros(size, dtype=np.uint16)
+            self.valid = np.zeros(size, dtype=bool)
+        else:
+            self.values = array('H', bytes(2 * size))
+            self.valid = bytearray(size)
+        # time.monotonic() each register was last read, whatever block read it
+        self.read_at = array('d', bytes(8 * size))
+        self._use_numpy = use_numpy
+
+    def clear(self) -> None:
+        """Mark every register as not read (unread registers decode as 0)"""
+        if self._use_numpy:
+            self.values.fill(0)
+            self.valid.fill(False)
+        else:
+            self.values[:] = array('H', bytes(2 * len(self.values)))
+            self.valid[:] = bytes(len(self.valid))
+
+    def store(self, start: int, registers: List[int], read_at: Optional[float] = None) -> None:
+        """Copy a block of registers read from the inverter into the image"""
+        offset = self.layout.offset(start)
+        count = len(registers)
+        if offset is None or self.layout.offset(start + count - 1) != offset + count - 1:
+            logger.debug(f"Registers {start}-{start + count - 1} are outside the register image")
+            return
+        if read_at is None:
+            read_at = time.monotonic()
+        self.read_at[offset:offset + count] = array('d', [read_at]) * count
+        if self._use_numpy:
+            self.values[offset:offset + count] = registers
+            self.valid[offset:offset + count] = True
+        else:
+            self.values[offset:offset + count] = array('H', registers)
+            self.valid[offset:offset + count] = b'\x01' * count
+
+    def invalidate(self, start: int, count: int) -> None:
+        """Forget the cached values of a block that could not be read"""
+        for address in range(start, start + count):
+            offset = self.layout.offset(address)
+            if offset is not None:
+                self.values[offset] = 0
+                self.valid[offset] = 0
+
+    def expire(self, start: int, count: int, cutoff: float) -> bool:
+        """
+        Forget the registers of a block last read before cutoff.
+
+        Returns True if any register of the block still holds a value.
+        """
+        kept = False
+        for address in range(start, start + count):
+            offset = self.layout.offset(address)
+            if offset is None or not self.valid[offset]:
+                continue
+            if self.read_at[offset] < cutoff:
+                self.values[offset] = 0
+                self.valid[offset] = 0
+            else:
+                kept = True
+        return kept
+
+    def get(self, address: int) -> Optional[int]:
+        """Raw value of a register, or None if it was not read"""
+        offset = self.layout.offset(address)
+        if offset is None or not self.valid[offset]:
+            return None
+        return int(self.values[offset])
+
+
+class CompiledDecoder:
+    """Flat decode tables for one register map"""
+
+    def __init__(self, register_map: Dict, index: RegisterIndex):
+        input_regs = register_map.get('input_registers', {})
+        self.layout = build_layout(input_regs.keys())
+        invalid = self.layout.size
+
+        def offset_of(address):
+            offset = self.layout.offset(address)
+            return invalid if offset is None else offset
+
+        # (field, address) pairs, status first
+        fields: List[Tuple[str, int]] = []
+        if input_regs:
+            fields.append(('status', min(input_regs)))
+        for field, names in FIELD_REGISTERS:
+            for name in names:
+                address = index.find(name)
+                if address is not None:
+                    fields.append((field, address))
+                    break
+
+        self.fields = tuple(field for field, _address in fields)
+        self.addresses = tuple(address for _field, address in fields)
+        # Partner register of paired fields (None for single registers)
+        self.partner_addresses = tuple(index.specs[address].pair for _field, address in fields)
+        self._block_fields: Dict[Tuple[int, int], frozenset] = {}
+
+        offsets, partners, paired, high, signed, scales = [], [], [], [], [], []
+        for _field, address in fields:
+            spec = index.specs[address]
+            offsets.append(offset_of(address))
+            paired.append(spec.pair is not None)
+            partners.append(offset_of(spec.pair) if spec.pair is not None else invalid)
+            high.append(spec.high)
+            signed.append(spec.signed)
+            scales.append(spec.combined_scale if spec.pair is not None else spec.scale)
+
+        # Row per field: (offset, partner offset, paired, high word, signed, scale)
+        self.entries = tuple(zip(offsets, partners, paired, high, signed, scales))
+        # Integer scales keep integer results, matching plain Python arithmetic
+        self.int_scale = tuple(isinstance(scale, int) for scale in scales)
+
+        # Image offsets of the words captured into a GrowattData: the register
+        # and its partner per entry (the never-written slot for single registers)
+        self._capture_words = tuple(word for offset, partner in zip(offsets, partners) for word in (offset, partner))
+        self._capture_valid = tuple(offsets)
+        # Entry decoded into each GrowattData field (-1 = not in this profile)
+        entry_of = {field: i for i, field in enumerate(self.fields) if field not in VIRTUAL_FIELDS}
+        self.data_entries = tuple(entry_of.get(name, -1) for name, _default in DATA_FIELDS)
+        self._battery_power_entry = self.fields.index('battery_power') if 'battery_power' in self.fields else -1
+
+        self.has_pv_total = 'pv_total_power' in self.fields
+        self.has_battery_power = 'battery_power' in self.fields
+        self.has_charge_power = 'charge_power' in self.fields
+        self.has_discharge_power = 'discharge_power' in self.fields
+
+        if NUMPY_AVAILABLE:
+            # HIGH/LOW word offsets per entry; single registers use the
+            # never-written slot (always 0) as their HIGH word
+            self._offsets = np.array(offsets, dtype=np.intp)
+            self._high_words = np.array(
+                [(o if h else p) if pr else invalid for o, p, pr, h in zip(offsets, partners, paired, high)],
+                dtype=np.intp)
+            self._low_words = np.array(
+                [(p if h else o) if pr else o for o, p, pr, h in zip(offsets, partners, paired, high)],
+                dtype=np.intp)
+            # Two's complement: values >= sign_limit have `modulus` subtracted
+            self._sign_limit = np.array(
+                [(0x80000000 if pr else 0x8000) if sg else 1 << 40 for pr, sg in zip(paired, signed)],
+                dtype=np.int64)
+            self._modulus = np.array([1 << 32 if pr else 1 << 16 for pr in paired], dtype=np.int64)
+            self._scales = np.array(scales, dtype=np.float64)
+
+    def fields_in(self, start: int, count: int) -> frozenset:
+        """Fields decoded (in whole or part) from registers start..start+count-1"""
+        key = (start, count)
+        fields = self._block_fields.get(key)
+        if fields is None:
+            end = start + count
+            fields = frozenset(
+                field for field, address, partner in zip(self.fields, self.addresses, self.partner_addresses)
+                if start <= address < end or (partner is not None and start <= partner < end)
+            )
+            self._block_fields[key] = fields
+        return fields
+
+    def fields_held(self, image: RegisterImage, start: int, count: int) -> frozenset:
+        """Fields of fields_in() whose register holds a value in the image"""
+        return frozenset(
+            field for field, address in zip(self.fields, self.addresses)
+            if field in self.fields_in(start, count) and image.get(address) is not None
+        )
+
+    def decode_values(self, image: RegisterImage) -> List[Optional[float]]:
+        """Scaled value per entry in self.fields (None if not read)"""
+        if NUMPY_AVAILABLE and isinstance(image.values, np.ndarray):
+            return self._decode_numpy(image)
+        return self._decode_python(image)
+
+    def _decode_python(self, image: RegisterImage) -> List[Optional[float]]:
+        values, valid = image.values, image.valid
+        result: List[Optional[float]] = []
+        for offset, partner, paired, high, signed, scale in self.entries:
+            if not valid[offset]:
+                result.append(None)
+                continue
+            raw = values[offset]
+            if paired:
+                # Unread registers are 0 in the image, so a missing partner reads as 0
+                other = values[partner]
+                combined = (raw << 16) | other if high else (other << 16) | raw
+                if signed and combined > 0x7FFFFFFF:
+                    combined -= 0x100000000
+                result.append(combined * scale)
+            else:
+                if signed and raw > 0x7FFF:
+                    raw -= 0x10000
+                result.append(raw * scale)
+        return result
+
+    def _decode_numpy(self, image: RegisterImage) -> List[Optional[float]]:
+        values, valid = image.values, image.valid
+        # Unread registers are 0 in the image, so a missing partner word reads as 0
+        ints = (values[self._high_words].astype(np.int64) << 16) | values[self._low_words]
+        ints -= (ints >= self._sign_limit) * self._modulus
+
+        scaled = (ints * self._scales).tolist()
+        ints = ints.tolist()
+        ok = valid[self._offsets].tolist()
+        return [
+            None if not is_valid else (int_value if int_scale else value)
+            for is_valid, int_value, value, int_scale in zip(ok, ints, scaled, self.int_scale)
+        ]
+
+    def capture(self, image: RegisterImage) -> Tuple[array, bytes]:
+        """Copy the raw words of every entry (register, partner) and their validity"""
+        values, valid = image.values, image.valid
+        if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+            raw = array('H', values[list(self._capture_words)].tobytes())
+            return raw, valid[list(self._capture_valid)].tobytes()
+        return array('H', [values[offset] for offset in self._capture_words]), \
+            bytes(valid[offset] for offset in self._capture_valid)
+
+    def entry_value(self, raw: array, valid: bytes, entry: int) -> Optional[float]:
+        """Scaled value of one entry from captured words (None if not read)"""
+        if not valid[entry]:
+            return None
+        _offset, _partner, paired, high, signed, scale = self.entries[entry]
+        value, other = raw[2 * entry], raw[2 * entry + 1]
+        if paired:
+            # Unread registers are 0 in the image, so a missing partner reads as 0
+            combined = (value << 16) | other if high else (other << 16) | value
+            if signed and combined > 0x7FFFFFFF:
+                combined -= 0x100000000
+            return combined * scale
+        if signed and value > 0x7FFF:
+            value -= 0x10000
+        return value * scale
+
+    def decode(self, image: RegisterImage, data) -> None:
+        """Attach the input register words of a register image to a GrowattData"""
+        raw, valid = self.capture(image)
+        data.load_raw(self, raw, valid)
+
+        if not self.has_pv_total:
+            # Calculate from strings if not available
+            data.pv_total_power = data.pv1_power + data.pv2_power + data.pv3_power
+
+        # Battery power (signed: positive=charging, negative=discharging)
+        if self.has_battery_power:
+            battery_power = self.entry_value(raw, valid, self._battery_power_entry) or 0.0
+            data.charge_power = battery_power if battery_power > 0 else 0.0
+            data.discharge_power = abs(battery_power) if battery_power < 0 else 0.0
+        else:
+            # Fallback: Calculate from V×I when the separate registers are missing
+            if not self.has_charge_power and data.battery_voltage > 0 and data.battery_current < 0:
+                data.charge_power = data.battery_voltage * abs(data.battery_current)
+            if not self.has_discharge_power and data.battery_voltage > 0 and data.battery_current > 0:
+                data.discharge_power = data.battery_voltage * data.battery_current
+
+
+# Decoders are shared by all clients using the same profile
+_DECODERS: Dict[str, CompiledDecoder] = {}
+
+
+def get_decoder(register_map_name: str) -> CompiledDecoder:
+    """Get the cached decoder for a profile, compiling it on first use"""
+    decoder = _DECODERS.get(register_map_name)
+    if decoder is None:
+        if register_map_name not in REGISTER_MAPS:
+            raise ValueError(f"Unknown register map: {register_map_name}")
+        decoder = CompiledDecoder(REGISTER_MAPS[register_map_name],
+                                  get_register_index(register_map_name))
+        _DECODERS[register_map_name] = decoder
+    return decoder
@@ -314,14 +314,11 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             raise ValueError(f"Coordinator not found for device {device_id}")
 
         # Write the register using the coordinator's client
-        success = await hass.async_add_executor_job(
-            coordinator._client.write_register, register, value
-        )
+        success = await coordinator.async_write_register(register, value)
 
         if success:
             _LOGGER.info("Successfully wrote value %d to register %d", value, register)
-            # Trigger a refresh to update the UI
-            await coordinator.async_request_refresh()
+            # The coordinator reads the register back and updates the UI
         else:
             _LOGGER.error("Failed to write value %d to register %d", value, register)
             raise ValueError(f"Failed to write to register {register}")
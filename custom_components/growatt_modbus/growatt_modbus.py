@@ -18,12 +18,45 @@ Hardware Setup:
 
 import time
 import logging
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, Tuple, Union
-from homeassistant.config_entries import ConfigEntry
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict, field
+from typing import Dict, Any, FrozenSet, Generator, Iterable, List, Optional, Set, Tuple, Union
 
 # Import register definitions
-from .const import STATUS_CODES, combine_registers, REGISTER_MAPS
+from .const import STATUS_CODES, combine_registers, REGISTER_MAPS, DEFAULT_MIN_READ_INTERVAL
+from .read_plan import (
+    ALL_TIERS,
+    ReadBlock,
+    REGISTER_TYPE_HOLDING,
+    get_read_plan,
+    link_cost_for,
+    poll_intervals,
+)
+from .register_index import get_register_index
+from .data import GrowattData
+from .decoder import RegisterImage, get_decoder
+from .unsupported_blocks import UnsupportedBlocks
+from .metrics import ClientMetrics
+from .retry import DEFAULT_POLL_BUDGET, RetryPolicy
+from .write_queue import plan_write_runs
+from .pacing import (
+    AdaptivePacer,
+    MODBUS_EXCEPTION_BUSY,
+    MODBUS_EXCEPTION_ILLEGAL_ADDRESS,
+    MODBUS_EXCEPTION_ILLEGAL_FUNCTION,
+    OUTCOME_BUSY,
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_TIMEOUT,
+)
+from .connection_pool import (
+    FairLock,
+    SharedConnection,
+    acquire_connection,
+    connection_key,
+    release_connection,
+)
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -58,130 +91,114 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 @dataclass
-class GrowattData:
-    """Container for Growatt inverter data"""
-    # Solar Input
-    pv1_voltage: float = 0.0          # V
-    pv1_current: float = 0.0          # A  
-    pv1_power: float = 0.0            # W
-    pv2_voltage: float = 0.0          # V
-    pv2_current: float = 0.0          # A
-    pv2_power: float = 0.0            # W
-    pv3_voltage: float = 0.0          # V
-    pv3_current: float = 0.0          # A
-    pv3_power: float = 0.0            # W
-    pv_total_power: float = 0.0       # W
-    
-    # AC Output (generic - usually Phase R for 3-phase)
-    ac_voltage: float = 0.0           # V
-    ac_current: float = 0.0           # A
-    ac_power: float = 0.0             # W
-    ac_frequency: float = 0.0         # Hz
-
-    # Three-Phase AC Output (individual phases)
-    ac_voltage_r: float = 0.0         # V (Phase R/L1)
-    ac_current_r: float = 0.0         # A (Phase R/L1)
-    ac_power_r: float = 0.0           # W (Phase R/L1)
-    ac_voltage_s: float = 0.0         # V (Phase S/L2)
-    ac_current_s: float = 0.0         # A (Phase S/L2)
-    ac_power_s: float = 0.0           # W (Phase S/L2)
-    ac_voltage_t: float = 0.0         # V (Phase T/L3)
-    ac_current_t: float = 0.0         # A (Phase T/L3)
-    ac_power_t: float = 0.0           # W (Phase T/L3)
-
-    # Line-to-Line Voltages (3-phase only)
-    ac_voltage_rs: float = 0.0        # V
-    ac_voltage_st: float = 0.0        # V
-    ac_voltage_tr: float = 0.0        # V
-    
-    # Power Flow (storage/hybrid models)
-    power_to_user: float = 0.0        # W
-    power_to_grid: float = 0.0        # W (export)
-    power_to_load: float = 0.0        # W
-    system_output_power: float = 0.0  # W (total system output per inverter)
-    
-    # Energy & Status
-    energy_today: float = 0.0         # kWh
-    energy_total: float = 0.0         # kWh
-    energy_to_user_today: float = 0.0 # kWh
-    energy_to_user_total: float = 0.0 # kWh
-    energy_to_grid_today: float = 0.0 # kWh
-    energy_to_grid_total: float = 0.0 # kWh
-    load_energy_today: float = 0.0    # kWh
-    load_energy_total: float = 0.0    # kWh
-    
-    # Temperatures
-    inverter_temp: float = 0.0        # °C
-    ipm_temp: float = 0.0             # °C
-    boost_temp: float = 0.0           # °C
-
-    # Battery (storage/hybrid models)
-    battery_voltage: float = 0.0      # V
-    battery_current: float = 0.0      # A (signed: +discharge, -charge)
-    battery_soc: float = 0.0          # %
-    battery_temp: float = 0.0         # °C
-    charge_power: float = 0.0         # W
-    discharge_power: float = 0.0      # W
-    charge_energy_today: float = 0.0  # kWh
-    discharge_energy_today: float = 0.0  # kWh
-    charge_energy_total: float = 0.0  # kWh
-    discharge_energy_total: float = 0.0  # kWh
-        
-    # Diagnostics
-    status: int = 0                   # Inverter status
-    derating_mode: int = 0
-    fault_code: int = 0
-    warning_code: int = 0
-
-    # Control registers (writable holding registers)
-    export_limit_mode: int = 0        # 0=Disabled, 1=RS485, 2=RS232, 3=CT
-    export_limit_power: int = 0       # 0-1000 (0-100.0%)
-    active_power_rate: int = 100      # 0-100 (max output power %)
-
-    # SPF Off-Grid Control registers
-    output_config: int = 0            # 0=SBU, 1=SOL, 2=UTI, 3=SUB
-    charge_config: int = 0            # 0=CSO, 1=SNU, 2=OSO
-    ac_input_mode: int = 0            # 0=APL, 1=UPS, 2=GEN
-    battery_type: int = 0             # 0=AGM, 1=FLD, 2=USE, 3=Lithium, 4=USE2
-    ac_charge_current: int = 0        # 0-400 A
-    gen_charge_current: int = 0       # 0-400 A
-    bat_low_to_uti: int = 0           # Battery-dependent: Non-Lithium 200-640 (20-64V), Lithium 5-100 (0.5-10%)
-    ac_to_bat_volt: int = 0           # Battery-dependent: Non-Lithium 200-640 (20-64V), Lithium 5-100 (0.5-10%)
-
-    # Device Info
-    firmware_version: str = ""
-    serial_number: str = ""
-
-class GrowattModbus:
-    """Growatt MIN series Modbus client"""
-    
-    def __init__(self, connection_type='tcp', host='192.168.1.100', port=502, 
-             device='/dev/ttyUSB0', baudrate=9600, slave_id=1, 
-             register_map='MIN_7000_10000TL_X', timeout=10):
-        """
-        Initialize Modbus connection
-        
-        Args:
-            connection_type: 'tcp' for RS485-to-TCP converter, 'serial' for RS485-to-USB
-            host: IP address for TCP connection
-            port: Port for TCP connection
-            device: Serial device path for USB connection
-            baudrate: Serial baud rate (usually 9600)
-            slave_id: Modbus slave ID (usually 1)
-            register_map: Which register mapping to use (see const.py)
-            timeout: Connection timeout in seconds (default: 10)
-        """
+class ConnectionStats:
+    """Connection reuse counters"""
+    connects: int = 0          # Successful connection handshakes
+    reuses: int = 0            # Polls that reused an already open connection
+    reconnects: int = 0        # Connections dropped after a failure or closed socket
+    idle_recycles: int = 0     # Connections closed after exceeding the idle timeout
+    connect_failures: int = 0  # Failed connection attempts
+
+    def as_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class PollReport:
+    """What the last poll read fresh, and what it kept from earlier polls"""
+    tiers: FrozenSet[str] = frozenset()
+    fresh_fields: Set[str] = field(default_factory=set)   # Decoded from registers read by this poll
+    stale_fields: Set[str] = field(default_factory=set)   # Last known values - their block failed
+    stale_blocks: List[str] = field(default_factory=list)
+    retries: int = 0                                      # Transactions repeated after a failure
+    unread_blocks: List[str] = field(default_factory=list)  # Not reached before the deadline
+    overrun: bool = False                                 # Poll was cut short by its deadline
+
+
+# Register values are kept after a failed read for at most this long after
+# they were last read (seconds); older values are dropped
+STALE_MAX_AGE = 600.0
+
+# Reconnect backoff after failed connection attempts (seconds)
+RECONNECT_BACKOFF_MIN = 1.0
+RECONNECT_BACKOFF_MAX = 60.0
+
+# Shortest response timeout an optional block is read with when the poll
+# deadline is close (seconds)
+MIN_RESPONSE_TIMEOUT = 0.5
+
+
+@contextmanager
+def response_timeout(client, timeout: Optional[float]):
+    """
+    Wait at most timeout seconds for the responses of requests sent inside
+    the block (None: the client's own timeout), restored afterwards.
+
+    pymodbus 3.x keeps the timeout in comm_params, copied to its transaction
+    manager (sync: client.transaction, async: client.ctx); 2.x in client.timeout.
+    """
+    if timeout is None or client is None:
+        yield
+        return
+    targets = []
+    for owner in (client, getattr(client, 'transaction', None), getattr(client, 'ctx', None)):
+        params = getattr(owner, 'comm_params', None)
+        if params is not None and hasattr(params, 'timeout_connect') and all(params is not t for t, _ in targets):
+            targets.append((params, 'timeout_connect'))
+    if not targets and hasattr(client, 'timeout'):
+        targets.append((client, 'timeout'))
+    saved = [(target, name, getattr(target, name)) for target, name in targets]
+    for target, name, _ in saved:
+        setattr(target, name, timeout)
+    try:
+        yield
+    finally:
+        for target, name, value in saved:
+            setattr(target, name, value)
+
+
+class GrowattModbusBase:
+    """
+    Transport-independent part of the Growatt client.
+
+    Holds the compiled profile (read plan, register index, decoder), the
+    connection health bookkeeping and the poll logic. Subclasses supply the
+    transport: GrowattModbus drives it with blocking pymodbus calls,
+    AsyncGrowattModbus (async_client.py) with pymodbus's asyncio clients.
+    """
+
+    _connection = None  # The link (SharedConnection / AsyncSharedConnection), set by subclasses
+
+    def __init__(self, connection_type='tcp', host='192.168.1.100', port=502,
+                 device='/dev/ttyUSB0', baudrate=9600, slave_id=1,
+                 register_map='MIN_7000_10000TL_X', timeout=10,
+                 persistent=False, idle_timeout=120, shared=False,
+                 min_read_interval=DEFAULT_MIN_READ_INTERVAL):
         self.connection_type = connection_type
         self.slave_id = slave_id
-        self.client: Optional[Union['ModbusTcpClient', 'ModbusSerialClient']] = None
-        self.last_read_time = 0
-        self.min_read_interval = 1.0  # 1 second minimum between reads
+        self._last_read_time = 0.0  # Without a link (no transport), else kept on the link
+        # Gap between requests adapts to the device, never below min_read_interval;
+        # on a shared link the pacer of the first inverter on it is used
+        self.pacer = AdaptivePacer(min_read_interval)
         self._timeout = timeout
+        self.shared = shared
+        self._holding_connection = False
+
+        # Persistent connection state
+        self.persistent = persistent
+        self.idle_timeout = idle_timeout
+        self.connection_stats = ConnectionStats()
+        self._connected = False
+        self._connection_suspect = False
+        self._last_activity = 0.0
+        self._reconnect_backoff = 0.0
+        self._reconnect_not_before = 0.0
 
         # Store connection details for logging
         self.host = host
         self.port = port
         self.device = device
+        self.baudrate = baudrate
 
         # Load register map
         if register_map not in REGISTER_MAPS:
@@ -190,6 +207,31 @@ class GrowattModbus:
         self.register_map = REGISTER_MAPS[register_map]
         self.register_map_name = register_map
 
+        # Precompiled read transactions, shared with other clients of this profile
+        # and link type. Block splits are chosen from the link's transaction costs.
+        self._read_plan = get_read_plan(register_map, link_cost_for(connection_type, baudrate))
+        # Seconds between reads of each poll tier (the caller decides which tiers to poll)
+        self.poll_intervals = poll_intervals(self.register_map)
+        # Tiers whose blocks were all read by the last poll
+        self.refreshed_tiers: FrozenSet[str] = frozenset()
+        # Optional blocks this device does not answer are skipped for a while
+        self.unsupported_blocks = UnsupportedBlocks()
+        # Bridged blocks this device refused - read as their parts instead
+        self._split_blocks: Set[ReadBlock] = set()
+        self.last_exception_code: Optional[int] = None  # Of the last failed read (None = no response)
+        # Recent transaction / poll timings for diagnostics
+        self.metrics = ClientMetrics()
+        # Failed transactions are retried individually within the poll budget
+        self.retry_policy = RetryPolicy()
+        self.poll_budget = DEFAULT_POLL_BUDGET
+        self.last_poll_report = PollReport()
+        # Adjacent register writes are only merged into one function 16 request
+        # for profiles whose firmware is known to accept it
+        self.write_multiple = self.register_map.get('supports_write_multiple', False)
+        self.read_back_failed = False  # Set when written registers could not be read back
+        # Name/alias -> address index and pair metadata, shared per profile
+        self._register_index = get_register_index(register_map)
+
         # Build connection identifier for logs
         if connection_type == 'tcp':
             self.connection_id = f"{host}:{port}"
@@ -197,590 +239,879 @@ class GrowattModbus:
             self.connection_id = f"{device}"
 
         logger.info(f"Initializing {self.register_map['name']} profile for {self.connection_id}")
-        
-        # Cache for raw register data
-        self._register_cache = {}
-        
+
+        # Compiled decoder and raw register image for input registers. The image
+        # and the holding register cache keep the values of tiers not polled
+        # every time, so each poll decodes fresh and cached values together.
+        self._decoder = get_decoder(register_map)
+        self._image = RegisterImage(self._decoder.layout)
+        self._holding_cache: Dict[int, int] = {}
+
+    @property
+    def connection_key(self) -> Tuple:
+        """Identifies the physical link (gateway or serial port) this client uses"""
+        return connection_key(self.connection_type, self.host, self.port, self.device)
+
+    @property
+    def transport_settings(self) -> Dict[str, Any]:
+        """Settings the transport is created with (must match between clients sharing it)"""
+        if self.connection_type == 'tcp':
+            return {'timeout': self._timeout, 'min_read_interval': self.pacer.floor}
+        return {'baudrate': self.baudrate, 'timeout': self._timeout, 'min_read_interval': self.pacer.floor}
+
+    # ---- Connection bookkeeping ---------------------------------------------
+
+    def _record_connect(self, result: bool, error: Optional[Exception] = None) -> None:
+        """Update connection state and stats after a connection attempt"""
+        if result:
+            logger.info(f"[{self.register_map['name']}@{self.connection_id}] Successfully connected")
+            self.connection_stats.connects += 1
+            self._connected = True
+            self._connection_suspect = False
+            self._last_activity = time.monotonic()
+        elif error is not None:
+            logger.error(f"[{self.register_map['name']}@{self.connection_id}] Connection error: {error}")
+            self.connection_stats.connect_failures += 1
+        else:
+            logger.error(f"[{self.register_map['name']}@{self.connection_id}] Failed to connect")
+            self.connection_stats.connect_failures += 1
+
+    def _connection_reusable(self, now: float) -> bool:
+        """
+        Persistent mode: decide whether the open connection can be reused.
+
+        The connection is reopened if the last transaction failed at the
+        transport level, the socket reports closed, or it has been idle for
+        longer than idle_timeout (RS485 gateways silently drop idle sockets).
+        """
+        if self._connection_suspect:
+            logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Previous transaction failed, reconnecting")
+            self.connection_stats.reconnects += 1
+        elif now - self._last_activity > self.idle_timeout:
+            logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Connection idle for {now - self._last_activity:.0f}s, reconnecting")
+            self.connection_stats.idle_recycles += 1
+        elif not self._socket_open():
+            logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Socket closed, reconnecting")
+            self.connection_stats.reconnects += 1
+        else:
+            self.connection_stats.reuses += 1
+            return True
+        return False
+
+    def _reconnect_allowed(self, now: float) -> bool:
+        """False while backing off after failed connection attempts"""
+        if now < self._reconnect_not_before:
+            logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Reconnect backoff, "
+                         f"next attempt in {self._reconnect_not_before - now:.1f}s")
+            return False
+        return True
+
+    def _record_reconnect(self, result: bool) -> None:
+        """Failed connection attempts back off exponentially so an offline gateway is not hammered"""
+        if result:
+            self._reconnect_backoff = 0.0
+            self._reconnect_not_before = 0.0
+            return
+        self._reconnect_backoff = min(max(self._reconnect_backoff * 2, RECONNECT_BACKOFF_MIN),
+                                      RECONNECT_BACKOFF_MAX)
+        self._reconnect_not_before = time.monotonic() + self._reconnect_backoff
+
+    def _socket_open(self) -> bool:
+        """Cheap local check of the transport state (no bus traffic)"""
+        return self._connection.is_open()
+
+    def _mark_activity(self, alive: bool = True) -> None:
+        """Record transport health after a transaction (persistent mode bookkeeping)"""
+        if alive:
+            self._last_activity = time.monotonic()
+        else:
+            self._connection_suspect = True
+
+    @property
+    def min_read_interval(self) -> float:
+        """Lower bound for the adaptive gap between requests (seconds)"""
+        return self.pacer.floor
+
+    @min_read_interval.setter
+    def min_read_interval(self, value: float) -> None:
+        self.pacer.reset(value)
+
+    def restore_pacing(self, interval: float) -> None:
+        """Start from a previously learned request interval"""
+        self.pacer.restore(interval)
+        logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Restored read interval {self.pacer.interval:.2f}s")
+
+    @property
+    def last_read_time(self) -> float:
+        """time.monotonic() of the last response on this client's link, from any inverter on it"""
+        if self._connection is not None:
+            return self._connection.last_transaction
+        return self._last_read_time
+
+    @last_read_time.setter
+    def last_read_time(self, value: float) -> None:
+        if self._connection is not None:
+            self._connection.last_transaction = value
+        self._last_read_time = value
+
+    def _read_interval_delay(self) -> float:
+        """Seconds to wait before the next read, as decided by the pacer"""
+        sleep_time = self.pacer.delay(time.monotonic() - self.last_read_time)
+        if sleep_time > 0:
+            logger.debug(f"Sleeping {sleep_time:.2f}s to respect read interval")
+        return sleep_time
+
+    def _record_transaction(self, outcome: str, latency: Optional[float] = None) -> None:
+        """Feed a read result to the pacer and start the quiet period"""
+        self.last_read_time = time.monotonic()
+        previous = self.pacer.interval
+        self.pacer.record(outcome, latency)
+        if self.pacer.interval > previous:
+            logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Read interval backed off "
+                         f"{previous:.2f}s -> {self.pacer.interval:.2f}s ({outcome})")
+
+    # ---- Request / response helpers -----------------------------------------
+
+    def _call_with_slave(self, method, **kwargs):
+        """
+        Call a pymodbus request method addressed to this client's slave ID.
+
+        Inverters sharing a gateway are only told apart by slave ID, so the
+        request must carry it whatever the pymodbus version calls the argument.
+        For asyncio clients the returned value is awaitable.
+        """
+        # Newer pymodbus uses device_id, 3.0-3.9 'slave', 2.5.x 'unit'
+        for keyword in ('device_id', 'slave', 'unit'):
+            try:
+                return method(**kwargs, **{keyword: self.slave_id})
+            except TypeError:
+                continue
+        # Simplest - positional arguments only
+        return method(*kwargs.values())
+
+    def _registers_from_response(self, response, register_type: str,
+                                 start_address: int, count: int,
+                                 latency: Optional[float] = None, queue_wait: float = 0.0,
+                                 pacing: float = 0.0) -> Optional[list]:
+        """Extract registers from a read response, recording link health, pacing and metrics"""
+        wire_time = latency or 0.0
+        # Input register failures matter more than optional holding registers
+        log = logger.warning if register_type != REGISTER_TYPE_HOLDING else logger.debug
+
+        # Handle different pymodbus versions for error checking
+        is_error = False
+        if hasattr(response, 'isError') and callable(response.isError):
+            is_error = response.isError()
+        elif hasattr(response, 'is_error') and callable(response.is_error):
+            is_error = response.is_error()
+        if is_error:
+            log(f"Modbus error reading {register_type} registers {start_address}-{start_address+count-1}: {response}")
+            # An exception response still proves the link is alive
+            exception_code = getattr(response, 'exception_code', None)
+            self.last_exception_code = exception_code
+            self._mark_activity(exception_code is not None)
+            if exception_code is None:
+                outcome = OUTCOME_TIMEOUT
+            elif exception_code == MODBUS_EXCEPTION_BUSY:
+                outcome = OUTCOME_BUSY
+            else:
+                outcome = OUTCOME_ERROR
+            self._record_transaction(outcome)
+            self.metrics.record_transaction(register_type, start_address, count, outcome,
+                                            exception_code, queue_wait, pacing, wire_time)
+            return None
+
+        if hasattr(response, 'registers'):
+            logger.debug(f"Successfully read {len(response.registers)} registers from {start_address}")
+            self._mark_activity()
+            if latency is not None:
+                # Relative to the link model so large and small reads compare fairly
+                latency /= self._read_plan.link.transaction_time(count)
+            self._record_transaction(OUTCOME_OK, latency)
+            self.metrics.record_transaction(register_type, start_address, count, OUTCOME_OK,
+                                            None, queue_wait, pacing, wire_time)
+            return response.registers
+
+        log(f"Unknown response type: {type(response)}, response: {response}")
+        self._record_transaction(OUTCOME_ERROR)
+        self.metrics.record_transaction(register_type, start_address, count, OUTCOME_ERROR,
+                                        None, queue_wait, pacing, wire_time)
+        return None
+
+    def _transaction_failed(self, register_type: str, start_address: int, count: int,
+                            queue_wait: float, pacing: float, wire_time: float) -> None:
+        """A read raised instead of returning a response (timeout, connection lost)"""
+        self.last_exception_code = None
+        self._mark_activity(False)
+        self._record_transaction(OUTCOME_TIMEOUT)
+        self.metrics.record_transaction(register_type, start_address, count, OUTCOME_TIMEOUT,
+                                        None, queue_wait, pacing, wire_time)
+
+    def _write_runs(self, writes: Dict[int, int]) -> List[Tuple[int, List[int]]]:
+        """Batch of register writes as runs of consecutive registers (see write_queue.py)"""
+        return plan_write_runs(writes, self.write_multiple)
+
+    def _store_read_back(self, start: int, values: List[int], registers: Optional[list]) -> None:
+        """Keep read-back values of written registers, warn about any that did not take"""
+        if registers is None:
+            logger.debug(f"[WRITE] Could not read back registers {start}-{start + len(values) - 1}")
+            self.read_back_failed = True
+            return
+        for offset, (written, value) in enumerate(zip(values, registers)):
+            self._holding_cache[start + offset] = value
+            if value != written:
+                logger.warning(f"[WRITE] Register {start + offset} reads back {value} after writing {written}")
+
+    def _write_succeeded(self, result, register: int, value: int) -> bool:
+        """Check a write response, recording link health"""
+        # Handle different pymodbus error APIs
+        self.last_exception_code = None
+        if result is None:
+            logger.error('[WRITE] No response from write_register call')
+            return False
+
+        if hasattr(result, 'isError') and callable(getattr(result, 'isError')) and result.isError():
+            logger.error(f"[WRITE] Inverter responded with error: {result}")
+            self.last_exception_code = getattr(result, 'exception_code', None)
+            self._mark_activity(hasattr(result, 'exception_code'))
+            return False
+
+        logger.info(f"[WRITE] Successfully wrote value {value} → register {register}")
+        self._mark_activity()
+        return True
+
+    def _write_multiple_refused(self, start: int, values: List[int]) -> bool:
+        """
+        True if a failed function 16 write was refused as an illegal function;
+        the run is written register by register instead, and so are later batches.
+        """
+        if self.last_exception_code != MODBUS_EXCEPTION_ILLEGAL_FUNCTION:
+            return False
+        logger.warning(f"[WRITE] Device refused writing registers {start}-{start + len(values) - 1} in one request "
+                       f"(function 16) - writing one register at a time")
+        self.write_multiple = False
+        return True
+
+    # ---- Poll logic ---------------------------------------------------------
+
+    def _poll(self, tiers: Optional[Iterable[str]] = None,
+              deadline: Optional[float] = None) -> Generator[ReadBlock, Optional[list], Optional[GrowattData]]:
+        """
+        One poll of the given tiers (all tiers by default), independent of the transport.
+
+        Yields every read block of the plan and expects the registers read
+        (or None on failure) to be sent back. Registers of tiers not polled
+        keep their cached values, and so do blocks that fail to read if their
+        values are not older than STALE_MAX_AGE (reported in last_poll_report).
+        Once the deadline (time.monotonic()) has passed, the remaining optional
+        blocks are not read and the poll returns what it has.
+        Returns the decoded data, or None if a required block could not be read.
+        """
+        data = GrowattData()
+        self.refreshed_tiers = frozenset()
+
+        tiers = ALL_TIERS if tiers is None else frozenset(tiers) & ALL_TIERS
+        if tiers == ALL_TIERS:
+            plan = self._read_plan
+        else:
+            plan = get_read_plan(self.register_map_name, self._read_plan.link, tiers)
+        if plan.status_address is None:
+            logger.error("No input registers defined in map")
+            return None
+
+        failed = set()
+        now = time.monotonic()
+        report = self.last_poll_report = PollReport(tiers=tiers)
+
+        # Execute the precompiled input register transactions
+        pending = deque(self._blocks_to_read(plan.input_blocks, now))
+        while pending:
+            block = pending.popleft()
+            if self.unsupported_blocks.skip(block, now):
+                logger.debug(f"Skipping input register block ({block.start}-{block.end}) - not supported by this device")
+                self._image.invalidate(block.start, block.count)
+                continue
+            if self._past_deadline(block, deadline):
+                # Not read this time - keep recent values, the tier stays due
+                failed.update(block.tiers)
+                self._keep_stale(block, now)
+                continue
+            logger.debug(f"Reading input registers {block.start}-{block.end} ({block.count} registers)")
+            self.last_exception_code = None
+            registers = yield block
+            if registers is None and self._split_refused(block):
+                pending.extendleft(reversed(block.parts))
+                continue
+            self.unsupported_blocks.record(block, registers is not None, now, self.last_exception_code)
+            if registers is None:
+                if block.required:
+                    logger.error(f"Failed to read required input register block ({block.start}-{block.end})")
+                    return None
+                failed.update(block.tiers)
+                if self._keep_stale(block, now):
+                    logger.warning(f"Failed to read input register block ({block.start}-{block.end}), keeping its last values")
+                else:
+                    logger.warning(f"Failed to read input register block ({block.start}-{block.end}), continuing with available data")
+                continue
+
+            self._image.store(block.start, registers, now)
+            report.fresh_fields.update(self._decoder.fields_in(block.start, block.count))
+
+        # Decode every input register field in one pass
+        decode_started = time.monotonic()
+        try:
+            self._decoder.decode(self._image, data)
+            logger.debug(f"Read data: PV={data.pv_total_power}W, AC={data.ac_power}W, Battery={getattr(data, 'battery_soc', 'N/A')}%, Temp={data.inverter_temp}°C")
+            if data.battery_voltage > 0:
+                logger.debug(f"Battery summary: {data.battery_voltage}V, {data.battery_current}A, {data.battery_soc}%, {data.battery_temp}°C, Charge={data.charge_power}W, Discharge={data.discharge_power}W")
+        except Exception as e:
+            logger.error(f"Error parsing register data: {e}", exc_info=True)
+            return None
+        self.metrics.record_decode(time.monotonic() - decode_started)
+
+        # Read device info from holding registers (last known values are kept
+        # until a read succeeds)
+        pending = deque(self._blocks_to_read(plan.holding_blocks, now))
+        while pending:
+            block = pending.popleft()
+            if self.unsupported_blocks.skip(block, now):
+                continue
+            if self._past_deadline(block, deadline):
+                failed.update(block.tiers)
+                continue
+            self.last_exception_code = None
+            registers = yield block
+            if registers is None and self._split_refused(block):
+                pending.extendleft(reversed(block.parts))
+                continue
+            self.unsupported_blocks.record(block, registers is not None, now, self.last_exception_code)
+            if registers is None:
+                logger.debug(f"Could not read holding registers {block.start}–{block.end} for device info")
+                failed.update(block.tiers)
+                if block.start in self._holding_cache:
+                    report.stale_blocks.append(f"{block.register_type} {block.start}-{block.end}")
+                continue
+            for i, value in enumerate(registers):
+                self._holding_cache[block.start + i] = value
+        decode_started = time.monotonic()
+        self._apply_device_info(data, self._holding_cache)
+        self.metrics.record_decode(time.monotonic() - decode_started)
+
+        self.refreshed_tiers = tiers - failed
+        if report.overrun:
+            logger.warning(f"Poll deadline reached - {len(report.unread_blocks)} register blocks not read this time")
+        return data
+
+    def _blocks_to_read(self, blocks: Iterable[ReadBlock], now: float) -> Iterable[ReadBlock]:
+        """
+        Blocks of a plan as this device is read: bridged blocks it refused, or
+        that overlap a skipped range (e.g. learned before a restart), are
+        replaced by their parts.
+        """
+        for block in blocks:
+            if block.parts and (block in self._split_blocks or self.unsupported_blocks.skip(block, now)):
+                yield from block.parts
+            else:
+                yield block
+
+    def _split_refused(self, block: ReadBlock) -> bool:
+        """
+        True if a failed block bridges undefined addresses the device refused
+        (Illegal Data Address); it is read as its parts from now on, and only
+        those count towards unsupported blocks.
+        """
+        if not block.parts or self.last_exception_code != MODBUS_EXCEPTION_ILLEGAL_ADDRESS:
+            return False
+        logger.info(f"Device refused {block.register_type} registers {block.start}-{block.end} - "
+                    f"reading them as {len(block.parts)} blocks without the undefined addresses")
+        self._split_blocks.add(block)
+        return True
+
+    def _past_deadline(self, block: ReadBlock, deadline: Optional[float]) -> bool:
+        """True if an optional block is not read because the poll is out of time"""
+        if block.required or deadline is None:
+            return False
+        if self.read_fits(block.count, deadline):
+            return False
+        report = self.last_poll_report
+        if not report.overrun:
+            report.overrun = True
+            self.metrics.record_overrun()
+        report.unread_blocks.append(f"{block.register_type} {block.start}-{block.end}")
+        return True
+
+    def read_fits(self, count: int, deadline: float) -> bool:
+        """True if a read of count registers is expected to finish before the deadline"""
+        # The pacing gap before the read and the read itself count against the deadline
+        now = time.monotonic()
+        expected = self.pacer.delay(now - self.last_read_time) + self._read_plan.link.transaction_time(count)
+        return now + expected < deadline
+
+    def _response_timeout(self, deadline: Optional[float]) -> Optional[float]:
+        """
+        Response timeout for a read that must not wait past the deadline: the
+        time left if that is shorter than the configured timeout, None to
+        keep the configured one.
+        """
+        if deadline is None:
+            return None
+        remaining = deadline - time.monotonic()
+        if remaining >= self._timeout:
+            return None
+        return max(remaining, MIN_RESPONSE_TIMEOUT)
+
+    def _keep_stale(self, block: ReadBlock, now: float) -> bool:
+        """
+        Keep the last values of a block that was not read (recorded as stale).
+
+        Read times are kept per register, so values read by any earlier block
+        count, whichever blocks read them. Registers older than STALE_MAX_AGE
+        are dropped. Returns True if any value of the block was kept.
+        """
+        if not self._image.expire(block.start, block.count, now - STALE_MAX_AGE):
+            return False
+        report = self.last_poll_report
+        report.stale_blocks.append(f"{block.register_type} {block.start}-{block.end}")
+        report.stale_fields.update(self._decoder.fields_held(self._image, block.start, block.count))
+        return True
+
+    def _retry_delay(self, block: ReadBlock, attempt: int, deadline: float) -> Optional[float]:
+        """Delay before retrying a failed transaction, or None to give up on it"""
+        if not block.required and self.unsupported_blocks.failing(block):
+            # Failed in earlier polls too - more likely unsupported than unlucky
+            return None
+        delay = self.retry_policy.backoff(attempt, self.last_exception_code, deadline - time.monotonic())
+        if delay is not None:
+            logger.debug(f"Retrying {block.register_type} registers {block.start}-{block.end} in {delay:.2f}s")
+            self.metrics.record_retry()
+            self.last_poll_report.retries += 1
+        return delay
+
+    def _get_register_value(self, address: int) -> Optional[float]:
+        """
+        Get scaled value from register, handling 32-bit pairs automatically
+        """
+        spec = self._register_index.specs.get(address)
+        if spec is None:
+            return None
+
+        raw_value = self._image.get(address)
+        if raw_value is None:
+            return None
+
+        if spec.pair is not None:
+            # 32-bit pair - combine HIGH and LOW words
+            pair_value = self._image.get(spec.pair) or 0
+            if spec.high:
+                combined = (raw_value << 16) | pair_value
+            else:
+                combined = (pair_value << 16) | raw_value
+
+            # Handle signed values if specified
+            if spec.signed and combined > 0x7FFFFFFF:
+                combined = combined - 0x100000000
+
+            return combined * spec.combined_scale
+
+        # Single register - handle signed 16-bit values if specified
+        if spec.signed and raw_value > 0x7FFF:
+            raw_value = raw_value - 0x10000
+
+        return raw_value * spec.scale
+
+    def _find_register_by_name(self, name: str) -> Optional[int]:
+        """Find register address by its name or alias"""
+        return self._register_index.find(name)
+
+    def apply_holding_cache(self, data: GrowattData) -> None:
+        """Patch device info and control settings in data from the cached holding registers"""
+        self._apply_device_info(data, self._holding_cache)
+
+    def _apply_device_info(self, data: GrowattData, holding_regs: Dict[int, int]) -> None:
+        """Decode device info and control settings from the holding registers read"""
+        holding_map = self.register_map.get("holding_registers", {})
+
+        # --- Device info (0–19) ---
+        try:
+            # Firmware version at register 3
+            if 3 in holding_map and 3 in holding_regs:
+                fw_version = holding_regs[3]
+                data.firmware_version = f"{fw_version >> 8}.{fw_version & 0xFF}"
+
+            # Serial number from registers 9-13
+            if all(i in holding_regs for i in range(9, 14)):
+                serial_parts = []
+                for i in range(9, 14):
+                    reg_val = holding_regs[i]
+                    # Convert 16-bit register to 2 ASCII characters
+                    if reg_val > 0:
+                        char1 = (reg_val >> 8) & 0xFF
+                        char2 = reg_val & 0xFF
+                        if char1 > 0 and 32 <= char1 <= 126:
+                            serial_parts.append(chr(char1))
+                        if char2 > 0 and 32 <= char2 <= 126:
+                            serial_parts.append(chr(char2))
+                data.serial_number = ''.join(serial_parts).rstrip('\x00')
+        except Exception as e:
+            logger.warning(f"Error reading device info: {e}")
+
+        # --- Export control (122–123) ---
+        if 122 in holding_map and 122 in holding_regs:
+            data.export_limit_mode = int(holding_regs[122])
+        if 123 in holding_map and 123 in holding_regs:
+            data.export_limit_power = int(holding_regs[123])
+        logger.debug("[EXPORT CTRL] Read export control: mode=%s, power=%s",
+                     data.export_limit_mode, data.export_limit_power)
+
+        # --- Active Power Rate (3) ---
+        if 3 in holding_map and 3 in holding_regs:
+            data.active_power_rate = int(holding_regs[3])
+            logger.debug("[POWER CTRL] Read active_power_rate: %s%%", data.active_power_rate)
+
+        # --- SPF Off-Grid Controls (1, 2, 8) ---
+        if 1 in holding_map and 1 in holding_regs:
+            data.output_config = int(holding_regs[1])
+        if 2 in holding_map and 2 in holding_regs:
+            data.charge_config = int(holding_regs[2])
+        if 8 in holding_map and 8 in holding_regs:
+            data.ac_input_mode = int(holding_regs[8])
+
+        # Battery configuration registers (37-39)
+        if 37 in holding_map and 37 in holding_regs:
+            data.bat_low_to_uti = int(holding_regs[37])
+        if 38 in holding_map and 38 in holding_regs:
+            data.ac_charge_current = int(holding_regs[38])
+        if 39 in holding_map and 39 in holding_regs:
+            data.battery_type = int(holding_regs[39])
+
+        # Generator charge current (83) and AC to battery voltage (95)
+        if 83 in holding_map and 83 in holding_regs:
+            data.gen_charge_current = int(holding_regs[83])
+        if 95 in holding_map and 95 in holding_regs:
+            data.ac_to_bat_volt = int(holding_regs[95])
+
+        if any(reg in holding_map for reg in (1, 2, 8, 37, 38, 39, 83, 95)):
+            logger.debug("[SPF CTRL] output_config=%s, charge_config=%s, ac_input_mode=%s, "
+                         "bat_low_to_uti=%s, ac_charge_current=%s, battery_type=%s, "
+                         "gen_charge_current=%s, ac_to_bat_volt=%s",
+                         data.output_config, data.charge_config, data.ac_input_mode,
+                         data.bat_low_to_uti, data.ac_charge_current, data.battery_type,
+                         data.gen_charge_current, data.ac_to_bat_volt)
+
+    def get_status_text(self, status_code: int) -> str:
+        """Convert status code to human readable text"""
+        status_info = STATUS_CODES.get(status_code, {'name': f'Unknown ({status_code})', 'desc': 'Unknown status code'})
+        return status_info['name']
+
+
+class GrowattModbus(GrowattModbusBase):
+    """Growatt MIN series Modbus client"""
+
+    def __init__(self, connection_type='tcp', host='192.168.1.100', port=502,
+             device='/dev/ttyUSB0', baudrate=9600, slave_id=1,
+             register_map='MIN_7000_10000TL_X', timeout=10,
+             persistent=False, idle_timeout=120, shared=False,
+             min_read_interval=DEFAULT_MIN_READ_INTERVAL):
+        """
+        Initialize Modbus connection
+
+        Args:
+            connection_type: 'tcp' for RS485-to-TCP converter, 'serial' for RS485-to-USB
+            host: IP address for TCP connection
+            port: Port for TCP connection
+            device: Serial device path for USB connection
+            baudrate: Serial baud rate (usually 9600)
+            slave_id: Modbus slave ID (usually 1)
+            register_map: Which register mapping to use (see const.py)
+            timeout: Connection timeout in seconds (default: 10)
+            persistent: Keep the connection open between polls (see ensure_connected)
+            idle_timeout: Persistent mode only - reopen connections idle longer than this (seconds)
+            shared: Share one connection with other clients on the same gateway/serial port
+            min_read_interval: Floor for the adaptive gap between requests (seconds)
+        """
+        self._connection: Optional[SharedConnection] = None
+        super().__init__(connection_type, host, port, device, baudrate, slave_id,
+                         register_map, timeout, persistent, idle_timeout, shared,
+                         min_read_interval)
+
+        # The pymodbus transport lives in a SharedConnection. Shared clients on
+        # the same gateway or serial port reuse one transport and take turns on
+        # the bus; private clients get their own.
         if connection_type == 'tcp':
             if not TCP_AVAILABLE:
                 raise ImportError("pymodbus not available for TCP connection")
-            
+        elif connection_type == 'serial':
+            if not SERIAL_AVAILABLE:
+                raise ImportError("pymodbus and/or pyserial not available for serial connection")
+        else:
+            raise ValueError("connection_type must be 'tcp' or 'serial'")
+
+        factory = lambda: self._create_client(connection_type, host, port, device, baudrate)
+        if shared:
+            self._connection = acquire_connection(self.connection_key, factory, self.transport_settings, self.pacer)
+        else:
+            self._connection = SharedConnection(self.connection_key, factory(), self.transport_settings, self.pacer)
+            self._connection.users = 1
+        self.pacer = self._connection.pacer
+
+    def _create_client(self, connection_type, host, port, device, baudrate):
+        """Create the underlying pymodbus client"""
+        # retries=0: pymodbus would otherwise re-send an unanswered request
+        # (default 3 times, each waiting the full timeout) before RetryPolicy
+        # even sees the failure - failed blocks are only retried by RetryPolicy
+        if connection_type == 'tcp':
             # Handle different pymodbus versions for TCP client
             try:
                 # New style (pymodbus 3.x+) - supports timeout parameter
-                self.client = ModbusTcpClient(host=host, port=port, timeout=self._timeout)
+                client = ModbusTcpClient(host=host, port=port, timeout=self._timeout, retries=0)
             except TypeError:
                 # Old style (pymodbus 2.x) - timeout must be set after creation
-                self.client = ModbusTcpClient(host, port)
+                client = ModbusTcpClient(host, port)
                 # Set timeout on the client object if supported
-                if hasattr(self.client, 'timeout'):
-                    self.client.timeout = self._timeout
+                if hasattr(client, 'timeout'):
+                    client.timeout = self._timeout
+                if hasattr(client, 'retries'):
+                    client.retries = 0
             
             logger.info(f"Connecting to Growatt via TCP: {host}:{port} (timeout: {self._timeout}s)")
-            
-        elif connection_type == 'serial':
-            if not SERIAL_AVAILABLE:
-                raise ImportError("pymodbus and/or pyserial not available for serial connection")
-            
-            # Handle different pymodbus versions
-            try:
-                # New style (pymodbus 3.x+)
-                self.client = ModbusClient(
-                    port=device,
-                    baudrate=baudrate,
-                    timeout=self._timeout,  # Use configured timeout, not hardcoded 3
-                    parity='N',
-                    stopbits=1,
-                    bytesize=8
-                )
-            except TypeError:
-                # Old style (pymodbus 2.x)
-                self.client = ModbusClient(
-                    method='rtu',
-                    port=device,
-                    baudrate=baudrate,
-                    timeout=self._timeout,  # Use configured timeout
-                    parity='N',
-                    stopbits=1,
-                    bytesize=8
-                )
-            logger.info(f"Connecting to Growatt via Serial: {device} @ {baudrate} baud (timeout: {self._timeout}s)")
-        else:
-            raise ValueError("connection_type must be 'tcp' or 'serial'")
-    
+            return client
+
+        # Handle different pymodbus versions
+        try:
+            # New style (pymodbus 3.x+)
+            client = ModbusClient(
+                port=device,
+                baudrate=baudrate,
+                timeout=self._timeout,  # Use configured timeout, not hardcoded 3
+                retries=0,
+                parity='N',
+                stopbits=1,
+                bytesize=8
+            )
+        except TypeError:
+            # Old style (pymodbus 2.x)
+            client = ModbusClient(
+                method='rtu',
+                port=device,
+                baudrate=baudrate,
+                timeout=self._timeout,  # Use configured timeout
+                parity='N',
+                stopbits=1,
+                bytesize=8
+            )
+            if hasattr(client, 'retries'):
+                client.retries = 0
+        logger.info(f"Connecting to Growatt via Serial: {device} @ {baudrate} baud (timeout: {self._timeout}s)")
+        return client
+
+    @property
+    def client(self) -> Optional[Union['ModbusTcpClient', 'ModbusSerialClient']]:
+        """Underlying pymodbus client (shared with other inverters on the same link)"""
+        return self._connection.client if self._connection is not None else None
+
+    @client.setter
+    def client(self, value) -> None:
+        self._connection.client = value
+
+    @property
+    def bus_lock(self) -> FairLock:
+        """Lock serializing transactions on this client's bus"""
+        return self._connection.lock
+
     def connect(self) -> bool:
         """Establish connection to inverter"""
         try:
-            result = self.client.connect()
-            if result:
-                logger.info(f"[{self.register_map['name']}@{self.connection_id}] Successfully connected")
-            else:
-                logger.error(f"[{self.register_map['name']}@{self.connection_id}] Failed to connect")
+            if self._holding_connection:
+                # Reconnect: drop our hold so a dead transport can be reopened
+                self._connection.close()
+                self._holding_connection = False
+            result = self._connection.open()
+            self._holding_connection = result
+            self._record_connect(result)
             return result
         except Exception as e:
-            logger.error(f"[{self.register_map['name']}@{self.connection_id}] Connection error: {e}")
+            self._record_connect(False, e)
             return False
     
     def disconnect(self):
         """Close connection"""
-        if self.client:
-            self.client.close()
+        self._connected = False
+        if self._holding_connection:
+            # The transport stays open while other inverters on the link hold it
+            self._connection.close()
+            self._holding_connection = False
             logger.info(f"[{self.register_map['name']}@{self.connection_id}] Disconnected")
-    
-    def _enforce_read_interval(self):
-        """Ensure minimum time between reads per Growatt spec"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_read_time
-        if time_since_last < self.min_read_interval:
-            sleep_time = self.min_read_interval - time_since_last
-            logger.debug(f"Sleeping {sleep_time:.2f}s to respect read interval")
+
+    def release(self):
+        """Disconnect and give up this client's share of the connection"""
+        if self._connection is None:
+            return
+        self.disconnect()
+        if self.shared:
+            release_connection(self._connection)
+        else:
+            self._connection.client.close()
+        self._connection = None
+
+    def ensure_connected(self) -> bool:
+        """
+        Persistent mode: reuse the open connection if it is still healthy.
+
+        See _connection_reusable for when a connection is reopened. Failed
+        connection attempts back off exponentially.
+        """
+        now = time.monotonic()
+
+        if self._connected:
+            if self._connection_reusable(now):
+                return True
+            if self._connection_suspect:
+                self._connection.reset()
+            self.disconnect()
+
+        if not self._reconnect_allowed(now):
+            return False
+
+        result = self.connect()
+        self._record_reconnect(result)
+        return result
+
+    def _enforce_read_interval(self) -> float:
+        """Wait out the adaptive gap before the next read, returns the time slept"""
+        sleep_time = self._read_interval_delay()
+        if sleep_time > 0:
             time.sleep(sleep_time)
-        self.last_read_time = time.time()
+        return sleep_time
     
-    def read_input_registers(self, start_address: int, count: int) -> Optional[list]:
-        """Read input registers with error handling"""
-        self._enforce_read_interval()
-        
+    def read_input_registers(self, start_address: int, count: int,
+                             deadline: Optional[float] = None) -> Optional[list]:
+        """Read input registers with error handling, waiting for the response until the deadline at most"""
+        queued = started = time.monotonic()
+        pacing = 0.0
         try:
-            # Try keyword arguments with different parameter names for pymodbus versions
-            try:
-                # Newer pymodbus uses device_id
-                response = self.client.read_input_registers(
-                    address=start_address, 
-                    count=count, 
-                    device_id=self.slave_id
-                )
-            except TypeError:
-                # Try with 'slave' parameter
-                try:
-                    response = self.client.read_input_registers(
-                        address=start_address, 
-                        count=count, 
-                        slave=self.slave_id
-                    )
-                except TypeError:
-                    # Try with 'unit' parameter (pymodbus 2.5.x)
-                    try:
-                        response = self.client.read_input_registers(
-                            start_address, 
-                            count, 
-                            unit=self.slave_id
-                        )
-                    except TypeError:
-                        # Simplest - just address and count
-                        response = self.client.read_input_registers(
-                            start_address, 
-                            count
-                        )
-            
-            # Handle different pymodbus versions for error checking
-            if hasattr(response, 'isError'):
-                if response.isError():
-                    logger.warning(f"Modbus error reading input registers {start_address}-{start_address+count-1}: {response}")
-                    return None
-            elif hasattr(response, 'is_error') and callable(response.is_error):
-                if response.is_error():
-                    logger.warning(f"Modbus error reading input registers {start_address}-{start_address+count-1}: {response}")
-                    return None
-
-            if hasattr(response, 'registers'):
-                logger.debug(f"Successfully read {len(response.registers)} registers from {start_address}")
-                return response.registers
-
-            logger.warning(f"Unknown response type: {type(response)}, response: {response}")
-            return None
-            
+            with self.bus_lock:
+                # The quiet gap follows the last response on the link, whichever inverter it was for
+                pacing = self._enforce_read_interval()
+                started = time.monotonic()
+                with response_timeout(self.client, self._response_timeout(deadline)):
+                    response = self._call_with_slave(self.client.read_input_registers,
+                                                     address=start_address, count=count)
+                latency = time.monotonic() - started
+            return self._registers_from_response(response, 'input', start_address, count, latency,
+                                                 started - queued - pacing, pacing)
         except Exception as e:
             logger.debug(f"Exception reading input registers: {e}")
+            self._transaction_failed('input', start_address, count,
+                                     started - queued - pacing, pacing, time.monotonic() - started)
             return None
     
-    def read_holding_registers(self, start_address: int, count: int) -> Optional[list]:
-        """Read holding registers with error handling (no unit/slave, no positional count)."""
-        self._enforce_read_interval()
+    def read_holding_registers(self, start_address: int, count: int,
+                               deadline: Optional[float] = None) -> Optional[list]:
+        """Read holding registers with error handling, waiting for the response until the deadline at most"""
+        queued = started = time.monotonic()
+        pacing = 0.0
         try:
-            response = self.client.read_holding_registers(address=start_address, count=count)
-            if hasattr(response, "isError") and callable(response.isError) and response.isError():
-                logger.debug("Modbus error reading holding registers %d-%d: %r", start_address, start_address + count - 1, response)
-                return None
-            if hasattr(response, "registers"):
-                return response.registers
-            logger.debug("Unexpected response type from read_holding_registers(%d, %d): %r", start_address, count, response)
-            return None
+            with self.bus_lock:
+                # The quiet gap follows the last response on the link, whichever inverter it was for
+                pacing = self._enforce_read_interval()
+                started = time.monotonic()
+                with response_timeout(self.client, self._response_timeout(deadline)):
+                    response = self._call_with_slave(self.client.read_holding_registers,
+                                                     address=start_address, count=count)
+                latency = time.monotonic() - started
+            return self._registers_from_response(response, REGISTER_TYPE_HOLDING, start_address, count, latency,
+                                                 started - queued - pacing, pacing)
         except Exception as e:
             logger.debug("Exception reading holding registers %d-%d: %s", start_address, start_address + count - 1, e)
+            self._transaction_failed(REGISTER_TYPE_HOLDING, start_address, count,
+                                     started - queued - pacing, pacing, time.monotonic() - started)
             return None
 
-    def _get_register_value(self, address: int) -> Optional[float]:
+    def _read_block(self, block: ReadBlock, deadline: Optional[float]) -> Optional[list]:
+        """Execute a single read plan transaction (optional blocks do not wait past the deadline)"""
+        if block.required:
+            deadline = None
+        if block.register_type == REGISTER_TYPE_HOLDING:
+            return self.read_holding_registers(block.start, block.count, deadline)
+        return self.read_input_registers(block.start, block.count, deadline)
+
+    def _read_block_retrying(self, block: ReadBlock, deadline: float) -> Optional[list]:
+        """Execute a read plan transaction, retrying transient failures until the deadline"""
+        registers = self._read_block(block, deadline)
+        attempt = 0
+        while registers is None:
+            delay = self._retry_delay(block, attempt, deadline)
+            if delay is None:
+                break
+            time.sleep(delay)
+            if not self._socket_open() and not self.connect():
+                break
+            attempt += 1
+            self.last_exception_code = None
+            registers = self._read_block(block, deadline)
+        return registers
+
+    def read_all_data(self, tiers: Optional[Iterable[str]] = None,
+                      deadline: Optional[float] = None) -> Optional[GrowattData]:
         """
-        Get scaled value from register, handling 32-bit pairs automatically
-        """
-        reg_info = self.register_map['input_registers'].get(address)
-        if not reg_info:
-            return None
-        
-        raw_value = self._register_cache.get(address)
-        if raw_value is None:
-            return None
-        
-        # Check if this is part of a 32-bit pair
-        pair_addr = reg_info.get('pair')
-        if pair_addr is not None:
-            # This register is part of a pair
-            # Determine if we're HIGH or LOW word
-            pair_info = self.register_map['input_registers'].get(pair_addr)
-            if not pair_info:
-                # Fallback to single register
-                scale = reg_info.get('scale', 1)
-                return raw_value * scale
-            
-            # Check which register is HIGH and which is LOW
-            if address < pair_addr:
-                # Current address is HIGH, pair is LOW
-                high_value = raw_value
-                low_value = self._register_cache.get(pair_addr, 0)
-                combined_scale = pair_info.get('combined_scale', 1)
-            else:
-                # Current address is LOW, pair is HIGH
-                low_value = raw_value
-                high_value = self._register_cache.get(pair_addr, 0)
-                combined_scale = reg_info.get('combined_scale', 1)
-            
-            # Combine 32-bit value
-            combined = (high_value << 16) | low_value
-            
-            # Handle signed values if specified
-            if reg_info.get('signed') or pair_info.get('signed'):
-                if combined > 0x7FFFFFFF:  # If sign bit is set
-                    combined = combined - 0x100000000
-            
-            return combined * combined_scale
-        
-        else:
-            # Single register, apply its scale
-            scale = reg_info.get('scale', 1)
+        Read all relevant data from inverter
 
-            # Handle signed 16-bit values if specified
-            if reg_info.get('signed'):
-                if raw_value > 0x7FFF:  # If sign bit is set in 16-bit value
-                    raw_value = raw_value - 0x10000  # Convert to negative
+        Args:
+            tiers: Poll tiers to read (default: all). Other registers keep
+                   the values read by earlier polls.
+            deadline: time.monotonic() after which no further blocks are read
+                      or retried (default: poll_budget from now). Blocks read
+                      by then are returned as partial data.
+        """
+        if deadline is None:
+            deadline = time.monotonic() + self.poll_budget
+        self.metrics.begin_poll()
+        poll = self._poll(tiers, deadline)
+        try:
+            block = next(poll)
+            while True:
+                block = poll.send(self._read_block_retrying(block, deadline))
+        except StopIteration as done:
+            self.metrics.end_poll(done.value is not None)
+            return done.value
+    
+    def _prepare_write(self) -> bool:
+        """Make sure the connection is usable before a write, reconnecting if needed"""
+        if not self.client:
+            logger.error("[WRITE] Cannot write register - client not initialized")
+            return False
 
-            return raw_value * scale
+        # ---- Connection / socket check and reconnection ----------------------
+        # Check if socket is open, attempt reconnect if not
+        if hasattr(self.client, 'is_socket_open'):
+            try:
+                socket_is_open = self.client.is_socket_open()
+                logger.debug(f"[WRITE] is_socket_open() returned: {socket_is_open}")
 
-    def read_all_data(self) -> Optional[GrowattData]:
-        """Read all relevant data from inverter"""
-        data = GrowattData()
-        
-        # Determine register range based on map
-        input_regs = self.register_map['input_registers']
-        
-        # Find min and max addresses to read
-        addresses = list(input_regs.keys())
-        if not addresses:
-            logger.error("No input registers defined in map")
-            return None
-        
-        min_addr = min(addresses)
-        max_addr = max(addresses)
-        
-        # Clear cache
-        self._register_cache = {}
-        
-        # Determine which ranges we need to read
-        # Check if we have registers in different ranges
-        has_base_range = any(0 <= addr < 1000 for addr in addresses)
-        has_storage_range = any(1000 <= addr < 2000 for addr in addresses)
-        has_3000_range = any(3000 <= addr < 4000 for addr in addresses)
-        has_875_range = any(875 <= addr < 1000 for addr in addresses)
-        has_8000_range = any(8000 <= addr < 8200 for addr in addresses)
-        has_31000_range = any(31000 <= addr < 32000 for addr in addresses)
-        
-        # Read base range (0-124) if needed - SPH models
-        if has_base_range:
-            logger.debug("Reading base range (0-124)")
-            registers = self.read_input_registers(0, 125)
-            if registers is None:
-                logger.error("Failed to read base input register block")
-                return None
-            
-            # Populate cache
-            for i, value in enumerate(registers):
-                self._register_cache[i] = value
-
-        # Read business storage range (875-999) if needed - WIT/WIS models
-        if has_875_range:
-            addrs_875 = sorted([addr for addr in addresses if 875 <= addr < 1000])
-            min_addr_875 = min(addrs_875)
-            max_addr_875 = max(addrs_875)
-            count_875 = (max_addr_875 - min_addr_875) + 1
-
-            logger.debug(f"Reading 875 range ({min_addr_875}-{max_addr_875}, {count_875} registers)")
-            if count_875 > 125:
-                for chunk_start in range(min_addr_875, max_addr_875 + 1, 125):
-                    chunk_count = min(125, max_addr_875 - chunk_start + 1)
-                    registers = self.read_input_registers(chunk_start, chunk_count)
-                    if registers is None:
-                        logger.warning(f"Failed to read 875 block ({chunk_start}-{chunk_start+chunk_count-1})")
-                    else:
-                        for i, value in enumerate(registers):
-                            self._register_cache[chunk_start + i] = value
-            else:
-                registers = self.read_input_registers(min_addr_875, count_875)
-                if registers is None:
-                    logger.warning("Failed to read business storage register block (875-999)")
-                else:
-                    for i, value in enumerate(registers):
-                        self._register_cache[min_addr_875 + i] = value
-        
-        # Read storage range (1000-1124) if needed - SPH/hybrid models with battery
-        if has_storage_range:
-            logger.debug("Reading storage range (1000-1124)")
-            registers = self.read_input_registers(1000, 125)
-            if registers is None:
-                logger.warning("Failed to read storage register block (battery data may be unavailable)")
-                # Don't return None - continue with what we have
-            else:
-                # Populate cache
-                for i, value in enumerate(registers):
-                    self._register_cache[1000 + i] = value
-        
-        # Read 3000 range if needed - MIN/MOD models
-        if has_3000_range:
-            addrs_3000 = sorted([addr for addr in addresses if 3000 <= addr < 4000])
-            max_3000_addr = max(addrs_3000)
-            count_3000 = (max_3000_addr - 3000) + 1
-
-            # Check if we need to split the read (max 125 registers per read)
-            if count_3000 > 125:
-                # Split into contiguous blocks
-                logger.debug(f"Splitting 3000 range into blocks (total range: 3000-{max_3000_addr}, {count_3000} registers)")
-
-                blocks = []
-                current_block = [addrs_3000[0]]
-                for addr in addrs_3000[1:]:
-                    if addr - current_block[-1] <= 10:  # Group if gap is small
-                        current_block.append(addr)
-                    else:
-                        blocks.append(current_block)
-                        current_block = [addr]
-                blocks.append(current_block)
-
-                # Read each block separately
-                for block in blocks:
-                    min_addr_block = min(block)
-                    max_addr_block = max(block)
-                    count_block = (max_addr_block - min_addr_block) + 1
-
-                    # Further split if block still exceeds 125 registers
-                    if count_block > 125:
-                        # Read in 125-register chunks
-                        for chunk_start in range(min_addr_block, max_addr_block + 1, 125):
-                            chunk_count = min(125, max_addr_block - chunk_start + 1)
-                            logger.debug(f"Reading 3000 sub-chunk ({chunk_start}-{chunk_start+chunk_count-1}, {chunk_count} registers)")
-                            registers = self.read_input_registers(chunk_start, chunk_count)
-                            if registers is None:
-                                logger.warning(f"Failed to read 3000 chunk ({chunk_start}-{chunk_start+chunk_count-1})")
-                            else:
-                                for i, value in enumerate(registers):
-                                    self._register_cache[chunk_start + i] = value
-                    else:
-                        logger.debug(f"Reading 3000 sub-range ({min_addr_block}-{max_addr_block}, {count_block} registers)")
-                        registers = self.read_input_registers(min_addr_block, count_block)
-                        if registers is None:
-                            logger.warning(f"Failed to read 3000 block ({min_addr_block}-{max_addr_block})")
-                        else:
-                            for i, value in enumerate(registers):
-                                addr = min_addr_block + i
-                                self._register_cache[addr] = value
-                                # Log load_energy registers specifically
-                                if addr in [3075, 3076, 3077, 3078]:
-                                    logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Cached 3000 range: reg {addr} = {value}")
-            else:
-                # Single read is sufficient
-                logger.debug(f"Reading 3000 range (3000-{max_3000_addr}, {count_3000} registers)")
-                registers = self.read_input_registers(3000, count_3000)
-                if registers is None:
-                    logger.error("Failed to read main input register block")
-                    return None
+                if not socket_is_open:
+                    logger.warning("[WRITE] Socket not open, attempting reconnect...")
+                    if not self.connect():
+                        logger.error("[WRITE] Reconnect failed - not connected")
+                        return False
+                    logger.info("[WRITE] Reconnect successful, proceeding with write")
 
-                # Populate cache
-                for i, value in enumerate(registers):
-                    self._register_cache[3000 + i] = value
-
-        # Read 8000 range if needed - WIT/WIS battery/storage data
-        if has_8000_range:
-            addrs_8000 = sorted([addr for addr in addresses if 8000 <= addr < 8200])
-            min_addr_8000 = min(addrs_8000)
-            max_addr_8000 = max(addrs_8000)
-            count_8000 = (max_addr_8000 - min_addr_8000) + 1
-
-            logger.debug(f"Reading 8000 range ({min_addr_8000}-{max_addr_8000}, {count_8000} registers)")
-            if count_8000 > 125:
-                for chunk_start in range(min_addr_8000, max_addr_8000 + 1, 125):
-                    chunk_count = min(125, max_addr_8000 - chunk_start + 1)
-                    registers = self.read_input_registers(chunk_start, chunk_count)
-                    if registers is None:
-                        logger.warning(f"Failed to read 8000 block ({chunk_start}-{chunk_start+chunk_count-1})")
-                    else:
-                        for i, value in enumerate(registers):
-                            self._register_cache[chunk_start + i] = value
-            else:
-                registers = self.read_input_registers(min_addr_8000, count_8000)
-                if registers is None:
-                    logger.warning("Failed to read 8000 register block")
-                else:
-                    for i, value in enumerate(registers):
-                        self._register_cache[min_addr_8000 + i] = value
-
-        # Read 31000 range if needed - MOD extended battery/BMS range
-        if has_31000_range:
-            # Split into contiguous blocks to avoid reading large gaps
-            # (e.g., 31126-31127 and 31200-31209 are separate blocks with a 73-register gap)
-            addrs_31000 = sorted([addr for addr in addresses if 31000 <= addr < 32000])
-
-            # Group into contiguous blocks (max gap of 10 registers)
-            blocks = []
-            current_block = [addrs_31000[0]]
-            for addr in addrs_31000[1:]:
-                if addr - current_block[-1] <= 10:
-                    current_block.append(addr)
-                else:
-                    blocks.append(current_block)
-                    current_block = [addr]
-            blocks.append(current_block)
-
-            # Read each block separately
-            for block in blocks:
-                min_addr_block = min(block)
-                max_addr_block = max(block)
-                count_block = (max_addr_block - min_addr_block) + 1
-                logger.debug(f"Reading 31000 sub-range ({min_addr_block}-{max_addr_block}, {count_block} registers)")
-                registers = self.read_input_registers(min_addr_block, count_block)
-                if registers is None:
-                    logger.warning(f"Failed to read extended battery register block ({min_addr_block}-{max_addr_block})")
-                    # Don't return None - continue with what we have
-                else:
-                    # Populate cache
-                    for i, value in enumerate(registers):
-                        self._register_cache[min_addr_block + i] = value
+            except Exception as e:
+                logger.warning(f"[WRITE] is_socket_open() threw exception: {e}")
+                logger.warning("[WRITE] Attempting reconnect due to error...")
+                if not self.connect():
+                    logger.error("[WRITE] Reconnect failed after exception")
+                    return False
+                logger.info("[WRITE] Reconnect successful after exception")
+        else:
+            # Client doesn't support is_socket_open(), try to reconnect to be safe
+            logger.debug("[WRITE] Client has no is_socket_open(), attempting reconnect...")
+            if not self.connect():
+                logger.error("[WRITE] Reconnect failed - cannot determine socket state")
+                return False
+            logger.info("[WRITE] Reconnect successful (no is_socket_open available)")
+        # -----------------------------------------------------------------------
+        return True
 
-        # Now extract values using the register map
-        try:
-            # Status
-            data.status = int(self._get_register_value(min_addr) or 0)
-            
-            # PV String 1
-            pv1_voltage_addr = self._find_register_by_name('pv1_voltage')
-            pv1_current_addr = self._find_register_by_name('pv1_current')
-            pv1_power_low_addr = self._find_register_by_name('pv1_power_low')
-            
-            if pv1_voltage_addr:
-                data.pv1_voltage = self._get_register_value(pv1_voltage_addr) or 0.0
-            if pv1_current_addr:
-                data.pv1_current = self._get_register_value(pv1_current_addr) or 0.0
-            if pv1_power_low_addr:
-                data.pv1_power = self._get_register_value(pv1_power_low_addr) or 0.0
-            
-            # PV String 2
-            pv2_voltage_addr = self._find_register_by_name('pv2_voltage')
-            pv2_current_addr = self._find_register_by_name('pv2_current')
-            pv2_power_low_addr = self._find_register_by_name('pv2_power_low')
-            
-            if pv2_voltage_addr:
-                data.pv2_voltage = self._get_register_value(pv2_voltage_addr) or 0.0
-            if pv2_current_addr:
-                data.pv2_current = self._get_register_value(pv2_current_addr) or 0.0
-            if pv2_power_low_addr:
-                data.pv2_power = self._get_register_value(pv2_power_low_addr) or 0.0
-            
-            # PV String 3 (if available)
-            pv3_voltage_addr = self._find_register_by_name('pv3_voltage')
-            pv3_current_addr = self._find_register_by_name('pv3_current')
-            pv3_power_low_addr = self._find_register_by_name('pv3_power_low')
-            
-            if pv3_voltage_addr:
-                data.pv3_voltage = self._get_register_value(pv3_voltage_addr) or 0.0
-            if pv3_current_addr:
-                data.pv3_current = self._get_register_value(pv3_current_addr) or 0.0
-            if pv3_power_low_addr:
-                data.pv3_power = self._get_register_value(pv3_power_low_addr) or 0.0
-            
-            # Total PV Power
-            pv_total_addr = self._find_register_by_name('pv_total_power_low')
-            if pv_total_addr:
-                data.pv_total_power = self._get_register_value(pv_total_addr) or 0.0
-            else:
-                # Calculate from strings if not available
-                data.pv_total_power = data.pv1_power + data.pv2_power + data.pv3_power
-            
-            # AC Output (generic - will use Phase R via alias for 3-phase)
-            ac_voltage_addr = self._find_register_by_name('ac_voltage')
-            ac_current_addr = self._find_register_by_name('ac_current')
-            ac_power_addr = self._find_register_by_name('ac_power_low')
-            ac_freq_addr = self._find_register_by_name('ac_frequency')
-
-            if ac_voltage_addr:
-                data.ac_voltage = self._get_register_value(ac_voltage_addr) or 0.0
-            if ac_current_addr:
-                data.ac_current = self._get_register_value(ac_current_addr) or 0.0
-            if ac_power_addr:
-                data.ac_power = self._get_register_value(ac_power_addr) or 0.0
-            if ac_freq_addr:
-                data.ac_frequency = self._get_register_value(ac_freq_addr) or 0.0
-
-            # Three-Phase AC Output (individual phases)
-            # Phase R
-            ac_voltage_r_addr = self._find_register_by_name('ac_voltage_r')
-            ac_current_r_addr = self._find_register_by_name('ac_current_r')
-            ac_power_r_addr = self._find_register_by_name('ac_power_r_low')
-            if ac_voltage_r_addr:
-                data.ac_voltage_r = self._get_register_value(ac_voltage_r_addr) or 0.0
-            if ac_current_r_addr:
-                data.ac_current_r = self._get_register_value(ac_current_r_addr) or 0.0
-            if ac_power_r_addr:
-                data.ac_power_r = self._get_register_value(ac_power_r_addr) or 0.0
-
-            # Phase S
-            ac_voltage_s_addr = self._find_register_by_name('ac_voltage_s')
-            ac_current_s_addr = self._find_register_by_name('ac_current_s')
-            ac_power_s_addr = self._find_register_by_name('ac_power_s_low')
-            if ac_voltage_s_addr:
-                data.ac_voltage_s = self._get_register_value(ac_voltage_s_addr) or 0.0
-            if ac_current_s_addr:
-                data.ac_current_s = self._get_register_value(ac_current_s_addr) or 0.0
-            if ac_power_s_addr:
-                data.ac_power_s = self._get_register_value(ac_power_s_addr) or 0.0
-
-            # Phase T
-            ac_voltage_t_addr = self._find_register_by_name('ac_voltage_t')
-            ac_current_t_addr = self._find_register_by_name('ac_current_t')
-            ac_power_t_addr = self._find_register_by_name('ac_power_t_low')
-            if ac_voltage_t_addr:
-                data.ac_voltage_t = self._get_register_value(ac_voltage_t_addr) or 0.0
-            if ac_current_t_addr:
-                data.ac_current_t = self._get_register_value(ac_current_t_addr) or 0.0
-            if ac_power_t_addr:
-                data.ac_power_t = self._get_register_value(ac_power_t_addr) or 0.0
-
-            # Line-to-Line Voltages
-            ac_voltage_rs_addr = self._find_register_by_name('line_voltage_rs')
-            ac_voltage_st_addr = self._find_register_by_name('line_voltage_st')
-            ac_voltage_tr_addr = self._find_register_by_name('line_voltage_tr')
-            if ac_voltage_rs_addr:
-                data.ac_voltage_rs = self._get_register_value(ac_voltage_rs_addr) or 0.0
-            if ac_voltage_st_addr:
-                data.ac_voltage_st = self._get_register_value(ac_voltage_st_addr) or 0.0
-            if ac_voltage_tr_addr:
-                data.ac_voltage_tr = self._get_register_value(ac_voltage_tr_addr) or 0.0
-            
-            # System output power (total per inverter)
-            system_output_addr = self._find_register_by_name('system_output_power_low')
-            if system_output_addr:
-                data.system_output_power = self._get_register_value(system_output_addr) or 0.0
-
-            # Power Flow (if available - storage/hybrid models)
-            power_to_user_addr = self._find_register_by_name('power_to_user_low')
-            power_to_grid_addr = self._find_register_by_name('power_to_grid_low')
-            power_to_load_addr = self._find_register_by_name('power_to_load_low')
-            
-            if power_to_user_addr:
-                data.power_to_user = self._get_register_value(power_to_user_addr) or 0.0
-            if power_to_grid_addr:
-                data.power_to_grid = self._get_register_value(power_to_grid_addr) or 0.0
-            if power_to_load_addr:
-                data.power_to_load = self._get_register_value(power_to_load_addr) or 0.0
-            
-            # Energy Today
-            energy_today_addr = self._find_register_by_name('energy_today_low')
-            if energy_today_addr:
-                data.energy_today = self._get_register_value(energy_today_addr) or 0.0
-                logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Energy today from reg {energy_today_addr}: {data.energy_today} kWh (cache: {self._register_cache.get(energy_today_addr)})")
-            
-            # Energy Total
-            energy_total_addr = self._find_register_by_name('energy_total_low')
-            if energy_total_addr:
-                data.energy_total = self._get_register_value(energy_total_addr) or 0.0
-            
-            # Energy Breakdown (if available)
-            self._read_energy_breakdown(data)
-            
-            # Battery Data (if available - storage/hybrid models)
-            self._read_battery_data(data)
-            
-            # Temperatures
-            inverter_temp_addr = self._find_register_by_name('inverter_temp')
-            ipm_temp_addr = self._find_register_by_name('ipm_temp')
-            boost_temp_addr = self._find_register_by_name('boost_temp')
-            
-            if inverter_temp_addr:
-                data.inverter_temp = self._get_register_value(inverter_temp_addr) or 0.0
-            if ipm_temp_addr:
-                data.ipm_temp = self._get_register_value(ipm_temp_addr) or 0.0
-            if boost_temp_addr:
-                data.boost_temp = self._get_register_value(boost_temp_addr) or 0.0
-            
-            # Diagnostics
-            derating_addr = self._find_register_by_name('derating_mode')
-            fault_addr = self._find_register_by_name('fault_code')
-            warning_addr = self._find_register_by_name('warning_code')
-            
-            if derating_addr:
-                data.derating_mode = int(self._get_register_value(derating_addr) or 0)
-            if fault_addr:
-                data.fault_code = int(self._get_register_value(fault_addr) or 0)
-            if warning_addr:
-                data.warning_code = int(self._get_register_value(warning_addr) or 0)
-            
-            logger.debug(f"Read data: PV={data.pv_total_power}W, AC={data.ac_power}W, Battery={getattr(data, 'battery_soc', 'N/A')}%, Temp={data.inverter_temp}°C")
-            
-        except Exception as e:
-            logger.error(f"Error parsing register data: {e}", exc_info=True)
-            return None
-        
-        # Read device info from holding registers
-        self._read_device_info(data)
-        
-        return data
-    
     def write_register(self, register: int, value: int) -> bool:
         """
         Write a single holding register.
@@ -795,381 +1126,66 @@ class GrowattModbus:
         try:
             logger.debug(f"[WRITE] Request to write register {register} with value {value}")
 
-            if not self.client:
-                logger.error("[WRITE] Cannot write register - client not initialized")
+            if not self._prepare_write():
                 return False
 
-            # ---- Connection / socket check and reconnection ----------------------
-            # Check if socket is open, attempt reconnect if not
-            socket_is_open = False
-
-            if hasattr(self.client, 'is_socket_open'):
-                try:
-                    socket_is_open = self.client.is_socket_open()
-                    logger.debug(f"[WRITE] is_socket_open() returned: {socket_is_open}")
-
-                    if not socket_is_open:
-                        logger.warning("[WRITE] Socket not open, attempting reconnect...")
-                        if not self.connect():
-                            logger.error("[WRITE] Reconnect failed - not connected")
-                            return False
-                        logger.info("[WRITE] Reconnect successful, proceeding with write")
-                        socket_is_open = True
-
-                except Exception as e:
-                    logger.warning(f"[WRITE] is_socket_open() threw exception: {e}")
-                    logger.warning("[WRITE] Attempting reconnect due to error...")
-                    if not self.connect():
-                        logger.error("[WRITE] Reconnect failed after exception")
-                        return False
-                    logger.info("[WRITE] Reconnect successful after exception")
-                    socket_is_open = True
-            else:
-                # Client doesn't support is_socket_open(), try to reconnect to be safe
-                logger.debug("[WRITE] Client has no is_socket_open(), attempting reconnect...")
-                if not self.connect():
-                    logger.error("[WRITE] Reconnect failed - cannot determine socket state")
-                    return False
-                logger.info("[WRITE] Reconnect successful (no is_socket_open available)")
-                socket_is_open = True
-            # -----------------------------------------------------------------------
-
             # ---- Perform actual write ---------------------------------------------
             logger.debug(f"[WRITE] Sending write_register({register}, {value}) to inverter")
 
             # Try different keyword arguments for pymodbus version compatibility
-            result = None
-            try:
-                # Preferred for ModbusTcpClient / recent pymodbus
-                result = self.client.write_register(address=register, value=value, unit=self.slave_id)
-            except TypeError:
-                try:
-                    # Some versions use 'slave'
-                    result = self.client.write_register(address=register, value=value, slave=self.slave_id)
-                except TypeError:
-                    try:
-                        # Older/newer variants may accept 'device_id'
-                        result = self.client.write_register(address=register, value=value, device_id=self.slave_id)
-                    except TypeError:
-                        # Fallback: positional args only
-                        result = self.client.write_register(register, value)
-
-            # Handle different pymodbus error APIs
-            if result is None:
-                logger.error('[WRITE] No response from write_register call')
-                return False
-
-            if hasattr(result, 'isError') and callable(getattr(result, 'isError')) and result.isError():
-                logger.error(f"[WRITE] Inverter responded with error: {result}")
-                return False
-
-            logger.info(f"[WRITE] Successfully wrote value {value} → register {register}")
-            return True
+            with self.bus_lock:
+                result = self._call_with_slave(self.client.write_register, address=register, value=value)
+            return self._write_succeeded(result, register, value)
             # -----------------------------------------------------------------------
 
         except Exception as e:
             logger.error(f"[WRITE] Exception writing register {register}: {e}")
+            self._mark_activity(False)
             return False
 
-
-    def _find_register_by_name(self, name: str) -> Optional[int]:
-        """Find register address by its name or alias"""
-        input_regs = self.register_map['input_registers']
-        for addr, reg_info in input_regs.items():
-            # Check exact name match
-            if reg_info['name'] == name:
-                return addr
-            # Check alias match (for 3-phase compatibility)
-            if reg_info.get('alias') == name:
-                return addr
-        return None
-    
-    def _read_energy_breakdown(self, data: GrowattData) -> None:
-        """Read detailed energy breakdown (storage/hybrid models)"""
-        try:
-            # Energy to user
-            addr = self._find_register_by_name('energy_to_user_today_low')
-            if addr:
-                data.energy_to_user_today = self._get_register_value(addr) or 0.0
-            
-            addr = self._find_register_by_name('energy_to_user_total_low')
-            if addr:
-                data.energy_to_user_total = self._get_register_value(addr) or 0.0
-            
-            # Energy to grid
-            addr = self._find_register_by_name('energy_to_grid_today_low')
-            if addr:
-                data.energy_to_grid_today = self._get_register_value(addr) or 0.0
-            
-            addr = self._find_register_by_name('energy_to_grid_total_low')
-            if addr:
-                data.energy_to_grid_total = self._get_register_value(addr) or 0.0
-            
-            # Load energy
-            addr = self._find_register_by_name('load_energy_today_low')
-            if addr:
-                data.load_energy_today = self._get_register_value(addr) or 0.0
-                logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Load energy today from reg {addr}: {data.load_energy_today} kWh (cache: {self._register_cache.get(addr)})")
-            else:
-                logger.warning(f"[{self.register_map['name']}@{self.connection_id}] load_energy_today_low register not found")
-
-            addr = self._find_register_by_name('load_energy_total_low')
-            if addr:
-                data.load_energy_total = self._get_register_value(addr) or 0.0
-                logger.debug(f"[{self.register_map['name']}@{self.connection_id}] Load energy total from reg {addr}: {data.load_energy_total} kWh (cache: {self._register_cache.get(addr)})")
-                
-        except Exception as e:
-            logger.debug(f"Energy breakdown not available: {e}")
-    
-    def _read_battery_data(self, data: GrowattData) -> None:
-        """Read battery data (storage/hybrid models)"""
+    def write_registers(self, register: int, values: List[int]) -> bool:
+        """Write consecutive holding registers in one request (function 16)"""
         try:
-            # Battery voltage
-            addr = self._find_register_by_name('battery_voltage')
-            if addr:
-                data.battery_voltage = self._get_register_value(addr) or 0.0
-                logger.debug(f"Battery voltage from reg {addr}: {data.battery_voltage}V")
-
-            # Battery current (signed: positive=discharge, negative=charge)
-            # Try VPP protocol first (31216 - low register of 32-bit pair)
-            addr = self._find_register_by_name('battery_current_low')
-            if not addr:
-                # Fallback to single-register name (used by legacy/WIT maps)
-                addr = self._find_register_by_name('battery_current')
-            if not addr:
-                # Fallback to legacy register (3170)
-                addr = self._find_register_by_name('battery_current_legacy')
-            if addr:
-                data.battery_current = self._get_register_value(addr) or 0.0
-                logger.debug(f"Battery current from reg {addr}: {data.battery_current}A")
-
-            # Battery SOC
-            addr = self._find_register_by_name('battery_soc')
-            if addr:
-                data.battery_soc = self._get_register_value(addr) or 0.0
-                logger.debug(f"Battery SOC from reg {addr}: {data.battery_soc}%")
-
-            # Battery temperature
-            addr = self._find_register_by_name('battery_temp')
-            if addr:
-                data.battery_temp = self._get_register_value(addr) or 0.0
-                logger.debug(f"Battery temp from reg {addr}: {data.battery_temp}°C")
-
-            # Battery power (signed: positive=charging, negative=discharging)
-            # Try new signed battery_power register first (MOD series @ 31126)
-            addr = self._find_register_by_name('battery_power_low')
-            if addr:
-                raw_low = self._register_cache.get(addr, 0)
-                pair_addr = self._find_register_by_name('battery_power_high')
-                raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                battery_power = self._get_register_value(addr) or 0.0
-                logger.debug(f"Battery power (signed): HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {battery_power}W")
-
-                # Split into charge/discharge based on sign
-                if battery_power > 0:
-                    data.charge_power = battery_power
-                    data.discharge_power = 0.0
-                    logger.debug(f"  → Charging: {data.charge_power}W")
-                elif battery_power < 0:
-                    data.charge_power = 0.0
-                    data.discharge_power = abs(battery_power)
-                    logger.debug(f"  → Discharging: {data.discharge_power}W")
-                else:
-                    data.charge_power = 0.0
-                    data.discharge_power = 0.0
-            else:
-                # Fallback: Try old separate charge/discharge registers (SPH series)
-                addr = self._find_register_by_name('charge_power_low')
-                if addr:
-                    raw_low = self._register_cache.get(addr, 0)
-                    pair_addr = self._find_register_by_name('charge_power_high')
-                    raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                    data.charge_power = self._get_register_value(addr) or 0.0
-                    logger.debug(f"Charge power: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.charge_power}W")
-                elif data.battery_voltage > 0 and data.battery_current < 0:
-                    # Fallback: Calculate from V×I when charging (negative current)
-                    data.charge_power = data.battery_voltage * abs(data.battery_current)
-                    logger.debug(f"Charge power (calculated): {data.battery_voltage}V × {abs(data.battery_current)}A = {data.charge_power}W")
-
-                addr = self._find_register_by_name('discharge_power_low')
-                if addr:
-                    raw_low = self._register_cache.get(addr, 0)
-                    pair_addr = self._find_register_by_name('discharge_power_high')
-                    raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                    data.discharge_power = self._get_register_value(addr) or 0.0
-                    logger.debug(f"Discharge power: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.discharge_power}W")
-                elif data.battery_voltage > 0 and data.battery_current > 0:
-                    # Fallback: Calculate from V×I when discharging (positive current)
-                    data.discharge_power = data.battery_voltage * data.battery_current
-                    logger.debug(f"Discharge power (calculated): {data.battery_voltage}V × {data.battery_current}A = {data.discharge_power}W")
-            
-            # Charge energy today
-            addr = self._find_register_by_name('charge_energy_today_low')
-            if addr:
-                raw_low = self._register_cache.get(addr, 0)
-                pair_addr = self._find_register_by_name('charge_energy_today_high')
-                raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                data.charge_energy_today = self._get_register_value(addr) or 0.0
-                logger.debug(f"Charge energy today: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.charge_energy_today} kWh")
-            
-            # Discharge energy today
-            addr = self._find_register_by_name('discharge_energy_today_low')
-            if addr:
-                raw_low = self._register_cache.get(addr, 0)
-                pair_addr = self._find_register_by_name('discharge_energy_today_high')
-                raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                data.discharge_energy_today = self._get_register_value(addr) or 0.0
-                logger.debug(f"Discharge energy today: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.discharge_energy_today} kWh")
-            
-            # Charge energy total
-            addr = self._find_register_by_name('charge_energy_total_low')
-            if addr:
-                raw_low = self._register_cache.get(addr, 0)
-                pair_addr = self._find_register_by_name('charge_energy_total_high')
-                raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                data.charge_energy_total = self._get_register_value(addr) or 0.0
-                logger.debug(f"Charge energy total: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.charge_energy_total} kWh")
-            
-            # Discharge energy total
-            addr = self._find_register_by_name('discharge_energy_total_low')
-            if addr:
-                raw_low = self._register_cache.get(addr, 0)
-                pair_addr = self._find_register_by_name('discharge_energy_total_high')
-                raw_high = self._register_cache.get(pair_addr, 0) if pair_addr else 0
-                data.discharge_energy_total = self._get_register_value(addr) or 0.0
-                logger.debug(f"Discharge energy total: HIGH={raw_high} (reg {pair_addr}), LOW={raw_low} (reg {addr}) → {data.discharge_energy_total} kWh")
+            logger.debug(f"[WRITE] Request to write registers {register}-{register + len(values) - 1} with values {values}")
+            self.last_exception_code = None
 
-            if data.battery_voltage > 0:
-                logger.debug(f"Battery summary: {data.battery_voltage}V, {data.battery_current}A, {data.battery_soc}%, {data.battery_temp}°C, Charge={data.charge_power}W, Discharge={data.discharge_power}W")
-            
-        except Exception as e:
-            logger.debug(f"Battery data not available: {e}")
-
-    def _read_device_info(self, data: GrowattData) -> None:
-        """Read device info from holding registers"""
-
-        # Get holding register map once so we can use it even if 0–19 read fails
-        holding_map = self.register_map.get("holding_registers", {})
-
-        # --- Device info (0–19) ---
-        holding_regs = self.read_holding_registers(0, 20)
-        if holding_regs is None:
-            logger.debug("Could not read holding registers 0–19 for device info")
-        else:
-            try:
-                # Firmware version at register 3
-                if len(holding_regs) > 3 and 3 in holding_map:
-                    fw_version = holding_regs[3]
-                    data.firmware_version = f"{fw_version >> 8}.{fw_version & 0xFF}"
-
-                # Serial number from registers 9-13
-                if len(holding_regs) > 13:
-                    serial_parts = []
-                    for i in range(9, 14):
-                        if i < len(holding_regs):
-                            reg_val = holding_regs[i]
-                            # Convert 16-bit register to 2 ASCII characters
-                            if reg_val > 0:
-                                char1 = (reg_val >> 8) & 0xFF
-                                char2 = reg_val & 0xFF
-                                if char1 > 0 and 32 <= char1 <= 126:
-                                    serial_parts.append(chr(char1))
-                                if char2 > 0 and 32 <= char2 <= 126:
-                                    serial_parts.append(chr(char2))
-                    data.serial_number = ''.join(serial_parts).rstrip('\x00')
-            except Exception as e:
-                logger.warning(f"Error reading device info: {e}")
-
-        # --- Export control (122–123) --- ALWAYS ATTEMPTED
-        if 122 in holding_map or 123 in holding_map:
-            try:
-                export_regs = self.read_holding_registers(122, 2)
-                logger.debug("[EXPORT CTRL] Raw export_regs from 122–123: %r", export_regs)
-
-                if export_regs is not None and len(export_regs) >= 2:
-                    if 122 in holding_map:
-                        data.export_limit_mode = int(export_regs[0])
-                    if 123 in holding_map:
-                        data.export_limit_power = int(export_regs[1])
-
-                    logger.debug("[EXPORT CTRL] Read export control: mode=%s, power=%s",
-                               data.export_limit_mode, data.export_limit_power)
-            except Exception as e:
-                logger.debug(f"Could not read export control registers: {e}")
-
-        # --- Active Power Rate (3) --- Read if present in profile
-        if 3 in holding_map:
-            try:
-                power_rate_regs = self.read_holding_registers(3, 1)
-                logger.debug("[POWER CTRL] Raw active_power_rate from reg 3: %r", power_rate_regs)
-
-                if power_rate_regs is not None and len(power_rate_regs) >= 1:
-                    data.active_power_rate = int(power_rate_regs[0])
-                    logger.debug("[POWER CTRL] Read active_power_rate: %s%%", data.active_power_rate)
-            except Exception as e:
-                logger.debug(f"Could not read active_power_rate register: {e}")
-
-        # --- SPF Off-Grid Controls --- Read if present in profile
-        # Read registers 1, 2, 8 (output config, charge config, AC input mode)
-        if any(reg in holding_map for reg in [1, 2, 8]):
-            try:
-                spf_ctrl_regs = self.read_holding_registers(1, 8)
-                logger.debug("[SPF CTRL] Raw SPF control regs 1-8: %r", spf_ctrl_regs)
-
-                if spf_ctrl_regs is not None and len(spf_ctrl_regs) >= 8:
-                    if 1 in holding_map:
-                        data.output_config = int(spf_ctrl_regs[0])
-                    if 2 in holding_map:
-                        data.charge_config = int(spf_ctrl_regs[1])
-                    if 8 in holding_map:
-                        data.ac_input_mode = int(spf_ctrl_regs[7])
-                    logger.debug("[SPF CTRL] output_config=%s, charge_config=%s, ac_input_mode=%s",
-                               data.output_config, data.charge_config, data.ac_input_mode)
-            except Exception as e:
-                logger.debug(f"Could not read SPF control registers 1-8: {e}")
-
-        # Read battery configuration registers (37-39)
-        if any(reg in holding_map for reg in [37, 38, 39]):
-            try:
-                battery_ctrl_regs = self.read_holding_registers(37, 3)
-                logger.debug("[SPF CTRL] Raw battery ctrl regs 37-39: %r", battery_ctrl_regs)
-
-                if battery_ctrl_regs is not None and len(battery_ctrl_regs) >= 3:
-                    if 37 in holding_map:
-                        data.bat_low_to_uti = int(battery_ctrl_regs[0])
-                    if 38 in holding_map:
-                        data.ac_charge_current = int(battery_ctrl_regs[1])
-                    if 39 in holding_map:
-                        data.battery_type = int(battery_ctrl_regs[2])
-                    logger.debug("[SPF CTRL] bat_low_to_uti=%s, ac_charge_current=%s, battery_type=%s",
-                               data.bat_low_to_uti, data.ac_charge_current, data.battery_type)
-            except Exception as e:
-                logger.debug(f"Could not read battery control registers 37-39: {e}")
-
-        # Read generator charge current (83) and AC to battery voltage (95)
-        if 83 in holding_map:
-            try:
-                gen_charge_regs = self.read_holding_registers(83, 1)
-                logger.debug("[SPF CTRL] Raw gen_charge_current from reg 83: %r", gen_charge_regs)
+            if not self._prepare_write():
+                return False
 
-                if gen_charge_regs is not None and len(gen_charge_regs) >= 1:
-                    data.gen_charge_current = int(gen_charge_regs[0])
-                    logger.debug("[SPF CTRL] gen_charge_current=%s A", data.gen_charge_current)
-            except Exception as e:
-                logger.debug(f"Could not read gen_charge_current register: {e}")
+            with self.bus_lock:
+                result = self._call_with_slave(self.client.write_registers, address=register, values=values)
+            return self._write_succeeded(result, register, values)
 
-        if 95 in holding_map:
-            try:
-                ac_to_bat_regs = self.read_holding_registers(95, 1)
-                logger.debug("[SPF CTRL] Raw ac_to_bat_volt from reg 95: %r", ac_to_bat_regs)
+        except Exception as e:
+            logger.error(f"[WRITE] Exception writing registers {register}-{register + len(values) - 1}: {e}")
+            self._mark_activity(False)
+            return False
 
-                if ac_to_bat_regs is not None and len(ac_to_bat_regs) >= 1:
-                    data.ac_to_bat_volt = int(ac_to_bat_regs[0])
-                    logger.debug("[SPF CTRL] ac_to_bat_volt=%s", data.ac_to_bat_volt)
-            except Exception as e:
-                logger.debug(f"Could not read ac_to_bat_volt register: {e}")
+    def write_batch(self, writes: Dict[int, int]) -> Dict[int, bool]:
+        """
+        Write several holding registers, merging adjacent ones where the
+        profile allows (falling back to single writes if the device refuses),
+        then read back only the written registers.
 
-    def get_status_text(self, status_code: int) -> str:
-        """Convert status code to human readable text"""
-        status_info = STATUS_CODES.get(status_code, {'name': f'Unknown ({status_code})', 'desc': 'Unknown status code'})
-        return status_info['name']
+        Returns:
+            Write result per register
+        """
+        results: Dict[int, bool] = {}
+        written: Dict[int, int] = {}
+        for start, values in self._write_runs(writes):
+            if len(values) == 1:
+                outcomes = [self.write_register(start, values[0])]
+            else:
+                success = self.write_registers(start, values)
+                if not success and self._write_multiple_refused(start, values):
+                    outcomes = [self.write_register(start + offset, value) for offset, value in enumerate(values)]
+                else:
+                    outcomes = [success] * len(values)
+            for offset, (value, success) in enumerate(zip(values, outcomes)):
+                results[start + offset] = success
+                if success:
+                    written[start + offset] = value
+        # Read back only the written registers, adjacent ones in one request
+        for start, values in plan_write_runs(written):
+            self._store_read_back(start, values, self.read_holding_registers(start, len(values)))
+        return results
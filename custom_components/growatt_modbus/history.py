@@ -0,0 +1,130 @@
+"""
+In-memory time series of recent polls.
+
+The coordinator only keeps the latest GrowattData, so short-window
+statistics (averages, min/max, ramp rates) would otherwise need HA's
+recorder database. SampleHistory keeps the last `capacity` polls in a
+columnar ring buffer instead: one fixed-size float64 array per field and an
+int64 array of timestamps (milliseconds since the epoch). Memory is
+allocated once, appending is O(fields) and a windowed query walks back from
+the newest sample, so it costs O(samples in the window).
+
+Fields that were not read fresh by a poll (stale, see PollReport) are stored
+as NaN and left out of the aggregates.
+"""
+
+import math
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+DEFAULT_HISTORY_SIZE = 360   # samples, an hour at the default 10 s interval
+
+# Fields recorded by default - fast-changing measurements
+DEFAULT_HISTORY_FIELDS = (
+    'pv1_power', 'pv2_power', 'pv3_power', 'pv_total_power',
+    'pv1_voltage', 'pv2_voltage',
+    'ac_power', 'ac_voltage', 'ac_frequency',
+    'power_to_grid', 'power_to_user', 'power_to_load',
+    'battery_voltage', 'battery_current', 'battery_soc',
+    'charge_power', 'discharge_power',
+    'inverter_temp', 'battery_temp',
+)
+
+_NAN = float('nan')
+
+
+class WindowStats(NamedTuple):
+    """Aggregates of one field over a time window"""
+    count: int
+    mean: float
+    minimum: float
+    maximum: float
+    first: float
+    last: float
+    ramp_rate: Optional[float]   # (last - first) per second, None with fewer than two samples
+
+
+class SampleHistory:
+    """Fixed-size columnar ring buffer of numeric GrowattData fields"""
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_HISTORY_FIELDS,
+                 capacity: int = DEFAULT_HISTORY_SIZE):
+        self.fields = tuple(fields)
+        self.capacity = capacity
+        self._timestamps = array('q', bytes(8 * capacity))
+        self._columns: Dict[str, array] = {
+            field: array('d', [_NAN]) * capacity for field in self.fields
+        }
+        self._next = 0      # Slot the next sample goes to
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, data, timestamp: Optional[float] = None, stale: Iterable[str] = ()) -> None:
+        """Record the fields of a GrowattData (timestamp in seconds, default now)"""
+        if timestamp is None:
+            timestamp = time.time()
+        slot = self._next
+        self._timestamps[slot] = int(timestamp * 1000)
+        stale = set(stale)
+        for field, column in self._columns.items():
+            value = getattr(data, field, None)
+            column[slot] = _NAN if value is None or field in stale else value
+        self._next = (slot + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def _window_slots(self, seconds: float, now: Optional[float]) -> List[int]:
+        """Slots of the samples in the window, newest first"""
+        if now is None:
+            now = time.time()
+        cutoff = int((now - seconds) * 1000)
+        slots = []
+        slot = self._next
+        for _ in range(self._count):
+            slot = (slot - 1) % self.capacity
+            if self._timestamps[slot] < cutoff:
+                break
+            slots.append(slot)
+        return slots
+
+    def window(self, field: str, seconds: float, now: Optional[float] = None) -> List[Tuple[float, float]]:
+        """(timestamp, value) pairs of a field over the last `seconds`, oldest first"""
+        column = self._columns[field]
+        samples = [
+            (self._timestamps[slot] / 1000, column[slot])
+            for slot in self._window_slots(seconds, now)
+            if not math.isnan(column[slot])
+        ]
+        samples.reverse()
+        return samples
+
+    def stats(self, field: str, seconds: float, now: Optional[float] = None) -> Optional[WindowStats]:
+        """Aggregates of a field over the last `seconds` (None without samples)"""
+        if field not in self._columns:
+            return None
+        samples = self.window(field, seconds, now)
+        if not samples:
+            return None
+        values = [value for _timestamp, value in samples]
+        (first_time, first), (last_time, last) = samples[0], samples[-1]
+        elapsed = last_time - first_time
+        return WindowStats(
+            count=len(values),
+            mean=sum(values) / len(values),
+            minimum=min(values),
+            maximum=max(values),
+            first=first,
+            last=last,
+            ramp_rate=(last - first) / elapsed if elapsed > 0 else None,
+        )
+
+    def summary(self, seconds: float, now: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Aggregates of every recorded field, for diagnostics"""
+        result = {}
+        for field in self.fields:
+            stats = self.stats(field, seconds, now)
+            if stats is not None:
+                result[field] = stats._asdict()
+        return result
@@ -0,0 +1,179 @@
+"""
+Lightweight poll instrumentation.
+
+Every client keeps its most recent transactions and polls in fixed-size ring
+buffers, so recording costs an append and memory stays bounded no matter how
+long the integration runs. Percentiles and rates are computed on demand from
+the buffers (see ClientMetrics.summary), which the coordinator exposes as
+diagnostic sensors.
+
+Per transaction: time waiting for the bus (other inverters on the same
+gateway), pacing sleep, wire time (request to response) and bytes on the
+wire. Per poll: total duration and decode time. Per block: counts of
+successes, exception codes and timeouts.
+"""
+
+import math
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from .pacing import OUTCOME_OK
+
+TRANSACTION_HISTORY = 512
+POLL_HISTORY = 128
+
+# RTU framing of a read: request is address + function + start + count + CRC,
+# response is address + function + byte count + data + CRC, an exception
+# response is address + function + code + CRC
+REQUEST_BYTES = 8
+RESPONSE_OVERHEAD_BYTES = 5
+EXCEPTION_RESPONSE_BYTES = 5
+
+
+class TransactionSample(NamedTuple):
+    """One read request"""
+    finished: float          # time.monotonic()
+    register_type: str
+    start: int
+    count: int
+    outcome: str             # pacing.OUTCOME_*
+    exception_code: Optional[int]
+    queue_wait: float        # Waiting for the bus lock
+    pacing: float            # Sleeping for the read interval
+    wire_time: float         # Request sent until response (or failure)
+    wire_bytes: int
+
+
+class PollSample(NamedTuple):
+    """One read_all_data() call"""
+    finished: float
+    duration: float
+    decode_time: float
+    transactions: int
+    failures: int
+    success: bool
+
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile (None without samples)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def _result_label(outcome: str, exception_code: Optional[int]) -> str:
+    if outcome == OUTCOME_OK:
+        return 'ok'
+    if exception_code is not None:
+        return f'code {exception_code}'
+    return 'timeout'
+
+
+class ClientMetrics:
+    """Ring buffers of recent transactions and polls for one client"""
+
+    def __init__(self, transaction_history: int = TRANSACTION_HISTORY,
+                 poll_history: int = POLL_HISTORY):
+        self.transactions: Deque[TransactionSample] = deque(maxlen=transaction_history)
+        self.polls: Deque[PollSample] = deque(maxlen=poll_history)
+        self.block_results: Dict[Tuple[str, int, int], Counter] = {}
+        self.wire_bytes = 0
+        self.retries = 0
+        self.overruns = 0
+        self._poll_started: Optional[float] = None
+        self._poll_transactions = 0
+        self._poll_failures = 0
+        self._poll_decode = 0.0
+
+    def record_transaction(self, register_type: str, start: int, count: int, outcome: str,
+                           exception_code: Optional[int] = None, queue_wait: float = 0.0,
+                           pacing: float = 0.0, wire_time: float = 0.0) -> None:
+        if outcome == OUTCOME_OK:
+            wire_bytes = REQUEST_BYTES + RESPONSE_OVERHEAD_BYTES + 2 * count
+        elif exception_code is not None:
+            wire_bytes = REQUEST_BYTES + EXCEPTION_RESPONSE_BYTES
+        else:
+            wire_bytes = REQUEST_BYTES
+        self.transactions.append(TransactionSample(
+            time.monotonic(), register_type, start, count, outcome, exception_code,
+            queue_wait, pacing, wire_time, wire_bytes,
+        ))
+        self.wire_bytes += wire_bytes
+
+        key = (register_type, start, count)
+        results = self.block_results.get(key)
+        if results is None:
+            results = self.block_results[key] = Counter()
+        results[_result_label(outcome, exception_code)] += 1
+
+        self._poll_transactions += 1
+        if outcome != OUTCOME_OK:
+            self._poll_failures += 1
+
+    def record_retry(self) -> None:
+        """A failed block read or connection attempt is retried (counted per retry, not per poll)"""
+        self.retries += 1
+
+    def record_overrun(self) -> None:
+        """A poll ran into its deadline"""
+        self.overruns += 1
+
+    def begin_poll(self) -> None:
+        self._poll_started = time.monotonic()
+        self._poll_transactions = 0
+        self._poll_failures = 0
+        self._poll_decode = 0.0
+
+    def record_decode(self, seconds: float) -> None:
+        self._poll_decode += seconds
+
+    def end_poll(self, success: bool) -> None:
+        if self._poll_started is None:
+            return
+        now = time.monotonic()
+        self.polls.append(PollSample(
+            now, now - self._poll_started, self._poll_decode,
+            self._poll_transactions, self._poll_failures, success,
+        ))
+        self._poll_started = None
+
+    def bus_utilization(self) -> Optional[float]:
+        """Fraction of the recorded time window spent on the wire"""
+        if not self.transactions:
+            return None
+        first = self.transactions[0]
+        window = self.transactions[-1].finished - (first.finished - first.wire_time)
+        if window <= 0:
+            return None
+        return min(1.0, sum(sample.wire_time for sample in self.transactions) / window)
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates over the ring buffers (times in seconds, rates as fractions)"""
+        durations = [poll.duration for poll in self.polls]
+        transactions = list(self.transactions)
+        wire_times = [sample.wire_time for sample in transactions]
+        failures = sum(1 for sample in transactions if sample.outcome != OUTCOME_OK)
+        return {
+            "poll_duration_p50": percentile(durations, 0.50),
+            "poll_duration_p95": percentile(durations, 0.95),
+            "decode_time_p50": percentile([poll.decode_time for poll in self.polls], 0.50),
+            "wire_time_p50": percentile(wire_times, 0.50),
+            "wire_time_p95": percentile(wire_times, 0.95),
+            "queue_wait_p95": percentile([sample.queue_wait for sample in transactions], 0.95),
+            "pacing_p50": percentile([sample.pacing for sample in transactions], 0.50),
+            "error_rate": failures / len(transactions) if transactions else None,
+            "bus_utilization": self.bus_utilization(),
+            "retries": self.retries,
+            "overruns": self.overruns,
+            "wire_bytes": self.wire_bytes,
+        }
+
+    def block_summary(self) -> Dict[str, Dict[str, int]]:
+        """Success / exception code / timeout counts per read block"""
+        return {
+            f"{register_type} {start}-{start + count - 1}": dict(results)
+            for (register_type, start, count), results in sorted(self.block_results.items())
+        }
@@ -181,16 +181,14 @@ class GrowattGenericNumber(CoordinatorEntity, NumberEntity):
 
         # Write to Modbus register
         register = self._control_config['register']
-        success = await self.hass.async_add_executor_job(
-            self.coordinator.modbus_client.write_register,
+        success = await self.coordinator.async_write_register(
             register,
             raw_value
         )
 
         if success:
             _LOGGER.info("Set %s to %.1f (raw=%d)", self._control_name, value, raw_value)
-            # Request immediate refresh to show new value
-            await self.coordinator.async_request_refresh()
+            # The write was read back and pushed to all entities - no full refresh needed
         else:
             _LOGGER.error("Failed to write %s", self._control_name)
 
@@ -254,16 +252,14 @@ class GrowattExportLimitPowerNumber(CoordinatorEntity, NumberEntity):
         
         # Write to Modbus register
         register = WRITABLE_REGISTERS['export_limit_power']['register']
-        success = await self.hass.async_add_executor_job(
-            self.coordinator.modbus_client.write_register,
+        success = await self.coordinator.async_write_register(
             register,
             raw_value
         )
         
         if success:
             _LOGGER.info("Set export_limit_power to %.1f%% (raw=%d)", value, raw_value)
-            # Request immediate refresh to show new value
-            await self.coordinator.async_request_refresh()
+            # The write was read back and pushed to all entities - no full refresh needed
         else:
             _LOGGER.error("Failed to write export_limit_power")
 
@@ -324,15 +320,13 @@ class GrowattActivePowerRateNumber(CoordinatorEntity, NumberEntity):
 
         # Write to Modbus register
         register = WRITABLE_REGISTERS['active_power_rate']['register']
-        success = await self.hass.async_add_executor_job(
-            self.coordinator.modbus_client.write_register,
+        success = await self.coordinator.async_write_register(
             register,
             raw_value
         )
 
         if success:
             _LOGGER.info("Set active_power_rate to %d%%", raw_value)
-            # Request immediate refresh to show new value
-            await self.coordinator.async_request_refresh()
+            # The write was read back and pushed to all entities - no full refresh needed
         else:
             _LOGGER.error("Failed to write active_power_rate")
@@ -0,0 +1,121 @@
+"""
+Adaptive inter-request pacing.
+
+Growatt inverters and the RS485 gateways in front of them need some quiet
+time between requests, but how much differs per device and link. Instead of
+sleeping a fixed second before every read, the pacer adapts the gap between
+a response and the next request:
+
+- a timeout or a "slave device busy" exception (code 6) backs off sharply,
+- response latency growing well above the device's baseline backs off gently
+  (latency is measured relative to the expected wire time of the request, so
+  large and small reads compare fairly),
+- a run of clean responses shortens the gap towards the configured floor.
+
+The pacer belongs to the link (see connection_pool.py): inverters sharing a
+gateway or serial port share the quiet gap and the learned interval. The
+learned interval is persisted per device (see storage.py), so a restart
+starts from it instead of re-learning.
+"""
+
+from typing import Optional
+
+# Transaction outcomes reported to the pacer
+OUTCOME_OK = 'ok'
+OUTCOME_TIMEOUT = 'timeout'  # No response or transport failure
+OUTCOME_BUSY = 'busy'        # Exception code 6 - slave device busy
+OUTCOME_ERROR = 'error'      # Any other exception response (says nothing about pacing)
+
+MODBUS_EXCEPTION_ILLEGAL_FUNCTION = 1
+MODBUS_EXCEPTION_ILLEGAL_ADDRESS = 2
+MODBUS_EXCEPTION_BUSY = 6
+
+START_INTERVAL = 1.0          # Previous fixed interval, used until something is learned
+MAX_INTERVAL = 5.0
+BACKOFF_FACTOR = 2.0          # After a timeout or busy response
+LATENCY_BACKOFF_FACTOR = 1.25 # After latency growth
+SPEEDUP_FACTOR = 0.85         # After SUCCESSES_PER_STEP clean responses
+SUCCESSES_PER_STEP = 3
+MIN_BACKOFF_INTERVAL = 0.1    # Backing off from a zero floor still needs a step
+
+LATENCY_ALPHA = 0.2           # EWMA smoothing of the latency ratio
+LATENCY_BASELINE_DRIFT = 0.02 # Baseline follows a permanently slower link, slowly
+LATENCY_GROWTH = 1.5          # EWMA this far above the baseline counts as congestion
+LATENCY_SLACK = 0.25          # Ignore jitter on links much faster than the cost model
+LATENCY_COOLDOWN = 10         # Samples to wait after a latency back-off before another
+
+
+class AdaptivePacer:
+    """Learns the shortest safe gap between Modbus requests on one link"""
+
+    def __init__(self, floor: float, interval: Optional[float] = None,
+                 ceiling: float = MAX_INTERVAL):
+        self.floor = max(0.0, floor)
+        self.ceiling = max(ceiling, self.floor)
+        if interval is None:
+            interval = max(START_INTERVAL, self.floor)
+        self.interval = self._clamp(interval)
+        self.backoffs = 0
+        self._successes = 0
+        self._latency_ewma: Optional[float] = None
+        self._latency_baseline: Optional[float] = None
+        self._latency_cooldown = 0
+
+    def _clamp(self, interval: float) -> float:
+        return min(max(interval, self.floor), self.ceiling)
+
+    def delay(self, since_last: float) -> float:
+        """Seconds to wait before the next request, given the time since the last response"""
+        return max(0.0, self.interval - since_last)
+
+    def restore(self, interval: float) -> None:
+        """Start from a previously learned interval"""
+        self.interval = self._clamp(interval)
+        self._successes = 0
+
+    def reset(self, floor: float) -> None:
+        """Explicitly configured interval - forget what was learned"""
+        self.floor = max(0.0, floor)
+        self.ceiling = max(self.ceiling, self.floor)
+        self.interval = self.floor
+        self._successes = 0
+
+    def record(self, outcome: str, latency: Optional[float] = None) -> None:
+        """
+        Feed back the result of one transaction.
+
+        latency is the response time divided by the expected wire time of the
+        request (1.0 = as fast as the link model predicts).
+        """
+        if outcome in (OUTCOME_TIMEOUT, OUTCOME_BUSY):
+            self._backoff(BACKOFF_FACTOR)
+            return
+        if outcome != OUTCOME_OK or latency is None:
+            return
+
+        if self._latency_ewma is None:
+            self._latency_ewma = latency
+        else:
+            self._latency_ewma += LATENCY_ALPHA * (latency - self._latency_ewma)
+
+        if self._latency_baseline is None or self._latency_ewma < self._latency_baseline:
+            self._latency_baseline = self._latency_ewma
+        else:
+            self._latency_baseline += LATENCY_BASELINE_DRIFT * (self._latency_ewma - self._latency_baseline)
+
+        if self._latency_cooldown:
+            self._latency_cooldown -= 1
+        elif self._latency_ewma > self._latency_baseline * LATENCY_GROWTH + LATENCY_SLACK:
+            self._backoff(LATENCY_BACKOFF_FACTOR)
+            self._latency_cooldown = LATENCY_COOLDOWN
+            return
+
+        self._successes += 1
+        if self._successes >= SUCCESSES_PER_STEP:
+            self._successes = 0
+            self.interval = self._clamp(self.interval * SPEEDUP_FACTOR)
+
+    def _backoff(self, factor: float) -> None:
+        self._successes = 0
+        self.backoffs += 1
+        self.interval = self._clamp(max(self.interval, MIN_BACKOFF_INTERVAL) * factor)
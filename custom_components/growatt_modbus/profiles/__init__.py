@@ -11,6 +11,18 @@ Profile Structure:
 - sph.py: SPH series (storage/battery)
 - spf.py: SPF series (off-grid with battery)
 - wit.py: WIT series (4-15kW three-phase hybrid with advanced storage)
+
+Poll tiers:
+Registers are polled in tiers - 'fast' (every update), 'energy' (energy
+counters) and 'config' (holding registers). The tier is derived from the
+register name and type; a register can set 'tier' explicitly, and a profile
+can change the tier intervals with 'poll_intervals', e.g.
+{'energy': 30, 'config': 600} (seconds).
+
+Writes:
+Holding registers are written one at a time (function 6). Adjacent writes
+are only merged into one function 16 request if the profile sets
+'supports_write_multiple': True.
 """
 
 from typing import Dict, List, Optional
@@ -0,0 +1,85 @@
+"""
+Field-level change tracking between polls.
+
+Every coordinator update used to make each sensor recompute its value and
+write its state, even when nothing had changed. ChangeTracker compares a new
+GrowattData against the values last published and reports which fields
+changed, so entities whose input fields did not change can skip the state
+write (see GrowattModbusSensor._handle_coordinator_update).
+
+Values are compared against the last *published* value of a field, not the
+previous poll, so slow drift below the deadband still gets published once it
+adds up. The deadband is relative (percent of the published value) and only
+applies to float measurements - integer fields (status, codes, settings),
+strings and energy counters are published on any change.
+"""
+
+from typing import Any, Dict, FrozenSet, Optional
+
+from .data import FIELDS
+
+# Data fields each calculated sensor is derived from, so it only updates when
+# one of them changed (calculated sensors missing here update on every poll)
+_GRID_FLOW_INPUTS = frozenset({
+    "power_to_grid", "pv_total_power", "power_to_load", "charge_power", "discharge_power",
+})
+_SELF_CONSUMPTION_INPUTS = frozenset({"pv_total_power", "power_to_grid", "power_to_load"})
+CALCULATED_SENSOR_INPUTS = {
+    "grid_power": _GRID_FLOW_INPUTS,
+    "grid_export_power": _GRID_FLOW_INPUTS,
+    "grid_import_power": _GRID_FLOW_INPUTS,
+    "self_consumption": _SELF_CONSUMPTION_INPUTS,
+    "self_consumption_percentage": _SELF_CONSUMPTION_INPUTS,
+    "house_consumption": _SELF_CONSUMPTION_INPUTS,
+    "battery_power": frozenset({"charge_power", "discharge_power"}),
+    "grid_energy_today": frozenset({"energy_to_grid_today", "load_energy_today", "energy_today"}),
+    "grid_energy_total": frozenset({"energy_to_grid_total", "load_energy_total", "energy_total"}),
+    "grid_import_energy_today": frozenset({"energy_to_grid_today", "load_energy_today", "energy_today"}),
+    "grid_import_energy_total": frozenset({"energy_to_grid_total", "load_energy_total", "energy_total"}),
+}
+
+
+def sensor_input_fields(sensor_key: str, attr: str) -> Optional[FrozenSet[str]]:
+    """Data fields a sensor's value depends on (None = update on every poll)"""
+    if attr == "calculated":
+        return CALCULATED_SENSOR_INPUTS.get(sensor_key)
+    return frozenset({attr})
+
+
+def deadband_exempt(field: str) -> bool:
+    """Fields published on any change, whatever the deadband"""
+    return 'energy' in field
+
+
+class ChangeTracker:
+    """Remembers the last published value of every field"""
+
+    def __init__(self, deadband: float = 0.0):
+        self.deadband = deadband / 100   # percent -> fraction
+        self._published: Dict[str, Any] = {}
+        self._exempt = frozenset(
+            name for name, default in FIELDS
+            if isinstance(default, int) or deadband_exempt(name)
+        )
+
+    def _significant(self, field: str, old: Any, new: Any) -> bool:
+        if new == old:
+            return False
+        if (not self.deadband or field in self._exempt
+                or not isinstance(new, float) or not isinstance(old, (int, float))):
+            return True
+        return abs(new - old) > self.deadband * abs(old)
+
+    def update(self, data) -> FrozenSet[str]:
+        """Fields of data that changed significantly since they were last published"""
+        published = self._published
+        changed = set()
+        for field, value in data.as_dict().items():
+            if field not in published or self._significant(field, published[field], value):
+                published[field] = value
+                changed.add(field)
+        return frozenset(changed)
+
+    def reset(self) -> None:
+        """Forget the published values - the next update reports every field"""
+        self._published.clear()
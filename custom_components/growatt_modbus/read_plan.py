@@ -0,0 +1,374 @@
+"""
+Precompiled Modbus read plans for Growatt register maps.
+
+The set of read transactions needed to poll an inverter only depends on the
+register map and the link it is polled over, so it is computed once and
+cached at module level. Every client using the same profile and link shares
+the same immutable plan instead of re-deriving address ranges on each poll.
+
+Blocks are chosen by a small cost model: every transaction pays a fixed
+overhead (request/response framing, inter-frame gaps, device turnaround) and
+every register transferred pays a per-register wire cost. Within each register
+segment the split with the lowest total expected time is selected, so cheap
+gaps are bridged and expensive ones are skipped. Some firmware refuses a read
+that covers an address it does not implement, so a block that bridges
+undefined addresses also carries its runs of defined addresses as parts, to
+be read instead if the device answers the bridged block with Illegal Data
+Address.
+
+Registers are also grouped into poll tiers (fast-changing power values, slow
+energy counters, identity/settings). The plan for a subset of tiers is the
+subset of the full plan's blocks that read registers of those tiers, so polls
+that only need the fast tier skip the slow blocks, and a block covers the
+same registers in every poll whichever tiers are due.
+
+Blocks are executed in priority order - required blocks, then blocks with
+fast-tier (power) registers, then energy counters, holding registers last -
+so a poll cut short by its deadline loses the least important values.
+"""
+
+import logging
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from .const import (
+    REGISTER_MAPS,
+    POLL_TIER_FAST,
+    POLL_TIER_ENERGY,
+    POLL_TIER_CONFIG,
+    DEFAULT_POLL_INTERVALS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of registers per Modbus read request (protocol limit)
+MAX_REGISTERS_PER_READ = 125
+
+REGISTER_TYPE_INPUT = 'input'
+REGISTER_TYPE_HOLDING = 'holding'
+
+# Register segments a single transaction never crosses. Addresses outside
+# these segments are not polled. (start, end, required)
+INPUT_SEGMENTS = (
+    (0, 124, True),          # Base range - status and main data (SPH/MIX/WIT)
+    (875, 999, False),       # Business storage range - WIT/WIS models
+    (1000, 1124, False),     # Storage range - SPH/hybrid models with battery
+    (3000, 3999, None),      # MIN/MOD main range (required if it fits one read)
+    (8000, 8199, False),     # WIT/WIS battery/storage data
+    (31000, 31999, False),   # VPP extended battery/BMS range
+)
+HOLDING_SEGMENTS = (
+    (0, 124, False),
+)
+
+# Holding registers decoded into GrowattData on every poll
+DEVICE_INFO_REGISTERS = tuple(range(9, 14))        # Serial number (always read)
+CONTROL_REGISTERS = (1, 2, 3, 8, 37, 38, 39, 83, 95, 122, 123)
+
+ALL_TIERS = frozenset((POLL_TIER_FAST, POLL_TIER_ENERGY, POLL_TIER_CONFIG))
+# A register pair is read in the faster of its two tiers
+_TIER_ORDER = (POLL_TIER_FAST, POLL_TIER_ENERGY, POLL_TIER_CONFIG)
+
+# RTU framing: 8N1 = 10 bits per byte
+BITS_PER_BYTE = 10
+# Request (8 bytes) + response header/CRC (5 bytes) + 2 x 3.5 char silent intervals
+FRAME_OVERHEAD_BYTES = 8 + 5 + 7
+# Typical inverter processing time before it answers a request
+DEVICE_TURNAROUND = 0.030
+# Extra round trip added by an RS485-to-TCP gateway
+TCP_ROUND_TRIP = 0.005
+# Baud rate assumed on the RS485 side of a TCP gateway
+GATEWAY_BAUDRATE = 9600
+
+
+class LinkCost(NamedTuple):
+    """Expected wire time for a read transaction, in seconds"""
+    transaction_overhead: float
+    register_cost: float
+
+    def transaction_time(self, count: int) -> float:
+        """Expected time for one read of `count` registers"""
+        return self.transaction_overhead + count * self.register_cost
+
+
+def link_cost_for(connection_type: str = 'serial', baudrate: int = 9600) -> LinkCost:
+    """
+    Estimate transaction costs for a connection.
+
+    At 9600 baud every register costs about 2 ms and every transaction about
+    50 ms. TCP gateways add a network round trip on top of their own RS485 link.
+    """
+    if connection_type == 'tcp':
+        baudrate = GATEWAY_BAUDRATE
+    byte_time = BITS_PER_BYTE / max(int(baudrate or GATEWAY_BAUDRATE), 1)
+    overhead = FRAME_OVERHEAD_BYTES * byte_time + DEVICE_TURNAROUND
+    if connection_type == 'tcp':
+        overhead += TCP_ROUND_TRIP
+    return LinkCost(round(overhead, 6), round(2 * byte_time, 6))
+
+
+DEFAULT_LINK_COST = link_cost_for('serial', 9600)
+
+
+class ReadBlock(NamedTuple):
+    """A single Modbus read transaction"""
+    start: int
+    count: int
+    register_type: str = REGISTER_TYPE_INPUT
+    required: bool = False  # Poll is aborted if a required block cannot be read
+    tiers: FrozenSet[str] = ALL_TIERS  # Poll tiers of the registers this block is read for
+    parts: Tuple['ReadBlock', ...] = ()  # Runs of defined addresses, if the block bridges undefined ones
+
+    @property
+    def end(self) -> int:
+        """Last register address covered by this block"""
+        return self.start + self.count - 1
+
+
+class ReadPlan(NamedTuple):
+    """Immutable list of read transactions for one register map"""
+    profile: str
+    status_address: Optional[int]
+    input_blocks: Tuple[ReadBlock, ...]
+    holding_blocks: Tuple[ReadBlock, ...]
+    link: LinkCost = DEFAULT_LINK_COST
+    tiers: FrozenSet[str] = ALL_TIERS
+
+    @property
+    def blocks(self) -> Tuple[ReadBlock, ...]:
+        """All transactions in execution order (input registers first)"""
+        return self.input_blocks + self.holding_blocks
+
+    @property
+    def register_count(self) -> int:
+        """Total number of registers transferred by one full poll"""
+        return sum(block.count for block in self.blocks)
+
+    @property
+    def expected_time(self) -> float:
+        """Expected wire time of one full poll in seconds"""
+        return sum(self.link.transaction_time(block.count) for block in self.blocks)
+
+
+def plan_blocks(addresses: Iterable[int], link: LinkCost,
+                max_count: int = MAX_REGISTERS_PER_READ) -> List[Tuple[int, int]]:
+    """
+    Split sorted addresses into the cheapest set of (start, count) reads.
+
+    Dynamic programming over the wanted addresses: best[i] is the cheapest
+    cost of reading the first i addresses, where the last read spans from
+    address j to address i-1. Reads never exceed max_count registers.
+    """
+    addrs = sorted(set(addresses))
+    if not addrs:
+        return []
+
+    n = len(addrs)
+    best = [0.0] + [float('inf')] * n
+    split = [0] * (n + 1)
+    for i in range(1, n + 1):
+        last = addrs[i - 1]
+        for j in range(i, 0, -1):
+            span = last - addrs[j - 1] + 1
+            if span > max_count:
+                break
+            cost = best[j - 1] + link.transaction_time(span)
+            # Prefer fewer transactions on ties
+            if cost < best[i] or (cost == best[i] and j < split[i]):
+                best[i] = cost
+                split[i] = j
+
+    blocks = []
+    i = n
+    while i > 0:
+        j = split[i]
+        blocks.append((addrs[j - 1], addrs[i - 1] - addrs[j - 1] + 1))
+        i = j - 1
+    blocks.reverse()
+    return blocks
+
+
+def _address_runs(addresses: List[int]) -> List[List[int]]:
+    """Sorted addresses grouped into runs of consecutive addresses"""
+    runs: List[List[int]] = []
+    for addr in addresses:
+        if runs and addr == runs[-1][-1] + 1:
+            runs[-1].append(addr)
+        else:
+            runs.append([addr])
+    return runs
+
+
+def _plan_segments(register_tiers: Dict[int, str], segments, register_type: str,
+                   link: LinkCost, max_count: int) -> List[ReadBlock]:
+    """Plan reads segment by segment so no transaction crosses a boundary"""
+    addresses = sorted(register_tiers)
+    blocks: List[ReadBlock] = []
+    for seg_start, seg_end, required in segments:
+        in_segment = [addr for addr in addresses if seg_start <= addr <= seg_end]
+        if not in_segment:
+            continue
+        if required is None:
+            # Segment is the main data range if it fits in a single read
+            required = (in_segment[-1] - seg_start + 1) <= max_count
+        for start, count in plan_blocks(in_segment, link, max_count):
+            in_block = [addr for addr in in_segment if start <= addr < start + count]
+            runs = _address_runs(in_block)
+            parts = tuple(
+                ReadBlock(run[0], len(run), register_type, required,
+                          frozenset(register_tiers[addr] for addr in run))
+                for run in runs
+            ) if len(runs) > 1 else ()
+            block_tiers = frozenset(register_tiers[addr] for addr in in_block)
+            blocks.append(ReadBlock(start, count, register_type, required, block_tiers, parts))
+    return blocks
+
+
+def segment_spans(addresses: Iterable[int]) -> List[Tuple[int, int]]:
+    """Inclusive (first, last) wanted address of every input segment in use"""
+    addresses = sorted(addresses)
+    spans = []
+    for seg_start, seg_end, _required in INPUT_SEGMENTS:
+        wanted = [addr for addr in addresses if seg_start <= addr <= seg_end]
+        if wanted:
+            spans.append((wanted[0], wanted[-1]))
+    return spans
+
+
+def register_tier(name: str, spec: Dict, register_type: str = REGISTER_TYPE_INPUT) -> str:
+    """
+    Poll tier of a register.
+
+    Profiles can set 'tier' on a register explicitly. Otherwise holding
+    registers (identity and settings) are config, energy counters and
+    running time are energy, and everything else is fast.
+    """
+    tier = spec.get('tier')
+    if tier in ALL_TIERS:
+        return tier
+    if register_type == REGISTER_TYPE_HOLDING:
+        return POLL_TIER_CONFIG
+    if 'energy' in name or name.startswith('time_total'):
+        return POLL_TIER_ENERGY
+    return POLL_TIER_FAST
+
+
+def _input_register_tiers(input_map: Dict[int, Dict]) -> Dict[int, str]:
+    """Poll tier of every input register (both halves of a pair share a tier)"""
+    tiers = {addr: register_tier(spec.get('name', ''), spec) for addr, spec in input_map.items()}
+    for addr, spec in input_map.items():
+        pair = spec.get('pair')
+        if pair in tiers:
+            faster = min(tiers[addr], tiers[pair], key=_TIER_ORDER.index)
+            tiers[addr] = tiers[pair] = faster
+    return tiers
+
+
+def _holding_register_tiers(holding_map: Dict[int, Dict]) -> Dict[int, str]:
+    """Holding registers needed to fill the device info / control fields, with their tiers"""
+    tiers = {addr: POLL_TIER_CONFIG for addr in DEVICE_INFO_REGISTERS}
+    for addr in CONTROL_REGISTERS:
+        if addr in holding_map:
+            spec = holding_map[addr]
+            tiers[addr] = register_tier(spec.get('name', ''), spec, REGISTER_TYPE_HOLDING)
+    return tiers
+
+
+def poll_intervals(register_map: Dict) -> Dict[str, float]:
+    """Seconds between reads of each tier (profile 'poll_intervals' override the defaults)"""
+    intervals = dict(DEFAULT_POLL_INTERVALS)
+    intervals.update(register_map.get('poll_intervals', {}))
+    return intervals
+
+
+def _block_priority(block: ReadBlock) -> Tuple[bool, int, int]:
+    """Sort key: required blocks first, then by the fastest tier a block serves"""
+    fastest = min((_TIER_ORDER.index(tier) for tier in block.tiers), default=len(_TIER_ORDER))
+    return (not block.required, fastest, block.start)
+
+
+def build_read_plan(register_map: Dict, profile: str = '',
+                    link: LinkCost = DEFAULT_LINK_COST,
+                    tiers: FrozenSet[str] = ALL_TIERS) -> ReadPlan:
+    """
+    Compile the read transactions for the given poll tiers of a register map.
+
+    Blocks are always planned over all tiers; a plan for fewer tiers keeps
+    the blocks that read at least one register of them.
+    """
+    input_regs = register_map.get('input_registers', {})
+    holding_regs = register_map.get('holding_registers', {})
+    max_count = min(register_map.get('max_registers_per_read', MAX_REGISTERS_PER_READ),
+                    MAX_REGISTERS_PER_READ)
+
+    input_blocks = [block for block in _plan_segments(_input_register_tiers(input_regs), INPUT_SEGMENTS,
+                                                      REGISTER_TYPE_INPUT, link, max_count)
+                    if block.tiers & tiers]
+    holding_blocks = [block for block in _plan_segments(_holding_register_tiers(holding_regs), HOLDING_SEGMENTS,
+                                                        REGISTER_TYPE_HOLDING, link, max_count)
+                      if block.tiers & tiers]
+
+    plan = ReadPlan(
+        profile=profile or register_map.get('name', ''),
+        status_address=min(input_regs) if input_regs else None,
+        input_blocks=tuple(sorted(input_blocks, key=_block_priority)),
+        holding_blocks=tuple(sorted(holding_blocks, key=_block_priority)),
+        link=link,
+        tiers=tiers,
+    )
+    logger.debug(
+        f"Compiled read plan for {plan.profile} ({', '.join(sorted(tiers))}): {len(plan.blocks)} transactions, "
+        f"{plan.register_count} registers, ~{plan.expected_time * 1000:.0f} ms on the wire"
+    )
+    return plan
+
+
+# Plans are shared by all clients using the same profile and link
+_READ_PLANS: Dict[Tuple[str, LinkCost, FrozenSet[str]], ReadPlan] = {}
+
+
+def get_read_plan(register_map_name: str, link: LinkCost = DEFAULT_LINK_COST,
+                  tiers: FrozenSet[str] = ALL_TIERS) -> ReadPlan:
+    """Get the cached read plan for a profile, compiling it on first use"""
+    tiers = frozenset(tiers) & ALL_TIERS
+    key = (register_map_name, link, tiers)
+    plan = _READ_PLANS.get(key)
+    if plan is None:
+        if register_map_name not in REGISTER_MAPS:
+            raise ValueError(f"Unknown register map: {register_map_name}")
+        plan = build_read_plan(REGISTER_MAPS[register_map_name], register_map_name, link, tiers)
+        _READ_PLANS[key] = plan
+    return plan
+
+
+class TierSchedule:
+    """Tracks when each poll tier was last read and which tiers are due"""
+
+    def __init__(self, intervals: Dict[str, float]):
+        self.intervals = dict(intervals)
+        self._refreshed: Dict[str, float] = {}
+
+    def due(self, now: float, period: float = 0.0) -> FrozenSet[str]:
+        """
+        Tiers to read in a poll starting at `now`.
+
+        period is the poll interval: a tier that would become due before the
+        middle of the next period is read now rather than a whole period late.
+        """
+        due = set()
+        for tier in ALL_TIERS:
+            last = self._refreshed.get(tier)
+            if last is None or now - last >= self.intervals.get(tier, 0) - period / 2:
+                due.add(tier)
+        return frozenset(due)
+
+    def mark_refreshed(self, tiers: Iterable[str], now: float) -> None:
+        """Record a successful read of these tiers"""
+        for tier in tiers:
+            self._refreshed[tier] = now
+
+    def invalidate(self, tier: Optional[str] = None) -> None:
+        """Make a tier (or every tier) due on the next poll"""
+        if tier is None:
+            self._refreshed.clear()
+        else:
+            self._refreshed.pop(tier, None)
@@ -0,0 +1,91 @@
+"""
+Per-profile register lookup index.
+
+Maps register names and aliases to addresses and precomputes the 32-bit pair
+metadata (partner address, word order, combined scale, signedness) that is
+otherwise looked up from the register map dicts on every decode. Built once
+per profile and shared by all clients using it.
+"""
+
+from typing import Dict, NamedTuple, Optional
+
+from .const import REGISTER_MAPS
+
+
+class RegisterSpec(NamedTuple):
+    """Decode metadata for a single input register"""
+    address: int
+    name: str
+    scale: float
+    signed: bool
+    pair: Optional[int] = None   # Partner address if part of a 32-bit pair
+    high: bool = False           # True if this register holds the HIGH word
+    combined_scale: float = 1    # Scale applied to the combined 32-bit value
+
+
+class RegisterIndex(NamedTuple):
+    """Name/alias lookup and decode metadata for one register map"""
+    addresses: Dict[str, int]
+    specs: Dict[int, RegisterSpec]
+
+    def find(self, name: str) -> Optional[int]:
+        """Address for a register name or alias, or None if not in the profile"""
+        return self.addresses.get(name)
+
+
+def build_register_index(register_map: Dict) -> RegisterIndex:
+    """Build the lookup index for a register map"""
+    input_regs = register_map.get('input_registers', {})
+
+    # First register (in map order) whose name or alias matches wins
+    addresses: Dict[str, int] = {}
+    for addr, reg_info in input_regs.items():
+        addresses.setdefault(reg_info['name'], addr)
+        alias = reg_info.get('alias')
+        if alias:
+            addresses.setdefault(alias, addr)
+
+    specs: Dict[int, RegisterSpec] = {}
+    for addr, reg_info in input_regs.items():
+        pair_addr = reg_info.get('pair')
+        pair_info = input_regs.get(pair_addr) if pair_addr is not None else None
+        if pair_info is None:
+            # Single register, or a pair whose partner is missing from the map
+            # (decoded as a plain unsigned register in that case)
+            specs[addr] = RegisterSpec(
+                address=addr,
+                name=reg_info['name'],
+                scale=reg_info.get('scale', 1),
+                signed=bool(reg_info.get('signed')) and pair_addr is None,
+            )
+            continue
+
+        # The combined scale lives on the LOW word of the pair
+        high = addr < pair_addr
+        low_info = pair_info if high else reg_info
+        specs[addr] = RegisterSpec(
+            address=addr,
+            name=reg_info['name'],
+            scale=reg_info.get('scale', 1),
+            signed=bool(reg_info.get('signed') or pair_info.get('signed')),
+            pair=pair_addr,
+            high=high,
+            combined_scale=low_info.get('combined_scale', 1),
+        )
+
+    return RegisterIndex(addresses=addresses, specs=specs)
+
+
+# Indexes are shared by all clients using the same profile
+_REGISTER_INDEXES: Dict[str, RegisterIndex] = {}
+
+
+def get_register_index(register_map_name: str) -> RegisterIndex:
+    """Get the cached register index for a profile, building it on first use"""
+    index = _REGISTER_INDEXES.get(register_map_name)
+    if index is None:
+        if register_map_name not in REGISTER_MAPS:
+            raise ValueError(f"Unknown register map: {register_map_name}")
+        index = build_register_index(REGISTER_MAPS[register_map_name])
+        _REGISTER_INDEXES[register_map_name] = index
+    return index
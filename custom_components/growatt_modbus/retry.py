@@ -0,0 +1,56 @@
+"""
+Per-transaction retry policy.
+
+A failed read is retried on its own instead of repeating the whole poll, so
+blocks that were already read are not read again. Only failures that may be
+transient are retried - no response, or "slave device busy" (code 6). Any
+other exception response (e.g. Illegal Data Address) would fail the same way
+again. Retries wait a jittered, exponentially growing delay, and the whole
+poll shares one time budget: a retry that would not fit in the remaining
+budget is not attempted.
+"""
+
+import random
+from typing import Optional
+
+from .pacing import MODBUS_EXCEPTION_BUSY
+
+BLOCK_RETRIES = 2             # Extra attempts per transaction
+RETRY_BASE_DELAY = 0.5        # seconds, before the first retry
+RETRY_MAX_DELAY = 4.0         # seconds
+DEFAULT_POLL_BUDGET = 20.0    # seconds for one poll, retries included
+
+
+class RetryPolicy:
+    """Decides whether and when a failed transaction is retried"""
+
+    def __init__(self, retries: int = BLOCK_RETRIES, base_delay: float = RETRY_BASE_DELAY,
+                 max_delay: float = RETRY_MAX_DELAY, rng: Optional[random.Random] = None):
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def retryable(exception_code: Optional[int]) -> bool:
+        """No response or busy - worth another attempt"""
+        return exception_code is None or exception_code == MODBUS_EXCEPTION_BUSY
+
+    def delay(self, attempt: int) -> float:
+        """Jittered delay before retry number attempt + 1 (half fixed, half random)"""
+        ceiling = min(self.base_delay * 2 ** attempt, self.max_delay)
+        return ceiling / 2 + self._rng.uniform(0, ceiling / 2)
+
+    def backoff(self, attempt: int, exception_code: Optional[int], remaining: float) -> Optional[float]:
+        """
+        Delay before retrying a failed transaction, or None to give up.
+
+        attempt counts the retries already made, remaining is the time left in
+        the poll budget.
+        """
+        if attempt >= self.retries or not self.retryable(exception_code):
+            return None
+        delay = self.delay(attempt)
+        if delay >= remaining:
+            return None
+        return delay
@@ -153,16 +153,14 @@ class GrowattGenericSelect(CoordinatorEntity, SelectEntity):
 
         # Write to Modbus register
         register = self._control_config['register']
-        success = await self.hass.async_add_executor_job(
-            self.coordinator.modbus_client.write_register,
+        success = await self.coordinator.async_write_register(
             register,
             value
         )
 
         if success:
             _LOGGER.info("Set %s to %s (value=%d)", self._control_name, option, value)
-            # Request immediate refresh to show new value
-            await self.coordinator.async_request_refresh()
+            # The write was read back and pushed to all entities - no full refresh needed
         else:
             _LOGGER.error("Failed to write %s", self._control_name)
 
@@ -215,8 +213,7 @@ class GrowattWitWorkModeSelect(CoordinatorEntity, SelectEntity):
 
         _LOGGER.debug("[WIT] Writing work_mode (202) = %d", value)
         try:
-            success = await self.hass.async_add_executor_job(
-                self.coordinator.modbus_client.write_register,
+            success = await self.coordinator.async_write_register(
                 202,
                 value,
             )
@@ -235,14 +232,14 @@ class GrowattWitWorkModeSelect(CoordinatorEntity, SelectEntity):
                 await asyncio.sleep(0.4)
                 _LOGGER.debug("[WIT] Re-applying active_power_rate (201) = %d", last_power)
                 try:
-                    await self.hass.async_add_executor_job(
-                        self.coordinator.modbus_client.write_register,
+                    await self.coordinator.async_write_register(
                         201,
                         last_power,
                     )
                 except Exception as err:  # noqa: BLE001
                     _LOGGER.exception("[WIT] power re-apply failed: %s", err)
 
-            await self.coordinator.async_request_refresh()
+            # Show the command just sent (the read-back was pushed before it was recorded)
+            self.async_write_ha_state()
         else:
             _LOGGER.error("[WIT] Failed to write work_mode")
@@ -18,8 +18,9 @@ from homeassistant.const import (
     UnitOfFrequency,
     UnitOfPower,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
@@ -27,11 +28,13 @@ from .const import (
     DOMAIN,
     CONF_INVERTER_SERIES,
     CONF_INVERT_GRID_POWER,
+    DEVICE_TYPE_INVERTER,
     get_device_type_for_sensor,
     get_entity_category,
 )
 from .coordinator import GrowattModbusCoordinator
 from .device_profiles import get_sensors_for_profile
+from .publish import sensor_input_fields
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -654,6 +657,84 @@ SENSOR_DEFINITIONS = {
 }
 
 
+# Poll instrumentation (see metrics.py) - "metric" is the key in
+# ClientMetrics.summary(), "scale" converts fractions to percent
+POLL_METRIC_SENSORS = {
+    "poll_duration_p50": {
+        "name": "Poll Duration p50",
+        "icon": "mdi:timer-outline",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.SECONDS,
+        "metric": "poll_duration_p50",
+        "precision": 2,
+    },
+    "poll_duration_p95": {
+        "name": "Poll Duration p95",
+        "icon": "mdi:timer-alert-outline",
+        "device_class": SensorDeviceClass.DURATION,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": UnitOfTime.SECONDS,
+        "metric": "poll_duration_p95",
+        "precision": 2,
+    },
+    "poll_error_rate": {
+        "name": "Poll Error Rate",
+        "icon": "mdi:alert-circle-outline",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": PERCENTAGE,
+        "metric": "error_rate",
+        "scale": 100,
+        "precision": 1,
+    },
+    "modbus_retries": {
+        "name": "Modbus Retries",
+        "icon": "mdi:refresh",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "metric": "retries",
+    },
+    "poll_overruns": {
+        "name": "Poll Overruns",
+        "icon": "mdi:timer-sand-complete",
+        "state_class": SensorStateClass.TOTAL_INCREASING,
+        "metric": "overruns",
+    },
+    "bus_utilization": {
+        "name": "Bus Utilization",
+        "icon": "mdi:transit-connection-variant",
+        "state_class": SensorStateClass.MEASUREMENT,
+        "unit": PERCENTAGE,
+        "metric": "bus_utilization",
+        "scale": 100,
+        "precision": 1,
+    },
+}
+
+
+# Windowed statistics from the coordinator's sample history (see history.py) -
+# "stat" is a WindowStats field, "scale" converts per-second rates
+HISTORY_SENSORS = {
+    "pv_power_average_5min": {
+        "name": "PV Power 5 min Average",
+        "icon": "mdi:solar-power",
+        "device_class": SensorDeviceClass.POWER,
+        "unit": UnitOfPower.WATT,
+        "field": "pv_total_power",
+        "window": 300,
+        "stat": "mean",
+    },
+    "ac_power_ramp_rate": {
+        "name": "AC Power Ramp Rate",
+        "icon": "mdi:chart-line-variant",
+        "unit": "W/min",
+        "field": "ac_power",
+        "window": 60,
+        "stat": "ramp_rate",
+        "scale": 60,
+    },
+}
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -705,6 +786,19 @@ async def async_setup_entry(
             )
         )
     
+    # Windowed statistics of fields this profile provides
+    entities.extend(
+        GrowattHistorySensor(coordinator, config_entry, sensor_key, sensor_def)
+        for sensor_key, sensor_def in HISTORY_SENSORS.items()
+        if sensor_def["field"] in available_sensors
+    )
+
+    # Poll instrumentation applies to every profile
+    entities.extend(
+        GrowattPollMetricSensor(coordinator, config_entry, sensor_key, sensor_def)
+        for sensor_key, sensor_def in POLL_METRIC_SENSORS.items()
+    )
+
     _LOGGER.info("Created %d sensors for %s", len(entities), inverter_series)
     async_add_entities(entities)
 
@@ -746,11 +840,30 @@ class GrowattModbusSensor(CoordinatorEntity, SensorEntity):
         if "icon" in sensor_def:
             self._attr_icon = sensor_def["icon"]
 
+        # Data fields this sensor's value depends on (None = update every poll)
+        self._input_fields = sensor_input_fields(sensor_key, sensor_def["attr"])
+        self._published_available = None
+
     @property
     def device_info(self) -> dict[str, Any]:
         """Return device information."""
         return self.coordinator.get_device_info(self._device_type)
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if availability or one of the input fields changed."""
+        available = self.available
+        changed = self.coordinator.changed_fields
+        if (
+            available == self._published_available
+            and changed is not None
+            and self._input_fields is not None
+            and self._input_fields.isdisjoint(changed)
+        ):
+            return
+        self._published_available = available
+        super()._handle_coordinator_update()
+
     @property
     def native_value(self) -> Any:
         """Return the state of the sensor."""
@@ -1035,3 +1148,120 @@ class GrowattModbusSensor(CoordinatorEntity, SensorEntity):
         """Return additional state attributes."""
         # No attributes on sensors - all info is in device_info or other sensors
         return None
+
+
+class GrowattPollMetricSensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor for poll timing and error statistics."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: GrowattModbusCoordinator,
+        config_entry: ConfigEntry,
+        sensor_key: str,
+        sensor_def: dict[str, Any],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._sensor_key = sensor_key
+        self._sensor_def = sensor_def
+        self._attr_name = f"{config_entry.data['name']} {sensor_def['name']}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}"
+        self._attr_icon = sensor_def["icon"]
+        self._attr_state_class = sensor_def["state_class"]
+        if "device_class" in sensor_def:
+            self._attr_device_class = sensor_def["device_class"]
+        if "unit" in sensor_def:
+            self._attr_native_unit_of_measurement = sensor_def["unit"]
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information."""
+        return self.coordinator.get_device_info(DEVICE_TYPE_INVERTER)
+
+    @property
+    def available(self) -> bool:
+        """Statistics stay available while the inverter is offline."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the current aggregate."""
+        value = self.coordinator.poll_metrics.get(self._sensor_def["metric"])
+        if value is None:
+            return None
+        value *= self._sensor_def.get("scale", 1)
+        if "precision" in self._sensor_def:
+            value = round(value, self._sensor_def["precision"])
+        return value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Per-block counters on the error rate sensor."""
+        if self._sensor_key != "poll_error_rate":
+            return None
+        metrics = self.coordinator.poll_metrics
+        return {
+            "wire_bytes": metrics.get("wire_bytes"),
+            "wire_time_p95": metrics.get("wire_time_p95"),
+            "queue_wait_p95": metrics.get("queue_wait_p95"),
+            "decode_time_p50": metrics.get("decode_time_p50"),
+            "blocks": self.coordinator.block_metrics,
+        }
+
+
+class GrowattHistorySensor(CoordinatorEntity, SensorEntity):
+    """Diagnostic sensor computed from the recent sample history."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: GrowattModbusCoordinator,
+        config_entry: ConfigEntry,
+        sensor_key: str,
+        sensor_def: dict[str, Any],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+
+        self._sensor_def = sensor_def
+        self._attr_name = f"{config_entry.data['name']} {sensor_def['name']}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{sensor_key}"
+        self._attr_icon = sensor_def["icon"]
+        self._attr_native_unit_of_measurement = sensor_def["unit"]
+        if "device_class" in sensor_def:
+            self._attr_device_class = sensor_def["device_class"]
+        self._device_type = get_device_type_for_sensor(sensor_def["field"])
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information."""
+        return self.coordinator.get_device_info(self._device_type)
+
+    @property
+    def native_value(self) -> Any:
+        """Return the windowed statistic."""
+        stats = self.coordinator.history.stats(self._sensor_def["field"], self._sensor_def["window"])
+        if stats is None:
+            return None
+        value = getattr(stats, self._sensor_def["stat"])
+        if value is None:
+            return None
+        return round(value * self._sensor_def.get("scale", 1), 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Window size and range."""
+        stats = self.coordinator.history.stats(self._sensor_def["field"], self._sensor_def["window"])
+        if stats is None:
+            return None
+        return {
+            "window_seconds": self._sensor_def["window"],
+            "samples": stats.count,
+            "minimum": round(stats.minimum, 1),
+            "maximum": round(stats.maximum, 1),
+        }
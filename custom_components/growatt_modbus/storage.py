@@ -0,0 +1,60 @@
+"""
+Per-device state persisted across restarts.
+
+Things the integration learns about an inverter at runtime (such as the
+request pacing it tolerates, register ranges it does not implement, or its
+serial number and firmware) are kept in Home Assistant's storage, one file
+per config entry (.storage/growatt_modbus.<entry_id>), split into named
+sections so features can store their state independently.
+"""
+
+import logging
+from typing import Any, Dict
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Coalesce frequent updates into one write (pending writes are flushed on shutdown)
+SAVE_DELAY = 60  # seconds
+
+# Sections
+SECTION_PACING = "pacing"
+SECTION_IDENTITY = "identity"
+SECTION_UNSUPPORTED_BLOCKS = "unsupported_blocks"
+
+
+class DeviceStore:
+    """Persistent state for one config entry"""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._data: Dict[str, Any] = {}
+
+    async def async_load(self) -> None:
+        """Load stored state (missing or unreadable files start empty)"""
+        try:
+            data = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Could not load stored device state: %s", err)
+            data = None
+        self._data = data if isinstance(data, dict) else {}
+
+    def get(self, section: str, default: Any = None) -> Any:
+        """Stored value of a section"""
+        return self._data.get(section, default)
+
+    def set(self, section: str, value: Any) -> None:
+        """Update a section; unchanged values do not trigger a write"""
+        if self._data.get(section) == value:
+            return
+        self._data[section] = value
+        self._store.async_delay_save(lambda: self._data, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the stored state (config entry removed)"""
+        await self._store.async_remove()
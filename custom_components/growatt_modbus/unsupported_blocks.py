@@ -0,0 +1,160 @@
+"""
+Negative-result cache for register blocks a device does not answer.
+
+Profiles cover a whole inverter family, and not every firmware implements
+every range in them (e.g. the 31000+ VPP blocks on older MOD firmware, or
+875-999 on some WIT units). Reading such a block costs an Illegal Data
+Address response or a full timeout on every poll. After FAILURES_TO_SKIP
+consecutive failures a block is skipped, and only re-probed after an
+interval that doubles with every failed re-probe. One successful read
+clears it. Required blocks are never skipped.
+
+Blocks are tracked by the address range they cover and matched by overlap,
+not by their exact geometry: the read plan merges ranges differently per
+link and poll tier, and a read of any block covering an unsupported address
+fails the same way.
+
+The learned levels are persisted per device (see storage.py).
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from .read_plan import ReadBlock
+
+logger = logging.getLogger(__name__)
+
+FAILURES_TO_SKIP = 3
+REPROBE_INTERVAL = 300.0             # seconds, first re-probe of a skipped block
+MAX_REPROBE_INTERVAL = 6 * 3600.0    # seconds
+
+BlockKey = Tuple[str, int, int]  # (register type, first address, last address)
+
+
+def _key(block: ReadBlock) -> BlockKey:
+    return (block.register_type, block.start, block.end)
+
+
+def _overlaps(key: BlockKey, block: ReadBlock) -> bool:
+    register_type, start, end = key
+    return register_type == block.register_type and start <= block.end and block.start <= end
+
+
+def _describe(key: BlockKey) -> str:
+    register_type, start, end = key
+    return f"{register_type} {start}-{end}"
+
+
+def _parse_key(name: str) -> BlockKey:
+    """Key from its stored form, "type:start-end" (or "type:start:count" as stored before)"""
+    register_type, _, addresses = name.partition(':')
+    if '-' in addresses:
+        start, end = addresses.split('-')
+        return (register_type, int(start), int(end))
+    start, count = addresses.split(':')
+    return (register_type, int(start), int(start) + int(count) - 1)
+
+
+class _BlockState:
+    __slots__ = ('failures', 'level', 'next_probe', 'exception_code')
+
+    def __init__(self):
+        self.failures = 0        # Consecutive failed reads
+        self.level = 0           # Failed (re-)probes since the block was skipped; 0 = not skipped
+        self.next_probe = 0.0    # time.monotonic() of the next read attempt
+        self.exception_code: Optional[int] = None  # None = no response
+
+
+class UnsupportedBlocks:
+    """Read blocks one device keeps failing to answer"""
+
+    def __init__(self):
+        self._blocks: Dict[BlockKey, _BlockState] = {}
+
+    def _overlapping(self, block: ReadBlock) -> List[BlockKey]:
+        return [key for key in self._blocks if _overlaps(key, block)]
+
+    def skip(self, block: ReadBlock, now: float) -> bool:
+        """True if the block covers a skipped range that is not due for a re-probe"""
+        if block.required:
+            return False
+        return any(
+            state.level > 0 and now < state.next_probe
+            for state in (self._blocks[key] for key in self._overlapping(block))
+        )
+
+    def failing(self, block: ReadBlock) -> bool:
+        """True if the last read of a range the block covers failed too (likely unsupported, not unlucky)"""
+        return bool(self._overlapping(block))
+
+    def record(self, block: ReadBlock, success: bool, now: float,
+               exception_code: Optional[int] = None) -> None:
+        """Feed back the result of reading a block"""
+        key = _key(block)
+        overlapping = self._overlapping(block)
+        if success:
+            for old_key in overlapping:
+                if self._blocks.pop(old_key).level:
+                    logger.info(f"Register block {_describe(old_key)} answers again - polling it normally")
+            return
+        if block.required:
+            return
+
+        state = self._blocks.get(key)
+        if state is None:
+            # Read with a different geometry before - the block takes over their history
+            state = _BlockState()
+            for old_key in overlapping:
+                old = self._blocks.pop(old_key)
+                if (old.level, old.failures) > (state.level, state.failures):
+                    state = old
+            self._blocks[key] = state
+        state.failures += 1
+        state.exception_code = exception_code
+        if state.failures < FAILURES_TO_SKIP:
+            return
+
+        state.level += 1
+        interval = self._interval(state.level)
+        state.next_probe = now + interval
+        reason = f"exception code {exception_code}" if exception_code is not None else "no response"
+        log = logger.info if state.level == 1 else logger.debug
+        log(f"Register block {_describe(key)} not supported by this device ({reason}) - "
+            f"skipping it, next probe in {interval:.0f}s")
+
+    @staticmethod
+    def _interval(level: int) -> float:
+        return min(REPROBE_INTERVAL * 2 ** (level - 1), MAX_REPROBE_INTERVAL)
+
+    @property
+    def skipped(self) -> List[str]:
+        """Blocks currently skipped, for diagnostics"""
+        result = []
+        for key, state in sorted(self._blocks.items()):
+            if state.level:
+                code = state.exception_code
+                result.append(f"{_describe(key)} ({'timeout' if code is None else f'code {code}'})")
+        return result
+
+    def as_dict(self) -> Dict[str, Dict]:
+        """Skipped blocks in a storable form"""
+        return {
+            f"{key[0]}:{key[1]}-{key[2]}": {"level": state.level, "exception_code": state.exception_code}
+            for key, state in self._blocks.items() if state.level
+        }
+
+    def restore(self, data: Dict[str, Dict], now: float) -> None:
+        """Resume skipping blocks learned before a restart (re-probed after their interval)"""
+        for name, stored in data.items():
+            try:
+                key = _parse_key(name)
+                level = max(int(stored.get("level", 0)), 0)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if not level:
+                continue
+            state = self._blocks.setdefault(key, _BlockState())
+            state.failures = FAILURES_TO_SKIP
+            state.level = level
+            state.exception_code = stored.get("exception_code")
+            state.next_probe = now + self._interval(level)
@@ -0,0 +1,125 @@
+"""
+Coalescing queue for holding register writes.
+
+Control entities and the write_register service each write one register.
+Automations that change several settings at once would otherwise send a
+burst of single writes, each with its own connection check. The queue
+collects writes for a short debounce window (the latest value per register
+wins), then flushes them as one batch: adjacent registers are merged into a
+single write-multiple-registers request (function 16) where the profile
+allows it, and only the written registers are read back afterwards.
+
+Function 16 is opt-in: only profiles that set 'supports_write_multiple': True
+merge writes, every other profile gets one function 6 write per register. A
+device that refuses a merged write as an illegal function gets the run as
+single writes instead.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+WRITE_DEBOUNCE = 0.25         # seconds of quiet before a batch is written
+WRITE_MAX_DELAY = 1.0         # seconds a write waits at most, however busy
+MAX_REGISTERS_PER_WRITE = 123 # Modbus limit for function 16
+
+WriteRun = Tuple[int, List[int]]  # (start register, values)
+
+
+def plan_write_runs(writes: Dict[int, int], write_multiple: bool = True,
+                    max_count: int = MAX_REGISTERS_PER_WRITE) -> List[WriteRun]:
+    """Group register writes into runs of consecutive registers"""
+    runs: List[WriteRun] = []
+    for register in sorted(writes):
+        if (write_multiple and runs
+                and runs[-1][0] + len(runs[-1][1]) == register
+                and len(runs[-1][1]) < max_count):
+            runs[-1][1].append(writes[register])
+        else:
+            runs.append((register, [writes[register]]))
+    return runs
+
+
+class WriteQueue:
+    """Debounces register writes and hands them to a flush callback in batches"""
+
+    def __init__(self, flush: Callable[[Dict[int, int]], Awaitable[Dict[int, bool]]],
+                 debounce: float = WRITE_DEBOUNCE, max_delay: float = WRITE_MAX_DELAY):
+        self._flush = flush
+        self._debounce = debounce
+        self._max_delay = max_delay
+        self._pending: Dict[int, int] = {}
+        self._waiters: Dict[int, List[asyncio.Future]] = {}
+        self._first_queued: Optional[float] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()  # Flushes started by the timer, kept until done
+        self._lock = asyncio.Lock()
+        self._closed = False
+
+    async def write(self, register: int, value: int) -> bool:
+        """Queue a write and wait for the batch it ends up in"""
+        if self._closed:
+            logger.error(f"[WRITE] Register {register} not written - shutting down")
+            return False
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if register in self._pending and self._pending[register] != value:
+            logger.debug(f"[WRITE] Register {register}: {self._pending[register]} superseded by {value}")
+        self._pending[register] = value
+        self._waiters.setdefault(register, []).append(future)
+
+        now = loop.time()
+        if self._first_queued is None:
+            self._first_queued = now
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = min(self._debounce, self._first_queued + self._max_delay - now)
+        self._timer = loop.call_later(max(delay, 0.0), self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        """Timer callback - the task is referenced until done, so it cannot be collected mid-write"""
+        self._timer = None
+        task = asyncio.get_running_loop().create_task(self.async_flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def async_flush(self) -> None:
+        """Write everything queued so far (batches never overlap)"""
+        async with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            writes, waiters = self._pending, self._waiters
+            self._pending, self._waiters, self._first_queued = {}, {}, None
+            if not writes:
+                return
+
+            results: Dict[int, bool] = {}
+            try:
+                results = await self._flush(writes)
+            except Exception as err:
+                logger.error(f"[WRITE] Batch write failed: {err}")
+            finally:
+                # Also when cancelled - every waiter gets an answer
+                for register, futures in waiters.items():
+                    for future in futures:
+                        if not future.done():
+                            future.set_result(results.get(register, False))
+
+    async def async_shutdown(self) -> None:
+        """
+        Write what is still queued, then stop: flushes started by the timer are
+        cancelled and later writes are refused.
+        """
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.async_flush()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,300 @@
+"""
+Batch Simulation Engine
+
+Advances many InverterSimulators in one vectorized step, for emulator farms
+and long accelerated runs. The state of all devices (battery SOC, energy
+totals, simulation clock) is kept in NumPy arrays, one row per device, and
+every step applies the same physical model as InverterSimulator.update() -
+PV generation, battery charge/discharge, grid import/export, temperatures,
+voltages, currents and energy totals - to all rows at once. Each device then
+takes over its row (InverterSimulator.load_state) and renders its register
+image from it.
+
+NumPy is optional: without it the farm falls back to updating each simulator
+on its own (NUMPY_AVAILABLE is False).
+"""
+
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+# Simulator attributes kept in arrays and written back every step
+STATE_FIELDS = (
+    'battery_soc',
+    'energy_today', 'energy_total',
+    'battery_charge_today', 'battery_charge_total',
+    'battery_discharge_today', 'battery_discharge_total',
+    'grid_import_energy_today', 'grid_import_energy_total',
+    'energy_to_grid_today', 'energy_to_grid_total',
+    'load_energy_today', 'load_energy_total',
+)
+
+# Reset at (simulated) midnight
+DAILY_FIELDS = tuple(field for field in STATE_FIELDS if field.endswith('_today'))
+
+MAX_BATTERY_POWER = 5000.0   # W, charge and discharge
+SECONDS_PER_DAY = 86400
+
+
+def _value_keys(model) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Voltage and current keys the simulator of a model reports."""
+    string_keys = ('pv1', 'pv2', 'pv3') if model.has_pv3 else ('pv1', 'pv2')
+    battery_keys = ('battery', 'backup') if model.has_battery else ()
+    if model.is_three_phase:
+        ac_keys = ('ac_r', 'ac_s', 'ac_t')
+        voltage_keys = ac_keys + ('ac_rs', 'ac_st', 'ac_tr')
+    else:
+        ac_keys = voltage_keys = ('ac',)
+    return string_keys + voltage_keys + battery_keys, string_keys + ac_keys + battery_keys
+
+
+class BatchSimulator:
+    """Vectorized simulation step for many InverterSimulators."""
+
+    def __init__(self, simulators: Sequence, rng=None):
+        """Initialize batch from the simulators' current state.
+
+        Args:
+            simulators: InverterSimulator instances (any mix of models)
+            rng: numpy.random.Generator for the noise (default: unseeded)
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("Batch simulation requires NumPy")
+
+        self.simulators = list(simulators)
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.size = len(self.simulators)
+        models = [sim.model for sim in self.simulators]
+
+        # Static per-device parameters
+        self.max_power = np.array([model.max_power_kw * 1000 for model in models], dtype=float)
+        self.num_strings = np.array([model.num_pv_strings for model in models], dtype=float)
+        self.has_pv3 = np.array([model.has_pv3 for model in models], dtype=bool)
+        self.has_battery = np.array([model.has_battery for model in models], dtype=bool)
+        self.battery_capacity = np.array([sim.battery_capacity_kwh for sim in self.simulators], dtype=float)
+        self._value_keys = [_value_keys(model) for model in models]
+
+        # Mutable state
+        self.state = {
+            field: np.array([getattr(sim, field) for sim in self.simulators], dtype=float)
+            for field in STATE_FIELDS
+        }
+        self.last_update = np.array([sim.last_update for sim in self.simulators], dtype=float)
+
+        # Simulation clock: seconds since midnight of each device's first simulated day
+        self._midnight = [
+            datetime.combine(sim.simulation_time.date(), datetime.min.time())
+            for sim in self.simulators
+        ]
+        self._clock_offset = np.array([
+            (sim.simulation_time - midnight).total_seconds()
+            for sim, midnight in zip(self.simulators, self._midnight)
+        ])
+        self._start_time = np.array([sim.start_time for sim in self.simulators], dtype=float)
+        self._day = np.array([
+            (sim.last_midnight - midnight.date()).days
+            for sim, midnight in zip(self.simulators, self._midnight)
+        ], dtype=float)
+
+    def _noise(self, low: float, high: float):
+        return self.rng.uniform(low, high, self.size)
+
+    def _controls(self):
+        """User-adjustable parameters of every simulator, as arrays."""
+        sims = self.simulators
+        irradiance = np.array([sim.solar_irradiance for sim in sims], dtype=float)
+        cloud_cover = np.array([sim.cloud_cover for sim in sims], dtype=float)
+        house_load = np.array([sim.house_load for sim in sims], dtype=float)
+        override = np.array([
+            np.nan if sim.battery_override is None else sim.battery_override for sim in sims
+        ], dtype=float)
+        multiplier = np.array([sim.time_multiplier for sim in sims], dtype=float)
+        paused = np.array([sim.paused for sim in sims], dtype=bool)
+        return irradiance, cloud_cover, house_load, override, multiplier, paused
+
+    def _pv_generation(self, hour, irradiance, cloud_cover) -> Dict[str, Any]:
+        """PV power per string (see InverterSimulator._calculate_pv_generation)."""
+        # Sine wave from 6:00 to 18:00
+        daytime = (hour >= 6) & (hour <= 18)
+        sun_elevation = np.where(daytime, np.maximum(0, np.sin((hour - 6) * math.pi / 12)), 0.0)
+
+        effective_irradiance = irradiance * sun_elevation * (1 - cloud_cover * 0.8)
+        effective_irradiance *= self._noise(0.95, 1.05)
+
+        power_per_string = self.max_power / self.num_strings
+        base_power = (effective_irradiance / 1000.0) * power_per_string
+
+        pv1 = base_power * self._noise(0.95, 1.05)
+        pv2 = base_power * self._noise(0.95, 1.05)
+        pv3 = np.where(self.has_pv3, base_power * self._noise(0.95, 1.05), 0.0)
+        total = pv1 + pv2 + pv3
+        return {
+            'pv1': np.maximum(0, pv1),
+            'pv2': np.maximum(0, pv2),
+            'pv3': np.maximum(0, pv3),
+            'total': np.maximum(0, total),
+        }
+
+    def _battery_power(self, pv_total, house_load, override, dt):
+        """Battery power, + charging / - discharging (see _calculate_battery_power)."""
+        soc = self.state['battery_soc']
+
+        # Auto mode: charge from excess PV, discharge when PV < load
+        excess_pv = pv_total - house_load
+        charge = np.where(
+            soc >= 95, 0.0,  # Stop charging near full
+            np.where(soc >= 90,
+                     np.minimum(excess_pv * 0.3, MAX_BATTERY_POWER * 0.5),  # Trickle charge
+                     np.minimum(excess_pv * 0.9, MAX_BATTERY_POWER)),
+        )
+        shortfall = -excess_pv
+        discharge = np.where(
+            soc <= 10, 0.0,  # Stop discharging when low
+            np.where(soc <= 20,
+                     -np.minimum(shortfall * 0.3, MAX_BATTERY_POWER * 0.5),  # Reduce discharge
+                     -np.minimum(shortfall * 0.9, MAX_BATTERY_POWER)),
+        )
+        power = np.where(excess_pv > 0, charge, discharge)
+        power = np.where(np.isnan(override), power, override)
+        power = np.where(self.has_battery, power, 0.0)
+
+        # Update SOC: P(W) * t(s) / 3600 / 1000 = kWh
+        energy_kwh = (power * dt) / (3600 * 1000)
+        soc_change = np.divide(energy_kwh, self.battery_capacity,
+                               out=np.zeros(self.size), where=self.has_battery) * 100
+        self.state['battery_soc'] = np.where(
+            self.has_battery & (dt > 0), np.clip(soc + soc_change, 5, 100), soc
+        )
+        return power
+
+    def _update_energy_totals(self, pv_total, battery_power, grid_import, grid_export, house_load, dt) -> None:
+        """Integrate energy counters (see _update_energy_totals)."""
+        factor = np.where(dt > 0, dt / 3600000.0, 0.0)
+        state = self.state
+
+        def add(today: str, total: str, power) -> None:
+            energy = power * factor
+            state[today] += energy
+            state[total] += energy
+
+        add('energy_today', 'energy_total', pv_total)
+        add('battery_charge_today', 'battery_charge_total', np.maximum(battery_power, 0))
+        add('battery_discharge_today', 'battery_discharge_total', np.maximum(-battery_power, 0))
+        add('grid_import_energy_today', 'grid_import_energy_total', grid_import)
+        add('energy_to_grid_today', 'energy_to_grid_total', grid_export)
+        add('load_energy_today', 'load_energy_total', house_load)
+
+    def step(self, now: Optional[float] = None) -> None:
+        """Advance every simulator to now (time.time() by default) and publish the results."""
+        if now is None:
+            now = time.time()
+        irradiance, cloud_cover, house_load, override, multiplier, paused = self._controls()
+        active = ~paused
+
+        dt = np.where(active, (now - self.last_update) * multiplier, 0.0)
+        seconds = self._clock_offset + (now - self._start_time) * multiplier
+
+        # Midnight reset
+        day = np.floor_divide(seconds, SECONDS_PER_DAY)
+        new_day = active & (day > self._day)
+        if new_day.any():
+            for field in DAILY_FIELDS:
+                self.state[field][new_day] = 0.0
+            self._day = np.where(new_day, day, self._day)
+
+        # Hour of day with minute resolution
+        hour = np.floor(np.mod(seconds, SECONDS_PER_DAY) / 60) / 60
+
+        pv = self._pv_generation(hour, irradiance, cloud_cover)
+        battery_power = self._battery_power(pv['total'], house_load, override, dt)
+
+        # Grid: net power negative = export, positive = import
+        net_power = house_load - (pv['total'] - battery_power)
+        grid_import = np.maximum(net_power, 0)
+        grid_export = np.maximum(-net_power, 0)
+
+        ac_power = pv['total'] + battery_power
+
+        # Temperatures: up to 30°C rise at full load
+        inverter_temp = 25.0 + (ac_power / self.max_power) * 30.0 + self._noise(-2, 2)
+        temperatures = {
+            'inverter': np.round(inverter_temp, 1),
+            'ipm': np.round(inverter_temp + self._noise(3, 7), 1),
+            'boost': np.round(inverter_temp + self._noise(2, 5), 1),
+        }
+
+        soc = self.state['battery_soc']
+        voltages = {
+            'pv1': 380.0 + self._noise(-10, 10),
+            'pv2': 380.0 + self._noise(-10, 10),
+            'pv3': 380.0 + self._noise(-10, 10),
+            'ac': 240.0 + self._noise(-5, 5),
+            'ac_r': 230.0 + self._noise(-5, 5),
+            'ac_s': 230.0 + self._noise(-5, 5),
+            'ac_t': 230.0 + self._noise(-5, 5),
+            'ac_rs': 400.0 + self._noise(-8, 8),
+            'ac_st': 400.0 + self._noise(-8, 8),
+            'ac_tr': 400.0 + self._noise(-8, 8),
+            'battery': 48.0 + (soc - 50) * 0.12 + self._noise(-0.5, 0.5),
+            'backup': 240.0 + self._noise(-3, 3),
+        }
+        currents = {
+            'pv1': pv['pv1'] / voltages['pv1'],
+            'pv2': pv['pv2'] / voltages['pv2'],
+            'pv3': pv['pv3'] / voltages['pv3'],
+            'ac': ac_power / voltages['ac'],
+            'ac_r': ac_power / 3 / voltages['ac_r'],
+            'ac_s': ac_power / 3 / voltages['ac_s'],
+            'ac_t': ac_power / 3 / voltages['ac_t'],
+            'battery': battery_power / voltages['battery'],
+            'backup': house_load / voltages['backup'],
+        }
+
+        self._update_energy_totals(pv['total'], battery_power, grid_import, grid_export, house_load, dt)
+        self.last_update = np.where(active, now, self.last_update)
+
+        status = np.where(pv['total'] < 50, 0, np.where(pv['total'] < 100, 5, 1))
+        self._publish(now, active, seconds, pv, battery_power, net_power, grid_import, grid_export,
+                      ac_power, temperatures, voltages, currents, status)
+
+    def _publish(self, now, active, seconds, pv, battery_power, net_power, grid_import, grid_export,
+                 ac_power, temperatures, voltages, currents, status) -> None:
+        """Hand each simulator its row and let it render its registers."""
+        def rows(arrays: Dict[str, Any]) -> Dict[str, list]:
+            return {key: values.tolist() for key, values in arrays.items()}
+
+        pv, temperatures, voltages, currents = rows(pv), rows(temperatures), rows(voltages), rows(currents)
+        state = rows(self.state)
+        battery_power, grid, grid_import, grid_export = (
+            battery_power.tolist(), (-net_power).tolist(), grid_import.tolist(), grid_export.tolist()
+        )
+        ac_power, status, seconds, days = ac_power.tolist(), status.tolist(), seconds.tolist(), self._day.tolist()
+
+        for i, sim in enumerate(self.simulators):
+            if not active[i]:
+                sim.update()   # Paused: only re-renders the registers
+                continue
+            voltage_keys, current_keys = self._value_keys[i]
+            midnight = self._midnight[i]
+            values = {
+                'pv_power': {key: pv[key][i] for key in ('pv1', 'pv2', 'pv3', 'total')},
+                'battery_power': battery_power[i],
+                'grid_power': {'grid': grid[i], 'import': grid_import[i], 'export': grid_export[i]},
+                'ac_power': ac_power[i],
+                'temperatures': {key: temperatures[key][i] for key in ('inverter', 'ipm', 'boost')},
+                'voltages': {key: voltages[key][i] for key in voltage_keys},
+                'currents': {key: currents[key][i] for key in current_keys},
+                'sim_time': midnight + timedelta(seconds=seconds[i]),
+                'status': status[i],
+            }
+            row = {field: state[field][i] for field in STATE_FIELDS}
+            row['last_midnight'] = (midnight + timedelta(days=days[i])).date()
+            sim.load_state(row, values, now)
@@ -0,0 +1,211 @@
+"""
+Emulator Farm
+
+Runs many simulated inverters in one process, for load-testing fleet setups
+(many slave IDs behind one gateway, or many gateways). Devices are declared
+in a JSON config file; every port gets one Modbus TCP server whose context
+holds all slave IDs on that port, and all servers plus the simulation step
+share a single asyncio loop. With NumPy installed, all devices advance in one
+vectorized step (see batch.py).
+
+Config format:
+
+    {
+        "host": "0.0.0.0",
+        "update_interval": 2.0,
+        "devices": [
+            {"port": 5020, "slave_id": 1, "model": "min_7000_10000_tl_x"},
+            {"port": 5020, "slave_id": 2, "model": "sph_3000_6000", "house_load": 3500},
+            {"port": 5021, "slave_id": 1, "count": 50, "model": "mod_6000_15000tl3_xh"}
+        ]
+    }
+
+"count" declares that many devices with consecutive slave IDs starting at
+"slave_id". Optional per-device settings: solar_irradiance, cloud_cover,
+house_load, battery_override, time_multiplier.
+"""
+
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .batch import BatchSimulator, NUMPY_AVAILABLE
+from .models import InverterModel, INVERTER_PROFILES
+from .simulator import InverterSimulator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FARM_HOST = "0.0.0.0"
+DEFAULT_FARM_UPDATE_INTERVAL = 2.0  # seconds, same as the single-device server
+
+MAX_SLAVE_ID = 247
+
+# Per-device settings and the simulator setter applying each
+DEVICE_SETTINGS = {
+    'solar_irradiance': 'set_irradiance',
+    'cloud_cover': 'set_cloud_cover',
+    'house_load': 'set_house_load',
+    'battery_override': 'set_battery_override',
+    'time_multiplier': 'set_time_multiplier',
+}
+
+
+@dataclass
+class FarmDevice:
+    """One emulated inverter of the farm."""
+    port: int
+    slave_id: int
+    model: str
+    settings: Dict[str, Any]
+    simulator: Optional[InverterSimulator] = None
+
+
+def parse_farm_config(config: Dict[str, Any]) -> List[FarmDevice]:
+    """Expand and validate the device declarations of a farm config.
+
+    Args:
+        config: Parsed config file
+
+    Returns:
+        One FarmDevice per emulated inverter
+
+    Raises:
+        ValueError: Invalid declaration (unknown model, bad or duplicate slave ID)
+    """
+    devices = []
+    seen = set()
+    for index, entry in enumerate(config.get('devices', [])):
+        model = entry.get('model')
+        if model not in INVERTER_PROFILES:
+            raise ValueError(f"Device {index}: unknown model {model!r}")
+        port = int(entry.get('port', 502))
+        first = int(entry.get('slave_id', 1))
+        count = int(entry.get('count', 1))
+        unknown = set(entry) - set(DEVICE_SETTINGS) - {'model', 'port', 'slave_id', 'count'}
+        if unknown:
+            raise ValueError(f"Device {index}: unknown settings {sorted(unknown)}")
+        settings = {key: entry[key] for key in DEVICE_SETTINGS if key in entry}
+
+        for slave_id in range(first, first + count):
+            if not 1 <= slave_id <= MAX_SLAVE_ID:
+                raise ValueError(f"Device {index}: slave ID {slave_id} outside 1-{MAX_SLAVE_ID}")
+            if (port, slave_id) in seen:
+                raise ValueError(f"Device {index}: slave ID {slave_id} on port {port} declared twice")
+            seen.add((port, slave_id))
+            devices.append(FarmDevice(port, slave_id, model, settings))
+
+    if not devices:
+        raise ValueError("Farm config declares no devices")
+    return devices
+
+
+def load_farm_config(path: str) -> Dict[str, Any]:
+    """Read a farm config file (JSON)."""
+    with open(path, encoding='utf-8') as config_file:
+        return json.load(config_file)
+
+
+class EmulatorFarm:
+    """Many simulated inverters served from one asyncio loop."""
+
+    def __init__(self, config: Dict[str, Any]):
+        """Initialize farm.
+
+        Args:
+            config: Farm config (see module docstring)
+        """
+        self.host = config.get('host', DEFAULT_FARM_HOST)
+        self.update_interval = float(config.get('update_interval', DEFAULT_FARM_UPDATE_INTERVAL))
+        self.devices = parse_farm_config(config)
+        self.servers = []
+        self.running = False
+        self._stopped: Optional[asyncio.Event] = None
+
+        # Simulators share their model (and compiled register layout) per profile
+        models: Dict[str, InverterModel] = {}
+        for device in self.devices:
+            model = models.get(device.model)
+            if model is None:
+                model = models[device.model] = InverterModel(device.model)
+            device.simulator = InverterSimulator(model, device.port)
+            for key, value in device.settings.items():
+                getattr(device.simulator, DEVICE_SETTINGS[key])(value)
+
+        # One vectorized step for all devices if NumPy is available
+        self.batch = BatchSimulator([device.simulator for device in self.devices]) if NUMPY_AVAILABLE else None
+
+        logger.info(f"Farm: {len(self.devices)} devices on ports {self.ports} "
+                    f"({'batch' if self.batch is not None else 'per-device'} simulation)")
+
+    @property
+    def ports(self) -> List[int]:
+        """Ports the farm listens on."""
+        return sorted({device.port for device in self.devices})
+
+    def devices_on(self, port: int) -> List[FarmDevice]:
+        """Devices served on a port."""
+        return [device for device in self.devices if device.port == port]
+
+    def step(self) -> None:
+        """Advance every simulator by one update."""
+        if self.batch is not None:
+            self.batch.step()
+            return
+        for device in self.devices:
+            device.simulator.update()
+
+    async def _update_loop(self) -> None:
+        """Step the simulation every update_interval seconds."""
+        loop = asyncio.get_running_loop()
+        while self.running:
+            started = loop.time()
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Farm simulation step error: {e}")
+            elapsed = loop.time() - started
+            if elapsed > self.update_interval:
+                logger.warning(f"Farm step took {elapsed:.2f}s, longer than the {self.update_interval}s interval")
+            await asyncio.sleep(max(0.0, self.update_interval - elapsed))
+
+    async def run(self) -> None:
+        """Serve all devices until stop() is called or the task is cancelled."""
+        from pymodbus.server import ModbusTcpServer
+        from pymodbus.datastore import ModbusServerContext
+        from .modbus_server import create_device_context
+
+        self.running = True
+        self._stopped = asyncio.Event()
+        for port in self.ports:
+            context = ModbusServerContext(
+                devices={
+                    device.slave_id: create_device_context(device.simulator)
+                    for device in self.devices_on(port)
+                },
+                single=False
+            )
+            self.servers.append(ModbusTcpServer(context, address=(self.host, port)))
+
+        tasks = [asyncio.create_task(server.serve_forever()) for server in self.servers]
+        tasks.append(asyncio.create_task(self._update_loop()))
+        stopped = asyncio.create_task(self._stopped.wait())
+        try:
+            done, _pending = await asyncio.wait(tasks + [stopped], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not stopped and task.exception() is not None:
+                    raise task.exception()
+        finally:
+            self.running = False
+            for task in tasks + [stopped]:
+                task.cancel()
+            for server in self.servers:
+                await server.shutdown()
+            self.servers = []
+
+    def stop(self) -> None:
+        """Stop the farm (call from the farm's event loop)."""
+        self.running = False
+        if self._stopped is not None:
+            self._stopped.set()
@@ -18,7 +18,7 @@ class GrowattDataBlock(ModbusSparseDataBlock):
     """
     Custom Modbus data block for pymodbus 3.x.
 
-    Directly fetches values from the simulator on each read request,
+    Reads values from the simulator's register image on each read request,
     avoiding internal storage issues and addressing offsets.
     """
 
@@ -34,7 +34,7 @@ class GrowattDataBlock(ModbusSparseDataBlock):
         super().__init__({0: 0})
         self.simulator = simulator
         self.register_type = register_type
-        logger.info(f"GrowattDataBlock initialized: type={register_type}")
+        logger.debug(f"GrowattDataBlock initialized: type={register_type}")
 
     def getValues(self, address, count=1):
         """Get register values from simulator.
@@ -49,24 +49,10 @@ class GrowattDataBlock(ModbusSparseDataBlock):
             count: Number of registers to read
 
         Returns:
-            List of register values
+            List of register values (a slice of the simulator's register image)
         """
-        values = []
-        for i in range(count):
-            # Compensate for pymodbus 3.x adding 1 to addresses
-            addr = (address - 1) + i
-            value = self.simulator.get_register_value(self.register_type, addr)
-            if value is None:
-                value = 0  # Default for unmapped registers
-            values.append(value)
-
-        # Debug logging for key registers (can be disabled in production)
-        # if address >= 38 and address <= 50:
-        #     logger.debug(f"getValues({self.register_type}, address={address}, count={count}) compensated to {address-1}-{address-1+count-1} -> {values}")
-        # elif address >= 1010 and address <= 1064:
-        #     logger.debug(f"getValues({self.register_type}, address={address}, count={count}) compensated to {address-1}-{address-1+count-1} -> {values}")
-
-        return values
+        # Compensate for pymodbus 3.x adding 1 to addresses
+        return self.simulator.get_registers(self.register_type, address - 1, count)
 
     def setValues(self, address, values):
         """Set register values (for holding registers).
@@ -94,6 +80,23 @@ class GrowattDataBlock(ModbusSparseDataBlock):
         return True
 
 
+def create_device_context(simulator) -> ModbusDeviceContext:
+    """Build a Modbus device context that serves one simulator's registers.
+
+    Args:
+        simulator: InverterSimulator instance
+
+    Returns:
+        ModbusDeviceContext backed by GrowattDataBlocks
+    """
+    return ModbusDeviceContext(
+        di=GrowattDataBlock(simulator, 'discrete'),  # Discrete Inputs (not used)
+        co=GrowattDataBlock(simulator, 'coil'),      # Coils (not used)
+        hr=GrowattDataBlock(simulator, 'holding'),   # Holding Registers
+        ir=GrowattDataBlock(simulator, 'input')      # Input Registers
+    )
+
+
 class ModbusEmulatorServer:
     """Modbus TCP server for inverter emulation."""
 
@@ -113,25 +116,9 @@ class ModbusEmulatorServer:
         self.server_instance = None
         self.running = False
 
-        # Create custom data blocks that fetch directly from simulator
-        input_block = GrowattDataBlock(simulator, 'input')
-        holding_block = GrowattDataBlock(simulator, 'holding')
-
-        # Create empty blocks for discrete inputs and coils (not used)
-        discrete_block = GrowattDataBlock(simulator, 'discrete')
-        coil_block = GrowattDataBlock(simulator, 'coil')
-
-        # Create device context with our custom blocks
-        device_context = ModbusDeviceContext(
-            di=discrete_block,   # Discrete Inputs
-            co=coil_block,       # Coils
-            hr=holding_block,    # Holding Registers
-            ir=input_block       # Input Registers
-        )
-
-        # Create server context
+        # Create server context with a device backed by the simulator
         self.server_context = ModbusServerContext(
-            devices={slave_id: device_context},
+            devices={slave_id: create_device_context(simulator)},
             single=False
         )
 
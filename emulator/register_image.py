@@ -0,0 +1,487 @@
+"""
+Compiled Register Image
+
+Maps a profile's register definitions to simulated values once, instead of
+running the name-matching dispatch on every Modbus read.
+
+For each register the same rules the simulator always used (see
+compile_register) pick a value function when the layout is built - once per
+profile and register type, shared by every simulator of that profile. The
+simulator then renders all registers into a flat uint16 array once per
+update(), and a Modbus read is a slice of that array.
+
+Defined addresses are packed into segments: runs of registers whose gaps are
+at most SEGMENT_GAP apart share one contiguous stretch of the array, so the
+image stays small even for profiles that use addresses 0-125 and 31000+.
+Undefined addresses read as 0.
+
+Modbus requests are served from server threads while update() renders, so
+RegisterImage double-buffers: a new version is rendered into the buffer that
+is not published, then published by swapping one reference. Each buffer
+carries a sequence number (odd while it is being written); a read copies its
+registers from one buffer and retries if that buffer was reused meanwhile, so
+a request never mixes two versions - 32-bit pairs in particular.
+"""
+
+import logging
+import time
+from array import array
+from bisect import bisect_right
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Registers further apart than this start a new segment
+SEGMENT_GAP = 64
+
+# DTC (Device Type Code) holding register, answered for every profile
+DTC_REGISTER = 30000
+
+ValueFunction = Callable[[Any], int]   # simulator -> raw register value
+
+
+# ---------------------------------------------------------------------------
+# Value functions
+# ---------------------------------------------------------------------------
+
+def _to_signed_16bit(value: int) -> int:
+    """Convert to signed 16-bit integer (two's complement)."""
+    if value < 0:
+        return (1 << 16) + value
+    return value & 0xFFFF
+
+
+def _scaled(source: Callable[[Any], float], scale: float) -> ValueFunction:
+    return lambda sim: round(source(sim) / scale)
+
+
+def _scaled_abs(source: Callable[[Any], float], scale: float) -> ValueFunction:
+    return lambda sim: round(abs(source(sim)) / scale)
+
+
+def _scaled_signed(source: Callable[[Any], float], scale: float) -> ValueFunction:
+    return lambda sim: _to_signed_16bit(round(source(sim) / scale))
+
+
+def _word32(source: Callable[[Any], float], scale: float, high: bool,
+            rounding: Callable[[float], int] = int) -> ValueFunction:
+    """One half of a 32-bit value (negative values as two's complement)."""
+    if high:
+        return lambda sim: (rounding(source(sim) / scale) >> 16) & 0xFFFF
+    return lambda sim: rounding(source(sim) / scale) & 0xFFFF
+
+
+def _pair_word(source: Callable[[Any], float], reg_name: str,
+               reg_def: Dict[str, Any]) -> Optional[ValueFunction]:
+    """_high/_low half of a 32-bit pair, None for registers that are neither."""
+    combined_scale = reg_def.get('combined_scale', 0.1)
+    if '_high' in reg_name:
+        return _word32(source, combined_scale, True)
+    if '_low' in reg_name:
+        return _word32(source, combined_scale, False)
+    return None
+
+
+def _energy_word(reg_name: str, reg_def: Dict[str, Any],
+                 today: str, total: str) -> Optional[ValueFunction]:
+    """Half of a today/total energy counter pair."""
+    if 'today' in reg_name:
+        return _pair_word(lambda sim: getattr(sim, today), reg_name, reg_def)
+    if 'total' in reg_name:
+        return _pair_word(lambda sim: getattr(sim, total), reg_name, reg_def)
+    return None
+
+
+def _voltage(key: str):
+    return lambda sim: sim.values['voltages'][key]
+
+
+def _current(key: str):
+    return lambda sim: sim.values['currents'][key]
+
+
+def _pv_power(key: str):
+    return lambda sim: sim.values['pv_power'][key]
+
+
+def _ac_power(sim) -> float:
+    return sim.values['ac_power']
+
+
+def _phase_power(sim) -> float:
+    return sim.values['ac_power'] / 3  # Distribute across phases
+
+
+def _battery_power(sim) -> float:
+    return sim.values['battery_power']
+
+
+def _battery2_power(sim) -> float:
+    return sim.values['battery_power'] * 0.5  # Battery 2 runs at ~50% of battery 1
+
+
+def _battery2_voltage(sim) -> float:
+    return 48.0 + (sim.battery2_soc - 50) * 0.12
+
+
+def _battery2_current(sim) -> float:
+    voltage = _battery2_voltage(sim)
+    return _battery2_power(sim) / voltage if voltage > 0 else 0
+
+
+def _only_battery2(value: ValueFunction) -> ValueFunction:
+    """Value if battery 2 is present, 0 otherwise (detection via voltage)."""
+    return lambda sim: value(sim) if sim.has_battery2 else 0
+
+
+def _self_consumption(sim) -> float:
+    """Load minus grid import."""
+    return sim.house_load - sim.values['grid_power']['import']
+
+
+def _self_consumption_percentage(sim) -> int:
+    if sim.house_load > 0:
+        percentage = (max(0, _self_consumption(sim)) / sim.house_load) * 100
+        return round(min(100, percentage))
+    return 0
+
+
+def compile_register(reg_name: str, reg_def: Dict[str, Any], model, dtc: Optional[int]):
+    """Value of a register: a constant int, a ValueFunction, or None (reads as 0).
+
+    The rules are matched in order, by exact name or substring, against the
+    register name (or the V1.39 name a V2.01 register maps_to).
+    """
+    scale = reg_def.get('scale', 1)
+    is_signed = reg_def.get('signed', False)
+    has_pv3 = model.has_pv3
+    has_battery = model.has_battery
+
+    # maps_to lets V2.01 registers (e.g. pv1_voltage_vpp) return the same value as V1.39 (pv1_voltage)
+    maps_to = reg_def.get('maps_to')
+    if maps_to:
+        base_name = maps_to
+        if '_high' in reg_name:
+            base_name = maps_to + '_high' if '_high' not in maps_to else maps_to
+        elif '_low' in reg_name:
+            base_name = maps_to + '_low' if '_low' not in maps_to else maps_to
+        reg_name = base_name
+
+    # Status
+    if 'status' in reg_name:
+        return lambda sim: sim._get_status()
+
+    # PV values
+    elif reg_name in ('pv1_voltage', 'pv2_voltage') or (reg_name == 'pv3_voltage' and has_pv3):
+        return _scaled(_voltage(reg_name[:3]), scale)
+    elif reg_name in ('pv1_current', 'pv2_current') or (reg_name == 'pv3_current' and has_pv3):
+        return _scaled(_current(reg_name[:3]), scale)
+
+    # PV power (32-bit pairs)
+    for string in ('pv1', 'pv2', 'pv3'):
+        if string == 'pv3' and not has_pv3:
+            continue
+        if f'{string}_power_high' in reg_name or f'{string}_power_low' in reg_name:
+            return _pair_word(_pv_power(string), reg_name, reg_def)
+    if 'pv_total_power_high' in reg_name or 'pv_total_power_low' in reg_name:
+        return _pair_word(_pv_power('total'), reg_name, reg_def)
+
+    # AC values
+    if reg_name == 'ac_voltage':
+        return _scaled(_voltage('ac'), scale)
+    elif reg_name == 'ac_current':
+        return _scaled(_current('ac'), scale)
+    elif reg_name == 'ac_frequency':
+        return round(50.0 / scale)  # 50 Hz
+    elif 'ac_power_high' in reg_name or 'ac_power_low' in reg_name:
+        return _pair_word(_ac_power, reg_name, reg_def)
+
+    # Three-phase AC
+    elif reg_name in ('ac_voltage_r', 'ac_voltage_s', 'ac_voltage_t'):
+        return _scaled(_voltage(f"ac_{reg_name.split('_')[-1]}"), scale)
+    elif reg_name in ('ac_current_r', 'ac_current_s', 'ac_current_t'):
+        return _scaled(_current(f"ac_{reg_name.split('_')[-1]}"), scale)
+    elif reg_name in ('ac_power_r', 'ac_power_s', 'ac_power_t'):
+        return _scaled(_phase_power, scale)
+    elif reg_name in ('ac_power_r_high', 'ac_power_s_high', 'ac_power_t_high',
+                      'ac_power_r_low', 'ac_power_s_low', 'ac_power_t_low'):
+        return _pair_word(_phase_power, reg_name, reg_def)
+    elif reg_name in ('ac_voltage_rs', 'ac_voltage_st', 'ac_voltage_tr'):
+        return _scaled(_voltage(f"ac_{reg_name.split('_')[-1]}"), scale)
+
+    # Battery
+    elif reg_name == 'battery_voltage' and has_battery:
+        return _scaled(_voltage('battery'), scale)
+    elif reg_name == 'battery_current' and has_battery:
+        if is_signed:
+            return _scaled_signed(_current('battery'), scale)
+        return _scaled_abs(_current('battery'), scale)
+    elif reg_name == 'battery_current_legacy' and has_battery:
+        return _scaled_signed(_current('battery'), scale)
+    elif reg_name in ('battery_current_high', 'battery_current_low') and has_battery:
+        # 32-bit signed battery current
+        combined_scale = reg_def.get('combined_scale', scale) if reg_def.get('pair') else scale
+        return _word32(_current('battery'), combined_scale, 'high' in reg_name, rounding=round)
+    elif reg_name == 'battery_power' and has_battery:
+        if is_signed:
+            return _scaled_signed(_battery_power, scale)
+        return _scaled_abs(_battery_power, scale)
+    elif reg_name == 'battery_soc' and has_battery:
+        return lambda sim: round(sim.battery_soc)
+    elif reg_name == 'battery_temp' and has_battery:
+        return round(30.0 / scale)  # Fixed battery temp
+
+    # Battery 2 (returns 0 if no battery 2, enabling detection via voltage)
+    elif 'battery2_voltage' in reg_name:
+        return _only_battery2(_scaled(_battery2_voltage, scale))
+    elif 'battery2_soc' in reg_name:
+        return _only_battery2(lambda sim: round(sim.battery2_soc))
+    elif 'battery2_soh' in reg_name:
+        return _only_battery2(lambda sim: 95)
+    elif 'battery2_temp' in reg_name:
+        return _only_battery2(lambda sim: round(28.0 / scale))
+    elif 'battery2_power_high' in reg_name or 'battery2_power_low' in reg_name:
+        return _only_battery2(_pair_word(_battery2_power, reg_name, reg_def))
+    elif 'battery2_charge_energy_today' in reg_name:
+        return _pair_word(lambda sim: sim.battery2_charge_today, reg_name, reg_def)
+    elif 'battery2_discharge_energy_today' in reg_name:
+        return _pair_word(lambda sim: sim.battery2_discharge_today, reg_name, reg_def)
+    elif 'battery2_charge_energy_total' in reg_name:
+        return _pair_word(lambda sim: sim.battery2_charge_total, reg_name, reg_def)
+    elif 'battery2_discharge_energy_total' in reg_name:
+        return _pair_word(lambda sim: sim.battery2_discharge_total, reg_name, reg_def)
+    elif 'battery2_current' in reg_name:
+        word = _pair_word(_battery2_current, reg_name, reg_def)
+        return _only_battery2(word) if word is not None else 0
+
+    # Temperatures
+    elif reg_name in ('inverter_temp', 'ipm_temp', 'boost_temp'):
+        key = reg_name[:-len('_temp')]
+        return _scaled(lambda sim: sim.values['temperatures'][key], scale)
+
+    # Energy (32-bit pairs) - load_energy is handled separately
+    elif 'load_energy' not in reg_name and ('energy_today_high' in reg_name or 'energy_today_low' in reg_name):
+        return _pair_word(lambda sim: sim.energy_today, reg_name, reg_def)
+    elif 'load_energy' not in reg_name and ('energy_total_high' in reg_name or 'energy_total_low' in reg_name):
+        return _pair_word(lambda sim: sim.energy_total, reg_name, reg_def)
+
+    # Grid/load power
+    elif 'grid_power' in reg_name or 'power_to_grid' in reg_name:
+        word = _pair_word(lambda sim: sim.values['grid_power']['export'], reg_name, reg_def)
+        if word is not None:
+            return word
+        # Single register
+        grid = lambda sim: sim.values['grid_power']['grid']
+        return _scaled_signed(grid, scale) if is_signed else _scaled_abs(grid, scale)
+    elif 'load_power' in reg_name or 'power_to_load' in reg_name:
+        word = _pair_word(lambda sim: sim.house_load, reg_name, reg_def)
+        return word if word is not None else _scaled(lambda sim: sim.house_load, scale)
+
+    # Battery charge/discharge power (SPH TL3 specific)
+    elif reg_name in ('discharge_power_high', 'discharge_power_low') and has_battery:
+        return _pair_word(lambda sim: abs(min(0, sim.values['battery_power'])), reg_name, reg_def)
+    elif reg_name in ('charge_power_high', 'charge_power_low') and has_battery:
+        return _pair_word(lambda sim: max(0, sim.values['battery_power']), reg_name, reg_def)
+
+    # Battery power (MOD series - signed 32-bit at register 31126)
+    elif reg_name in ('battery_power_high', 'battery_power_low') and has_battery:
+        return _pair_word(_battery_power, reg_name, reg_def)
+
+    # Power flow (SPH TL3 specific) - PV minus battery charge
+    elif 'power_to_user' in reg_name:
+        return _pair_word(
+            lambda sim: sim.values['pv_power']['total'] - max(0, sim.values['battery_power']),
+            reg_name, reg_def,
+        )
+
+    # Self consumption (SPH TL3 specific)
+    elif 'self_consumption_power' in reg_name:
+        return _pair_word(lambda sim: max(0, _self_consumption(sim)), reg_name, reg_def)
+    elif reg_name == 'self_consumption_percentage':
+        return _self_consumption_percentage
+
+    # Energy to user/grid (SPH TL3 specific) - energy to user is the PV generation for now
+    elif 'energy_to_user' in reg_name:
+        return _energy_word(reg_name, reg_def, 'energy_today', 'energy_total')
+    elif 'energy_to_grid' in reg_name:
+        return _energy_word(reg_name, reg_def, 'energy_to_grid_today', 'energy_to_grid_total')
+
+    # Battery energy (SPH TL3: discharge_energy/charge_energy, MOD: battery_discharge/battery_charge)
+    elif ('discharge_energy' in reg_name or 'battery_discharge' in reg_name) and has_battery:
+        return _energy_word(reg_name, reg_def, 'battery_discharge_today', 'battery_discharge_total')
+    elif ('charge_energy' in reg_name or 'battery_charge' in reg_name) and has_battery:
+        return _energy_word(reg_name, reg_def, 'battery_charge_today', 'battery_charge_total')
+
+    # Load energy (SPH TL3 specific)
+    elif 'load_energy' in reg_name:
+        return _energy_word(reg_name, reg_def, 'load_energy_today', 'load_energy_total')
+
+    # System work mode / battery type
+    elif reg_name == 'system_work_mode':
+        return 1  # 1 = Normal operation
+    elif reg_name == 'battery_type':
+        return 1  # 1 = Li-ion
+
+    # Backup output
+    elif reg_name == 'backup_voltage':
+        return _scaled(lambda sim: sim.values['voltages'].get('backup', 240.0), scale)
+    elif reg_name == 'backup_current':
+        return _scaled(lambda sim: sim.values['currents'].get('backup', 0), scale)
+    elif reg_name == 'backup_power':
+        return _scaled(lambda sim: sim.house_load, scale)
+    elif reg_name == 'backup_frequency':
+        return round(50.0 / scale)
+
+    # Device identification (holding registers)
+    elif reg_name == 'dtc_code' and dtc is not None:
+        return dtc
+
+    # Default - the register definition's default value
+    default_value = reg_def.get('default')
+    if default_value is not None:
+        return default_value
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Layout
+# ---------------------------------------------------------------------------
+
+class RegisterLayout:
+    """Where each register of one profile and register type lives in the image."""
+
+    def __init__(self, registers: Dict[int, Dict[str, Any]], model, dtc: Optional[int],
+                 include_dtc: bool = False):
+        self.addresses = frozenset(registers)
+        addresses = sorted(self.addresses | ({DTC_REGISTER} if include_dtc else set()))
+
+        # Pack addresses into segments (start, end exclusive, offset into the image)
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.offsets: List[int] = []
+        size = 0
+        for address in addresses:
+            if self.ends and address - self.ends[-1] < SEGMENT_GAP:
+                size += address + 1 - self.ends[-1]
+                self.ends[-1] = address + 1
+            else:
+                self.starts.append(address)
+                self.ends.append(address + 1)
+                self.offsets.append(size)
+                size += 1
+        self.size = size
+
+        # Constants go into the template once, value functions run every render
+        self.template = array('H', bytes(2 * size))
+        self.dynamic: List[Tuple[int, int, ValueFunction]] = []
+        for address, reg_def in registers.items():
+            value = compile_register(reg_def['name'], reg_def, model, dtc)
+            if callable(value):
+                self.dynamic.append((self.offset(address), address, value))
+            elif value is not None:
+                self.template[self.offset(address)] = int(value) & 0xFFFF
+
+        # DTC code (register 30000) for every profile, including non-V2.01 ones
+        if include_dtc:
+            if dtc is None:
+                reg_def = registers.get(DTC_REGISTER)
+                dtc = reg_def.get('default', 0) if reg_def else 0
+            self.dynamic = [entry for entry in self.dynamic if entry[1] != DTC_REGISTER]
+            self.template[self.offset(DTC_REGISTER)] = dtc & 0xFFFF
+
+    def offset(self, address: int) -> Optional[int]:
+        """Index of an address in the image (None outside every segment)."""
+        index = bisect_right(self.starts, address) - 1
+        if index < 0 or address >= self.ends[index]:
+            return None
+        return self.offsets[index] + address - self.starts[index]
+
+    def render(self, image: array, simulator) -> None:
+        """Recompute every non-constant register into image."""
+        for offset, address, value in self.dynamic:
+            try:
+                image[offset] = value(simulator) & 0xFFFF
+            except (KeyError, ZeroDivisionError):
+                # Value not simulated for this model (e.g. single-phase voltage on 3-phase)
+                image[offset] = 0
+
+    def read(self, image: array, address: int, count: int) -> List[int]:
+        """count register values starting at address (0 where undefined)."""
+        index = bisect_right(self.starts, address) - 1
+        if index >= 0 and address + count <= self.ends[index]:
+            offset = self.offsets[index] + address - self.starts[index]
+            return image[offset:offset + count].tolist()
+        # Read crosses segment boundaries
+        values = []
+        for register in range(address, address + count):
+            offset = self.offset(register)
+            values.append(image[offset] if offset is not None else 0)
+        return values
+
+
+class RegisterSnapshot:
+    """One buffer of rendered register images."""
+
+    __slots__ = ('images', 'sequence', 'version')
+
+    def __init__(self, layouts: Dict[str, RegisterLayout]):
+        self.images = {register_type: array('H', layout.template) for register_type, layout in layouts.items()}
+        self.sequence = 0   # Odd while being rendered
+        self.version = 0    # Update that rendered it
+
+
+class RegisterImage:
+    """Double-buffered, versioned register images of one simulator."""
+
+    def __init__(self, layouts: Dict[str, RegisterLayout]):
+        self.layouts = layouts
+        self._buffers = (RegisterSnapshot(layouts), RegisterSnapshot(layouts))
+        self._current = self._buffers[0]
+
+    @property
+    def version(self) -> int:
+        """Version of the published images."""
+        return self._current.version
+
+    def publish(self, simulator) -> None:
+        """Render a new version from the simulator and publish it (one writer at a time)."""
+        current = self._current
+        back = self._buffers[1] if current is self._buffers[0] else self._buffers[0]
+        back.sequence += 1
+        for register_type, layout in self.layouts.items():
+            layout.render(back.images[register_type], simulator)
+        back.version = current.version + 1
+        back.sequence += 1
+        self._current = back
+
+    def read(self, register_type: str, address: int, count: int) -> List[int]:
+        """count registers from one published version."""
+        layout = self.layouts[register_type]
+        while True:
+            snapshot = self._current
+            sequence = snapshot.sequence
+            if sequence & 1:
+                time.sleep(0)   # Being rendered again already - let the writer finish
+                continue
+            values = layout.read(snapshot.images[register_type], address, count)
+            if snapshot.sequence == sequence:
+                return values
+
+
+_LAYOUTS: Dict[Tuple[str, str], RegisterLayout] = {}
+
+
+def get_layout(model, register_type: str, dtc: Optional[int]) -> RegisterLayout:
+    """Layout for a model's 'input' or 'holding' registers (built once per profile)."""
+    key = (model.profile_key, register_type)
+    layout = _LAYOUTS.get(key)
+    if layout is None:
+        if register_type == 'input':
+            layout = RegisterLayout(model.get_input_registers(), model, dtc)
+        else:
+            layout = RegisterLayout(model.get_holding_registers(), model, dtc, include_dtc=True)
+        _LAYOUTS[key] = layout
+        logger.debug(f"Compiled {register_type} register layout for {model.profile_key}: "
+                     f"{len(layout.addresses)} registers, {len(layout.dynamic)} simulated, "
+                     f"{layout.size} words")
+    return layout
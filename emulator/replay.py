@@ -0,0 +1,198 @@
+"""
+Deterministic Replay
+
+Runs an InverterSimulator on a simulated clock instead of the wall clock, for
+reproducible, faster-than-real-time runs. Every update advances the
+simulation by a fixed step, the noise comes from a seeded random.Random and
+the run starts at a fixed time, so the same arguments always produce the
+same register values. A run goes as fast as the model can be computed - a
+simulated day at a 10 s step takes a fraction of a second - and can stream
+register frames to a JSON Lines file, as fixtures for testing the decoder
+and coordinator.
+
+File format: the first line describes the run, every further line is one
+frame with the values of all registers the profile defines (addresses as
+strings, as JSON object keys require):
+
+    {"replay": {"model": "sph_3000_6000", "seed": 0, "step": 10.0, ...}}
+    {"time": "2025-01-01T00:00:00", "input": {"0": 1, ...}, "holding": {...}}
+"""
+
+import json
+import logging
+import random
+from datetime import datetime
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from .farm import DEVICE_SETTINGS
+from .models import InverterModel, INVERTER_PROFILES
+from .simulator import InverterSimulator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLAY_STEP = 10.0   # simulated seconds per update
+DEFAULT_REPLAY_SEED = 0
+DEFAULT_REPLAY_START = datetime(2025, 1, 1)   # the model has no seasons
+
+# Duration suffixes (e.g. "90s", "6h", "1d", "1y")
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'y': 365 * 86400}
+
+
+def parse_duration(text: str) -> float:
+    """Duration in seconds from a number with an optional unit suffix.
+
+    Raises:
+        ValueError: Not a positive duration
+    """
+    text = text.strip().lower()
+    unit = DURATION_UNITS.get(text[-1:]) if text else None
+    seconds = float(text[:-1] if unit else text) * (unit or 1)
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {text!r}")
+    return seconds
+
+
+class SimulationClock:
+    """Manually advanced clock, used in place of time.time()."""
+
+    def __init__(self, start: float):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SimulationReplay:
+    """One simulated inverter advanced in fixed steps on a simulated clock."""
+
+    def __init__(self, model_key: str, seed: int = DEFAULT_REPLAY_SEED,
+                 step: float = DEFAULT_REPLAY_STEP, start: Optional[datetime] = None,
+                 settings: Optional[Dict[str, Any]] = None):
+        """Initialize replay.
+
+        Args:
+            model_key: Inverter model profile key
+            seed: Seed of the noise
+            step: Simulated seconds per update
+            start: Simulated start time (default: DEFAULT_REPLAY_START)
+            settings: Simulator settings (see farm.DEVICE_SETTINGS, except time_multiplier)
+
+        Raises:
+            ValueError: Unknown model, invalid step or setting
+        """
+        if model_key not in INVERTER_PROFILES:
+            raise ValueError(f"Unknown model {model_key!r}")
+        if step <= 0:
+            raise ValueError(f"Step must be positive: {step}")
+        settings = settings or {}
+        # The clock already runs at simulation speed - no time_multiplier
+        unknown = set(settings) - (set(DEVICE_SETTINGS) - {'time_multiplier'})
+        if unknown:
+            raise ValueError(f"Unsupported replay settings {sorted(unknown)}")
+
+        if start is None:
+            start = DEFAULT_REPLAY_START
+        self.model_key = model_key
+        self.seed = seed
+        self.step = step
+        self.start = start
+        self.settings = dict(settings)
+        self.clock = SimulationClock(start.timestamp())
+        self.simulator = InverterSimulator(
+            InverterModel(model_key), clock=self.clock, rng=random.Random(seed), start=start
+        )
+        for key, value in settings.items():
+            getattr(self.simulator, DEVICE_SETTINGS[key])(value)
+        self.steps = 0
+
+    def advance(self, render: bool = True) -> None:
+        """Advance the simulation by one step."""
+        self.clock.advance(self.step)
+        self.simulator.update(render)
+        self.steps += 1
+
+    def frame(self) -> Dict[str, Any]:
+        """Register values at the current simulation time."""
+        return {
+            'time': self.simulator.get_simulation_time().isoformat(),
+            'input': {str(address): value for address, value in self.simulator.get_register_map('input').items()},
+            'holding': {str(address): value for address, value in self.simulator.get_register_map('holding').items()},
+        }
+
+    def header(self, frame_interval: float) -> Dict[str, Any]:
+        """Parameters reproducing this run."""
+        return {'replay': {
+            'model': self.model_key,
+            'seed': self.seed,
+            'step': self.step,
+            'start': self.start.isoformat(),
+            'frame_interval': frame_interval,
+            'settings': self.settings,
+        }}
+
+    def frame_steps(self, frame_interval: Optional[float] = None) -> int:
+        """Steps between frames: frame_interval (default: every step) rounded to whole steps.
+
+        Raises:
+            ValueError: Not a positive interval
+        """
+        if frame_interval is None:
+            return 1
+        if frame_interval <= 0:
+            raise ValueError(f"Frame interval must be positive: {frame_interval}")
+        return max(1, round(frame_interval / self.step))
+
+    def run(self, duration: float, output: Optional[IO[str]] = None,
+            frame_interval: Optional[float] = None) -> int:
+        """Advance the simulation by duration seconds, writing frames to output.
+
+        Args:
+            duration: Simulated seconds to run
+            output: Text stream for the frames (JSON Lines), None to only simulate
+            frame_interval: Simulated seconds between frames (default: every step);
+                rounded to a whole number of steps
+
+        Returns:
+            Number of frames written
+
+        Raises:
+            ValueError: Not a positive frame interval
+        """
+        every = self.frame_steps(frame_interval)
+        steps = round(duration / self.step)
+        frames = 0
+        if output is not None:
+            output.write(json.dumps(self.header(every * self.step)) + '\n')
+            output.write(json.dumps(self.frame()) + '\n')
+            frames += 1
+
+        for index in range(1, steps + 1):
+            write = output is not None and index % every == 0
+            # Registers are only rendered for the frames that get written (and at the end)
+            self.advance(render=write or index == steps)
+            if write:
+                output.write(json.dumps(self.frame()) + '\n')
+                frames += 1
+
+        logger.info(f"Replay {self.model_key}: {steps} steps of {self.step}s, {frames} frames")
+        return frames
+
+
+def load_replay(path: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Read a replay file.
+
+    Returns:
+        Run parameters and the frames, with integer register addresses
+    """
+    with open(path, encoding='utf-8') as replay_file:
+        header = json.loads(replay_file.readline()).get('replay', {})
+        frames = []
+        for line in replay_file:
+            frame = json.loads(line)
+            for register_type in ('input', 'holding'):
+                frame[register_type] = {int(address): value for address, value in frame[register_type].items()}
+            frames.append(frame)
+    return header, frames
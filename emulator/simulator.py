@@ -12,9 +12,11 @@ Simulates realistic inverter behavior including:
 import math
 import time
 import random
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional
 from .models import InverterModel
+from .register_image import DTC_REGISTER, RegisterImage, get_layout
 
 # DTC (Device Type Code) mapping by profile key series
 # These codes are returned at register 30000 for device identification
@@ -64,21 +66,31 @@ FIRMWARE_VERSIONS = {
 class InverterSimulator:
     """Simulates a Growatt inverter with realistic behavior."""
 
-    def __init__(self, model: InverterModel, port: int = 502):
+    def __init__(self, model: InverterModel, port: int = 502,
+                 clock: Optional[Callable[[], float]] = None,
+                 rng: Optional[random.Random] = None,
+                 start: Optional[datetime] = None):
         """Initialize simulator.
 
         Args:
             model: InverterModel instance
             port: Modbus TCP port
+            clock: Time source in seconds (default time.time, see replay.py)
+            rng: Random generator for the noise (default: the random module)
+            start: Simulation start time (default: today at noon)
         """
         self.model = model
         self.port = port
+        self.clock = clock if clock is not None else time.time
+        self.random = rng if rng is not None else random
 
         # Simulation state
         self.running = True
         self.paused = False  # Pause simulation updates
-        self.start_time = time.time()
-        self.simulation_time = datetime.now().replace(hour=12, minute=0, second=0)  # Start at noon
+        self.start_time = self.clock()
+        if start is None:
+            start = datetime.now().replace(hour=12, minute=0, second=0)  # Start at noon
+        self.simulation_time = start
         self.time_multiplier = 1.0  # Real-time by default
 
         # User-adjustable parameters
@@ -98,7 +110,7 @@ class InverterSimulator:
         self.battery_capacity_kwh = 10.0 if model.has_battery else 0.0
         self.energy_today = 0.0  # kWh
         self.energy_total = 1234.5  # kWh (start with some history)
-        self.last_update = time.time()
+        self.last_update = self.clock()
 
         # Battery 1 energy tracking
         self.battery_charge_today = 0.0  # kWh
@@ -125,30 +137,50 @@ class InverterSimulator:
         self.load_energy_total = 987.6
 
         # Midnight reset tracking
-        self.last_midnight = datetime.now().date()
+        self.last_midnight = self.simulation_time.date()
 
         # Current values (calculated each update)
         self.values = {}
 
+        # Register images, rendered from the values on each update (see register_image.py)
+        dtc = DTC_CODES.get(model.profile_key)
+        self._layouts = {
+            'input': get_layout(model, 'input', dtc),
+            'holding': get_layout(model, 'holding', dtc),
+        }
+        self._registers = RegisterImage(self._layouts)
+
+        # Several threads drive update() (display/web loop and Modbus server loop)
+        self._update_lock = threading.Lock()
+
         # Initial calculation
         self.update()
 
     def _generate_serial(self) -> str:
         """Generate a realistic serial number."""
-        return f"GRW{random.randint(1000, 9999)}{random.randint(10000, 99999)}"
+        return f"GRW{self.random.randint(1000, 9999)}{self.random.randint(10000, 99999)}"
 
     def get_simulation_time(self) -> datetime:
         """Get current simulation time."""
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock() - self.start_time
         return self.simulation_time + timedelta(seconds=elapsed * self.time_multiplier)
 
-    def update(self) -> None:
-        """Update all simulated values based on current state."""
-        # Skip updates if paused
+    def update(self, render: bool = True) -> None:
+        """Update all simulated values based on current state.
+
+        Args:
+            render: Re-render the register images (replays skip it between frames)
+        """
+        with self._update_lock:
+            self._update(render)
+
+    def _update(self, render: bool = True) -> None:
+        # Skip updates if paused (controls changed meanwhile still show up in the registers)
         if self.paused:
+            self._render_registers()
             return
 
-        now = time.time()
+        now = self.clock()
         dt = now - self.last_update  # Time delta in seconds
         sim_time = self.get_simulation_time()
 
@@ -191,9 +223,26 @@ class InverterSimulator:
             'sim_time': sim_time,
             'status': self._get_status(),
         }
+        if render:
+            self._render_registers()
 
         self.last_update = now
 
+    def load_state(self, state: Dict[str, float], values: Dict[str, Any], now: float) -> None:
+        """Take over values computed elsewhere (batch simulation, see batch.py).
+
+        Args:
+            state: State variables to set (battery_soc, energy totals, ...)
+            values: Current values, same layout as update() stores
+            now: Time of the update (simulator clock)
+        """
+        with self._update_lock:
+            for name, value in state.items():
+                setattr(self, name, value)
+            self.values = values
+            self.last_update = now
+            self._render_registers()
+
     def _calculate_pv_generation(self, sim_time: datetime) -> Dict[str, float]:
         """Calculate PV generation based on time of day and irradiance.
 
@@ -219,7 +268,7 @@ class InverterSimulator:
         effective_irradiance = self.solar_irradiance * sun_elevation * (1 - self.cloud_cover * 0.8)
 
         # Add small random variations (clouds, etc.)
-        variation = random.uniform(0.95, 1.05)
+        variation = self.random.uniform(0.95, 1.05)
         effective_irradiance *= variation
 
         # Calculate power for each string
@@ -231,9 +280,9 @@ class InverterSimulator:
         base_power = (effective_irradiance / 1000.0) * power_per_string
 
         # Add small variations between strings (different orientations, shading)
-        pv1_power = base_power * random.uniform(0.95, 1.05)
-        pv2_power = base_power * random.uniform(0.95, 1.05)
-        pv3_power = base_power * random.uniform(0.95, 1.05) if self.model.has_pv3 else 0.0
+        pv1_power = base_power * self.random.uniform(0.95, 1.05)
+        pv2_power = base_power * self.random.uniform(0.95, 1.05)
+        pv3_power = base_power * self.random.uniform(0.95, 1.05) if self.model.has_pv3 else 0.0
 
         total_power = pv1_power + pv2_power + pv3_power
 
@@ -344,9 +393,9 @@ class InverterSimulator:
         temp_rise = load_percent * 30.0  # Up to 30°C rise at full load
 
         # Add small random variations
-        inverter_temp = ambient + temp_rise + random.uniform(-2, 2)
-        ipm_temp = inverter_temp + random.uniform(3, 7)  # IPM runs hotter
-        boost_temp = inverter_temp + random.uniform(2, 5)  # Boost converter heat
+        inverter_temp = ambient + temp_rise + self.random.uniform(-2, 2)
+        ipm_temp = inverter_temp + self.random.uniform(3, 7)  # IPM runs hotter
+        boost_temp = inverter_temp + self.random.uniform(2, 5)  # Boost converter heat
 
         return {
             'inverter': round(inverter_temp, 1),
@@ -364,35 +413,35 @@ class InverterSimulator:
 
         # PV string voltages (higher when generating, around MPP voltage)
         base_pv_voltage = 380.0  # Typical MPP voltage
-        voltages['pv1'] = base_pv_voltage + random.uniform(-10, 10)
-        voltages['pv2'] = base_pv_voltage + random.uniform(-10, 10)
+        voltages['pv1'] = base_pv_voltage + self.random.uniform(-10, 10)
+        voltages['pv2'] = base_pv_voltage + self.random.uniform(-10, 10)
         if self.model.has_pv3:
-            voltages['pv3'] = base_pv_voltage + random.uniform(-10, 10)
+            voltages['pv3'] = base_pv_voltage + self.random.uniform(-10, 10)
 
         # AC voltage (grid voltage)
         if self.model.is_three_phase:
             # Three-phase voltages (230V phase, 400V line-to-line)
-            voltages['ac_r'] = 230.0 + random.uniform(-5, 5)
-            voltages['ac_s'] = 230.0 + random.uniform(-5, 5)
-            voltages['ac_t'] = 230.0 + random.uniform(-5, 5)
+            voltages['ac_r'] = 230.0 + self.random.uniform(-5, 5)
+            voltages['ac_s'] = 230.0 + self.random.uniform(-5, 5)
+            voltages['ac_t'] = 230.0 + self.random.uniform(-5, 5)
             # Line-to-line voltages
-            voltages['ac_rs'] = 400.0 + random.uniform(-8, 8)
-            voltages['ac_st'] = 400.0 + random.uniform(-8, 8)
-            voltages['ac_tr'] = 400.0 + random.uniform(-8, 8)
+            voltages['ac_rs'] = 400.0 + self.random.uniform(-8, 8)
+            voltages['ac_st'] = 400.0 + self.random.uniform(-8, 8)
+            voltages['ac_tr'] = 400.0 + self.random.uniform(-8, 8)
         else:
             # Single-phase voltage
-            voltages['ac'] = 240.0 + random.uniform(-5, 5)
+            voltages['ac'] = 240.0 + self.random.uniform(-5, 5)
 
         # Battery voltage
         if self.model.has_battery:
             # Typical Li-ion: 48V nominal, varies with SOC
             base_voltage = 48.0
             # Voltage varies from ~45V (empty) to ~54V (full)
-            voltages['battery'] = base_voltage + (self.battery_soc - 50) * 0.12 + random.uniform(-0.5, 0.5)
+            voltages['battery'] = base_voltage + (self.battery_soc - 50) * 0.12 + self.random.uniform(-0.5, 0.5)
 
         # Backup voltage (for hybrid models)
         if self.model.has_battery:
-            voltages['backup'] = 240.0 + random.uniform(-3, 3)
+            voltages['backup'] = 240.0 + self.random.uniform(-3, 3)
 
         return voltages
 
@@ -408,7 +457,7 @@ class InverterSimulator:
             Dict with all current measurements
         """
         currents = {}
-        voltages = self.values.get('voltages', self._calculate_voltages())
+        voltages = self.values.get('voltages') or self._calculate_voltages()
 
         # PV currents: I = P / V
         currents['pv1'] = pv_power['pv1'] / voltages['pv1'] if voltages['pv1'] > 0 else 0
@@ -508,6 +557,20 @@ class InverterSimulator:
         else:
             return 1  # Normal operation
 
+    def _render_registers(self) -> None:
+        """Render and publish a new version of the register images."""
+        self._registers.publish(self)
+
+    @property
+    def register_version(self) -> int:
+        """Version of the published register images (one per update)."""
+        return self._registers.version
+
+    @staticmethod
+    def _image_type(register_type: str) -> str:
+        # Everything but input registers (discrete inputs and coils too) reads holding values
+        return 'input' if register_type == 'input' else 'holding'
+
     def get_register_value(self, register_type: str, address: int) -> Optional[int]:
         """Get raw register value for Modbus server.
 
@@ -518,562 +581,42 @@ class InverterSimulator:
         Returns:
             16-bit register value or None
         """
-        # Get register definition
-        if register_type == 'input':
-            registers = self.model.get_input_registers()
-        else:
-            registers = self.model.get_holding_registers()
-
-        # Special handling for DTC code (register 30000) - always provide a value
-        # This allows all profiles (including non-V2.01) to return proper DTC codes
-        if register_type == 'holding' and address == 30000:
-            dtc = DTC_CODES.get(self.model.profile_key)
-            if dtc is not None:
-                return dtc
-            # If profile defines the register, use its default
-            if address in registers:
-                return registers[address].get('default', 0)
-            return 0
-
-        if address not in registers:
+        register_type = self._image_type(register_type)
+        if (address not in self._layouts[register_type].addresses
+                and not (register_type == 'holding' and address == DTC_REGISTER)):
             return None
+        return self._registers.read(register_type, address, 1)[0]
 
-        reg_def = registers[address]
-        reg_name = reg_def['name']
-
-        # Map register name to simulated value
-        return self._map_register_to_value(reg_name, reg_def)
-
-    def _map_register_to_value(self, reg_name: str, reg_def: Dict[str, Any]) -> int:
-        """Map a register name to its simulated value.
+    def get_registers(self, register_type: str, address: int, count: int) -> List[int]:
+        """Get count raw register values starting at address (0 for unmapped registers).
 
         Args:
-            reg_name: Register name
-            reg_def: Register definition dict
+            register_type: 'input' or 'holding'
+            address: Starting register address
+            count: Number of registers
 
         Returns:
-            Raw 16-bit register value
+            List of 16-bit register values, all from the same update()
         """
-        # Debug: Log battery current register requests
-        if 'battery_current' in reg_name:
-            print(f"[DEBUG] _map_register_to_value called for: reg_name='{reg_name}'")
-
-        scale = reg_def.get('scale', 1)
-        is_signed = reg_def.get('signed', False)
-
-        # Check for maps_to field - use the mapped register's value logic
-        # This allows V2.01 registers (e.g., pv1_voltage_vpp) to return same value as V1.39 (pv1_voltage)
-        maps_to = reg_def.get('maps_to')
-        if maps_to:
-            # Strip any suffix like _high/_low from the maps_to name for base matching
-            base_name = maps_to
-            if '_high' in reg_name:
-                base_name = maps_to + '_high' if '_high' not in maps_to else maps_to
-            elif '_low' in reg_name:
-                base_name = maps_to + '_low' if '_low' not in maps_to else maps_to
-            # Use the mapped name for value lookup
-            reg_name = base_name
-
-        # Status
-        if 'status' in reg_name:
-            return self._get_status()
-
-        # PV values
-        elif reg_name == 'pv1_voltage':
-            return round(self.values['voltages']['pv1'] / scale)
-        elif reg_name == 'pv2_voltage':
-            return round(self.values['voltages']['pv2'] / scale)
-        elif reg_name == 'pv3_voltage' and self.model.has_pv3:
-            return round(self.values['voltages']['pv3'] / scale)
-        elif reg_name == 'pv1_current':
-            return round(self.values['currents']['pv1'] / scale)
-        elif reg_name == 'pv2_current':
-            return round(self.values['currents']['pv2'] / scale)
-        elif reg_name == 'pv3_current' and self.model.has_pv3:
-            return round(self.values['currents']['pv3'] / scale)
-
-        # PV power (32-bit pairs)
-        elif 'pv1_power_high' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv1'] / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif 'pv1_power_low' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv1'] / combined_scale)
-            return power_raw & 0xFFFF
-        elif 'pv2_power_high' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv2'] / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif 'pv2_power_low' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv2'] / combined_scale)
-            return power_raw & 0xFFFF
-        elif 'pv3_power_high' in reg_name and self.model.has_pv3:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv3'] / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif 'pv3_power_low' in reg_name and self.model.has_pv3:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['pv3'] / combined_scale)
-            return power_raw & 0xFFFF
-        elif 'pv_total_power_high' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['total'] / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif 'pv_total_power_low' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['pv_power']['total'] / combined_scale)
-            return power_raw & 0xFFFF
-
-        # AC values
-        elif reg_name == 'ac_voltage':
-            return round(self.values['voltages']['ac'] / scale)
-        elif reg_name == 'ac_current':
-            return round(self.values['currents']['ac'] / scale)
-        elif reg_name == 'ac_frequency':
-            return round(50.0 / scale)  # 50 Hz
-        elif 'ac_power_high' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['ac_power'] / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif 'ac_power_low' in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power_raw = int(self.values['ac_power'] / combined_scale)
-            return power_raw & 0xFFFF
-
-        # Three-phase AC
-        elif reg_name in ['ac_voltage_r', 'ac_voltage_s', 'ac_voltage_t']:
-            phase = reg_name.split('_')[-1]
-            return round(self.values['voltages'][f'ac_{phase}'] / scale)
-        elif reg_name in ['ac_current_r', 'ac_current_s', 'ac_current_t']:
-            phase = reg_name.split('_')[-1]
-            return round(self.values['currents'][f'ac_{phase}'] / scale)
-        elif reg_name in ['ac_power_r', 'ac_power_s', 'ac_power_t']:
-            phase = reg_name.split('_')[-1]
-            power = self.values['ac_power'] / 3  # Distribute across phases
-            return round(power / scale)
-        # Three-phase AC power (32-bit pairs)
-        elif reg_name in ['ac_power_r_high', 'ac_power_s_high', 'ac_power_t_high']:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power = self.values['ac_power'] / 3  # Distribute across phases
-            power_raw = int(power / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif reg_name in ['ac_power_r_low', 'ac_power_s_low', 'ac_power_t_low']:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            power = self.values['ac_power'] / 3  # Distribute across phases
-            power_raw = int(power / combined_scale)
-            return power_raw & 0xFFFF
-        elif reg_name in ['ac_voltage_rs', 'ac_voltage_st', 'ac_voltage_tr']:
-            phases = reg_name.split('_')[-1]
-            return round(self.values['voltages'][f'ac_{phases}'] / scale)
-
-        # Battery
-        elif reg_name == 'battery_voltage' and self.model.has_battery:
-            return round(self.values['voltages']['battery'] / scale)
-        elif reg_name == 'battery_current' and self.model.has_battery:
-            current = self.values['currents']['battery']
-            if is_signed:
-                return self._to_signed_16bit(round(current / scale))
-            return round(abs(current) / scale)
-        elif reg_name == 'battery_current_legacy' and self.model.has_battery:
-            current = self.values['currents']['battery']
-            return self._to_signed_16bit(round(current / scale))
-        elif reg_name in ['battery_current_high', 'battery_current_low'] and self.model.has_battery:
-            # 32-bit signed battery current
-            current = self.values['currents']['battery']
-            combined_scale = reg_def.get('combined_scale', scale) if reg_def.get('pair') else scale
-            current_raw = round(current / combined_scale)
-            # Handle signed 32-bit
-            if current_raw < 0:
-                current_raw = (1 << 32) + current_raw  # Two's complement for 32-bit
-            if 'high' in reg_name:
-                return (current_raw >> 16) & 0xFFFF
-            else:  # low
-                return current_raw & 0xFFFF
-        elif reg_name == 'battery_power' and self.model.has_battery:
-            power = self.values['battery_power']
-            if is_signed:
-                return self._to_signed_16bit(round(power / scale))
-            return round(abs(power) / scale)
-        elif reg_name == 'battery_soc' and self.model.has_battery:
-            return round(self.battery_soc)
-        elif reg_name == 'battery_temp' and self.model.has_battery:
-            return round(30.0 / scale)  # Fixed battery temp
-
-        # Battery 2 (returns 0 if no battery 2, enabling detection via voltage)
-        elif 'battery2_voltage' in reg_name:
-            if self.has_battery2:
-                # Similar voltage calculation as battery 1
-                base_voltage = 48.0
-                voltage = base_voltage + (self.battery2_soc - 50) * 0.12
-                return round(voltage / scale)
-            return 0  # No battery 2 - detection value
-        elif 'battery2_soc' in reg_name:
-            return round(self.battery2_soc) if self.has_battery2 else 0
-        elif 'battery2_soh' in reg_name:
-            return 95 if self.has_battery2 else 0
-        elif 'battery2_temp' in reg_name:
-            return round(28.0 / scale) if self.has_battery2 else 0
-        elif 'battery2_power_high' in reg_name:
-            if self.has_battery2:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                # Battery 2 runs at ~50% of battery 1 power for simulation
-                power = self.values['battery_power'] * 0.5
-                power_raw = int(power / combined_scale)
-                if power_raw < 0:
-                    power_raw = (1 << 32) + power_raw
-                return (power_raw >> 16) & 0xFFFF
-            return 0
-        elif 'battery2_power_low' in reg_name:
-            if self.has_battery2:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power = self.values['battery_power'] * 0.5
-                power_raw = int(power / combined_scale)
-                if power_raw < 0:
-                    power_raw = (1 << 32) + power_raw
-                return power_raw & 0xFFFF
-            return 0
-        elif 'battery2_charge_energy_today' in reg_name:
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_charge_today / combined_scale)
-                return (energy_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_charge_today / combined_scale)
-                return energy_raw & 0xFFFF
-        elif 'battery2_discharge_energy_today' in reg_name:
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_discharge_today / combined_scale)
-                return (energy_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_discharge_today / combined_scale)
-                return energy_raw & 0xFFFF
-        elif 'battery2_charge_energy_total' in reg_name:
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_charge_total / combined_scale)
-                return (energy_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_charge_total / combined_scale)
-                return energy_raw & 0xFFFF
-        elif 'battery2_discharge_energy_total' in reg_name:
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_discharge_total / combined_scale)
-                return (energy_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                energy_raw = int(self.battery2_discharge_total / combined_scale)
-                return energy_raw & 0xFFFF
-        elif 'battery2_current' in reg_name:
-            if self.has_battery2:
-                # Calculate current from power/voltage
-                voltage = 48.0 + (self.battery2_soc - 50) * 0.12
-                power = self.values['battery_power'] * 0.5
-                current = power / voltage if voltage > 0 else 0
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    current_raw = int(current / combined_scale)
-                    if current_raw < 0:
-                        current_raw = (1 << 32) + current_raw
-                    return (current_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    current_raw = int(current / combined_scale)
-                    if current_raw < 0:
-                        current_raw = (1 << 32) + current_raw
-                    return current_raw & 0xFFFF
-            return 0
-
-        # Temperatures
-        elif reg_name == 'inverter_temp':
-            return round(self.values['temperatures']['inverter'] / scale)
-        elif reg_name == 'ipm_temp':
-            return round(self.values['temperatures']['ipm'] / scale)
-        elif reg_name == 'boost_temp':
-            return round(self.values['temperatures']['boost'] / scale)
-
-        # Energy (32-bit pairs) - exclude load_energy which is handled separately
-        elif 'energy_today_high' in reg_name and 'load_energy' not in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            energy_raw = int(self.energy_today / combined_scale)
-            return (energy_raw >> 16) & 0xFFFF
-        elif 'energy_today_low' in reg_name and 'load_energy' not in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            energy_raw = int(self.energy_today / combined_scale)
-            return energy_raw & 0xFFFF
-        elif 'energy_total_high' in reg_name and 'load_energy' not in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            energy_raw = int(self.energy_total / combined_scale)
-            return (energy_raw >> 16) & 0xFFFF
-        elif 'energy_total_low' in reg_name and 'load_energy' not in reg_name:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            energy_raw = int(self.energy_total / combined_scale)
-            return energy_raw & 0xFFFF
-
-        # Grid/load power
-        elif 'grid_power' in reg_name or 'power_to_grid' in reg_name:
-            # Handle 32-bit pairs for power_to_grid
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                # Positive = export, handle sign in 32-bit value
-                power_raw = int(self.values['grid_power']['export'] / combined_scale)
-                return (power_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(self.values['grid_power']['export'] / combined_scale)
-                return power_raw & 0xFFFF
-            else:
-                # Single register
-                power = self.values['grid_power']['grid']
-                if is_signed:
-                    return self._to_signed_16bit(round(power / scale))
-                return round(abs(power) / scale)
-
-        elif 'load_power' in reg_name or 'power_to_load' in reg_name:
-            # Handle 32-bit pairs for power_to_load
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(self.house_load / combined_scale)
-                return (power_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(self.house_load / combined_scale)
-                return power_raw & 0xFFFF
-            else:
-                # Single register
-                return round(self.house_load / scale)
-
-        # Battery charge/discharge power (SPH TL3 specific)
-        elif reg_name == 'discharge_power_high' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            discharge = abs(min(0, self.values['battery_power']))  # Only negative values
-            power_raw = int(discharge / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif reg_name == 'discharge_power_low' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            discharge = abs(min(0, self.values['battery_power']))
-            power_raw = int(discharge / combined_scale)
-            return power_raw & 0xFFFF
-        elif reg_name == 'charge_power_high' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            charge = max(0, self.values['battery_power'])  # Only positive values
-            power_raw = int(charge / combined_scale)
-            return (power_raw >> 16) & 0xFFFF
-        elif reg_name == 'charge_power_low' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            charge = max(0, self.values['battery_power'])
-            power_raw = int(charge / combined_scale)
-            return power_raw & 0xFFFF
-
-        # Battery power (MOD series - signed 32-bit at register 31126)
-        # Positive = charging, Negative = discharging
-        elif reg_name == 'battery_power_high' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            is_signed = reg_def.get('signed', False)
-            power = self.values['battery_power']
-            # For signed 32-bit, we need to handle negative values properly
-            power_raw = int(power / combined_scale)
-            if is_signed and power_raw < 0:
-                # Convert to 32-bit signed representation
-                power_raw = (1 << 32) + power_raw
-            return (power_raw >> 16) & 0xFFFF
-        elif reg_name == 'battery_power_low' and self.model.has_battery:
-            combined_scale = reg_def.get('combined_scale', 0.1)
-            is_signed = reg_def.get('signed', False)
-            power = self.values['battery_power']
-            power_raw = int(power / combined_scale)
-            if is_signed and power_raw < 0:
-                # Convert to 32-bit signed representation
-                power_raw = (1 << 32) + power_raw
-            return power_raw & 0xFFFF
-
-        # Power flow (SPH TL3 specific)
-        elif 'power_to_user' in reg_name:
-            # Power to user = PV - battery charge
-            power_to_user = self.values['pv_power']['total'] - max(0, self.values['battery_power'])
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(power_to_user / combined_scale)
-                return (power_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(power_to_user / combined_scale)
-                return power_raw & 0xFFFF
-
-        # Self consumption (SPH TL3 specific)
-        elif 'self_consumption_power' in reg_name:
-            # Self consumption = load - grid import
-            self_consumption = self.house_load - self.values['grid_power']['import']
-            if '_high' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(max(0, self_consumption) / combined_scale)
-                return (power_raw >> 16) & 0xFFFF
-            elif '_low' in reg_name:
-                combined_scale = reg_def.get('combined_scale', 0.1)
-                power_raw = int(max(0, self_consumption) / combined_scale)
-                return power_raw & 0xFFFF
-        elif reg_name == 'self_consumption_percentage':
-            if self.house_load > 0:
-                self_consumption = self.house_load - self.values['grid_power']['import']
-                percentage = (max(0, self_consumption) / self.house_load) * 100
-                return round(min(100, percentage))
-            return 0
-
-        # Energy to user/grid (SPH TL3 specific)
-        elif 'energy_to_user' in reg_name:
-            # Use the same as PV generation for now
-            if 'today' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_today / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_today / combined_scale)
-                    return energy_raw & 0xFFFF
-            elif 'total' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_total / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_total / combined_scale)
-                    return energy_raw & 0xFFFF
-
-        elif 'energy_to_grid' in reg_name:
-            if 'today' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_to_grid_today / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_to_grid_today / combined_scale)
-                    return energy_raw & 0xFFFF
-            elif 'total' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_to_grid_total / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.energy_to_grid_total / combined_scale)
-                    return energy_raw & 0xFFFF
-
-        # Battery discharge energy (SPH TL3: discharge_energy, MOD: battery_discharge)
-        elif ('discharge_energy' in reg_name or 'battery_discharge' in reg_name) and self.model.has_battery:
-            if 'today' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_discharge_today / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_discharge_today / combined_scale)
-                    return energy_raw & 0xFFFF
-            elif 'total' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_discharge_total / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_discharge_total / combined_scale)
-                    return energy_raw & 0xFFFF
-
-        # Battery charge energy (SPH TL3: charge_energy, MOD: battery_charge)
-        elif ('charge_energy' in reg_name or 'battery_charge' in reg_name) and self.model.has_battery:
-            if 'today' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_charge_today / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_charge_today / combined_scale)
-                    return energy_raw & 0xFFFF
-            elif 'total' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_charge_total / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.battery_charge_total / combined_scale)
-                    return energy_raw & 0xFFFF
-
-        # Load energy (SPH TL3 specific)
-        elif 'load_energy' in reg_name:
-            if 'today' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.load_energy_today / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.load_energy_today / combined_scale)
-                    return energy_raw & 0xFFFF
-            elif 'total' in reg_name:
-                if '_high' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.load_energy_total / combined_scale)
-                    return (energy_raw >> 16) & 0xFFFF
-                elif '_low' in reg_name:
-                    combined_scale = reg_def.get('combined_scale', 0.1)
-                    energy_raw = int(self.load_energy_total / combined_scale)
-                    return energy_raw & 0xFFFF
-
-        # System work mode
-        elif reg_name == 'system_work_mode':
-            return 1  # 1 = Normal operation
-
-        # Battery type
-        elif reg_name == 'battery_type':
-            return 1  # 1 = Li-ion
-
-        # Backup output
-        elif reg_name == 'backup_voltage':
-            return round(self.values['voltages'].get('backup', 240.0) / scale)
-        elif reg_name == 'backup_current':
-            return round(self.values['currents'].get('backup', 0) / scale)
-        elif reg_name == 'backup_power':
-            return round(self.house_load / scale)
-        elif reg_name == 'backup_frequency':
-            return round(50.0 / scale)
-
-        # Device identification (holding registers)
-        elif reg_name == 'dtc_code':
-            # Use DTC_CODES mapping based on profile key, fallback to register default
-            dtc = DTC_CODES.get(self.model.profile_key)
-            if dtc is not None:
-                return dtc
-            return reg_def.get('default', 0)
-
-        # Default - check if register definition has a default value
-        default_value = reg_def.get('default')
-        if default_value is not None:
-            return default_value
-        return 0
-
-    def _to_signed_16bit(self, value: int) -> int:
-        """Convert to signed 16-bit integer.
+        return self._registers.read(self._image_type(register_type), address, count)
+
+    def get_register_map(self, register_type: str) -> Dict[int, int]:
+        """Get the raw values of all registers the profile defines.
 
         Args:
-            value: Integer value
+            register_type: 'input' or 'holding'
 
         Returns:
-            16-bit signed integer
+            Dict of register address -> 16-bit register value
         """
-        if value < 0:
-            return (1 << 16) + value
-        return value & 0xFFFF
+        layout = self._layouts[self._image_type(register_type)]
+        registers = {}
+        for start, end in zip(layout.starts, layout.ends):
+            values = self._registers.read(self._image_type(register_type), start, end - start)
+            for address, value in enumerate(values, start):
+                if address in layout.addresses or (register_type == 'holding' and address == DTC_REGISTER):
+                    registers[address] = value
+        return registers
 
     def set_irradiance(self, irradiance: float) -> None:
         """Set solar irradiance (0-1000 W/m²)."""
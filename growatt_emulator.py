@@ -8,18 +8,24 @@ and grid interaction.
 
 Usage:
     python3 growatt_emulator.py [--port PORT] [--model MODEL]
+    python3 growatt_emulator.py --farm CONFIG
+    python3 growatt_emulator.py --model MODEL --replay OUTPUT [--duration 1d] [--step 10] [--seed 0]
 
 Examples:
     python3 growatt_emulator.py
     python3 growatt_emulator.py --port 5020
     python3 growatt_emulator.py --model sph_3000_6000 --port 502
+    python3 growatt_emulator.py --farm emulator_farm.example.json
+    python3 growatt_emulator.py --model sph_3000_6000 --replay day.jsonl --duration 1d --frame-interval 60
 """
 
 import sys
 import os
 import argparse
+import asyncio
 import time
 import logging
+from datetime import datetime
 from typing import Optional
 
 # Add current directory to path
@@ -30,6 +36,10 @@ from emulator.simulator import InverterSimulator
 from emulator.modbus_server import ModbusEmulatorServer
 from emulator.display import EmulatorDisplay
 from emulator.controls import ControlHandler
+from emulator.farm import EmulatorFarm, load_farm_config
+from emulator.replay import (
+    SimulationReplay, parse_duration, DEFAULT_REPLAY_SEED, DEFAULT_REPLAY_START, DEFAULT_REPLAY_STEP,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -120,6 +130,71 @@ class GrowattEmulator:
         print("✓ Emulator stopped")
 
 
+def run_farm(config_path: str) -> None:
+    """Run many emulated inverters from a farm config (no live display).
+
+    Args:
+        config_path: Path to the farm config file (JSON)
+    """
+    try:
+        farm = EmulatorFarm(load_farm_config(config_path))
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid farm config {config_path}: {e}")
+        sys.exit(1)
+
+    print(f"\n🚀 Starting Growatt Emulator Farm...")
+    for port in farm.ports:
+        devices = farm.devices_on(port)
+        models = sorted({device.model for device in devices})
+        print(f"   Port {port}: {len(devices)} devices (slave IDs "
+              f"{min(d.slave_id for d in devices)}-{max(d.slave_id for d in devices)}) - {', '.join(models)}")
+    print(f"   Update interval: {farm.update_interval}s")
+    print(f"\n✓ Serving {len(farm.devices)} devices - press Ctrl+C to stop\n")
+
+    try:
+        asyncio.run(farm.run())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Interrupted by user")
+    print("✓ Emulator farm stopped")
+
+
+def run_replay(model_key: str, output_path: str, duration: str, step: float, seed: int,
+               start: Optional[str] = None, frame_interval: Optional[float] = None) -> None:
+    """Simulate a period as fast as possible and write the register frames to a file.
+
+    Args:
+        model_key: Inverter model profile key
+        output_path: Path of the JSON Lines file to write
+        duration: Simulated duration (e.g. "6h", "1d", "1y")
+        step: Simulated seconds per update
+        seed: Seed of the noise
+        start: Simulated start time (ISO format)
+        frame_interval: Simulated seconds between frames (default: every step)
+    """
+    try:
+        seconds = parse_duration(duration)
+        replay = SimulationReplay(
+            model_key, seed=seed, step=step,
+            start=datetime.fromisoformat(start) if start else DEFAULT_REPLAY_START,
+        )
+        replay.frame_steps(frame_interval)
+    except ValueError as e:
+        print(f"❌ Invalid replay arguments: {e}")
+        sys.exit(1)
+
+    print(f"\n⏩ Replaying {model_key}: {duration} from {replay.start.isoformat()} "
+          f"in {step}s steps (seed {seed})")
+    started = time.time()
+    try:
+        with open(output_path, 'w', encoding='utf-8') as output:
+            frames = replay.run(seconds, output, frame_interval)
+    except OSError as e:
+        print(f"❌ Cannot write {output_path}: {e}")
+        sys.exit(1)
+    print(f"✓ {replay.steps} steps, {frames} frames written to {output_path} "
+          f"in {time.time() - started:.1f}s")
+
+
 def select_protocol(base_key: str, series_name: str, legacy_desc: str = "Legacy protocol") -> str:
     """Offer protocol selection for any series.
 
@@ -273,6 +348,9 @@ Examples:
   %(prog)s --model sph_3000_6000              # Specify model directly
   %(prog)s --port 5020                        # Use custom port
   %(prog)s --model min_7000_10000_tl_x --port 502
+  %(prog)s --farm emulator_farm.example.json  # Many devices from a config file
+  %(prog)s --model sph_3000_6000 --replay day.jsonl --duration 1d
+                                              # Simulated day as register frames
 
 Available Models:
   mic_600_3300tl_x         - MIC Series Micro Inverter
@@ -303,6 +381,49 @@ Available Models:
         help='Modbus TCP port (default: 502)'
     )
 
+    parser.add_argument(
+        '--farm',
+        type=str,
+        metavar='CONFIG',
+        help='Run many devices from a farm config file (JSON, see emulator/farm.py)'
+    )
+
+    replay = parser.add_argument_group('replay', 'Deterministic run on a simulated clock, as fast as possible')
+    replay.add_argument(
+        '--replay',
+        type=str,
+        metavar='OUTPUT',
+        help='Write register frames of a simulated run to OUTPUT (JSON Lines, requires --model)'
+    )
+    replay.add_argument(
+        '--duration',
+        type=str,
+        default='1d',
+        help='Simulated duration, e.g. 6h, 1d, 1y (default: 1d)'
+    )
+    replay.add_argument(
+        '--step',
+        type=float,
+        default=DEFAULT_REPLAY_STEP,
+        help=f'Simulated seconds per update (default: {DEFAULT_REPLAY_STEP:g})'
+    )
+    replay.add_argument(
+        '--seed',
+        type=int,
+        default=DEFAULT_REPLAY_SEED,
+        help=f'Seed of the simulated noise (default: {DEFAULT_REPLAY_SEED})'
+    )
+    replay.add_argument(
+        '--start',
+        type=str,
+        help=f'Simulated start time, ISO format (default: {DEFAULT_REPLAY_START.isoformat()})'
+    )
+    replay.add_argument(
+        '--frame-interval',
+        type=float,
+        help='Simulated seconds between frames (default: every step)'
+    )
+
     parser.add_argument(
         '--list-models',
         action='store_true',
@@ -317,6 +438,20 @@ Available Models:
         list_models()
         sys.exit(0)
 
+    # Farm mode
+    if args.farm:
+        run_farm(args.farm)
+        sys.exit(0)
+
+    # Replay mode
+    if args.replay:
+        if args.model not in get_available_models():
+            print(f"❌ Replay requires a valid --model (see --list-models)")
+            sys.exit(1)
+        run_replay(args.model, args.replay, args.duration, args.step, args.seed,
+                   args.start, args.frame_interval)
+        sys.exit(0)
+
     # Select model
     if args.model:
         model_key = args.model
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Tests for the Modbus client transports"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip('pymodbus')
+
+from custom_components.growatt_modbus.async_client import AsyncGrowattModbus
+from custom_components.growatt_modbus.growatt_modbus import GrowattModbus, response_timeout
+from custom_components.growatt_modbus.pacing import OUTCOME_TIMEOUT
+
+
+def _retries(client):
+    return client.retries if hasattr(client, 'retries') else client.ctx.retries
+
+
+def test_pymodbus_does_not_retry_on_its_own():
+    """Failed reads are only retried by RetryPolicy, not re-sent by pymodbus first"""
+    client = GrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000')
+    assert _retries(client.client) == 0
+
+    async def async_retries():
+        client = AsyncGrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000')
+        return _retries(client.client)
+
+    assert asyncio.run(async_retries()) == 0
+
+
+def test_inverters_on_one_link_share_its_pacing():
+    """Inverter B waits out the quiet gap after inverter A's response"""
+    first, second = (GrowattModbus(connection_type='tcp', host='127.0.0.1', slave_id=slave_id, shared=True,
+                                   register_map='SPH_TL3_3000_10000', min_read_interval=0.5)
+                     for slave_id in (1, 2))
+    private = GrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000')
+    try:
+        assert second.pacer is first.pacer and private.pacer is not first.pacer
+        first._record_transaction(OUTCOME_TIMEOUT)
+        assert second.last_read_time == first.last_read_time
+        assert second._read_interval_delay() == pytest.approx(first.pacer.interval, abs=0.1)
+        assert first.pacer.interval > 0.5
+        assert private._read_interval_delay() == 0
+    finally:
+        for client in (first, second, private):
+            client.release()
+
+
+def test_response_timeout_is_restored():
+    client = GrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000', timeout=10)
+    params = (client.client.comm_params, client.client.transaction.comm_params)
+    with response_timeout(client.client, 2.5):
+        assert [p.timeout_connect for p in params] == [2.5, 2.5]
+    assert [p.timeout_connect for p in params] == [10, 10]
+
+    async def async_timeouts():
+        client = AsyncGrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000', timeout=10)
+        with response_timeout(client.client, 2.5):
+            during = client.client.ctx.comm_params.timeout_connect
+        return during, client.client.ctx.comm_params.timeout_connect
+
+    assert asyncio.run(async_timeouts()) == (2.5, 10)
+
+
+class _Response:
+    def __init__(self, exception_code=None, registers=None):
+        self.exception_code = exception_code
+        self.registers = registers
+
+    def isError(self):
+        return self.exception_code is not None
+
+
+class _Fc06OnlyDevice:
+    """pymodbus client stand-in for firmware that only accepts function 6 writes"""
+
+    connected = True
+
+    def __init__(self, awaitable=False):
+        self.awaitable = awaitable
+        self.holding = {}
+        self.requests = []
+
+    def _answer(self, response):
+        if not self.awaitable:
+            return response
+
+        async def answer():
+            return response
+        return answer()
+
+    def is_socket_open(self):
+        return True
+
+    def write_registers(self, address, values, **kwargs):
+        self.requests.append(('fc16', address, list(values)))
+        return self._answer(_Response(exception_code=1))
+
+    def write_register(self, address, value, **kwargs):
+        self.requests.append(('fc06', address, value))
+        self.holding[address] = value
+        return self._answer(_Response())
+
+    def read_holding_registers(self, address, count, **kwargs):
+        return self._answer(_Response(registers=[self.holding.get(address + i, 0) for i in range(count)]))
+
+
+def test_refused_function_16_falls_back_to_single_writes():
+    client = GrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000')
+    assert not client.write_multiple   # opt-in per profile
+    client.client = device = _Fc06OnlyDevice()
+    client.write_multiple = True
+
+    assert client.write_batch({122: 1, 123: 0}) == {122: True, 123: True}
+    assert device.requests == [('fc16', 122, [1, 0]), ('fc06', 122, 1), ('fc06', 123, 0)]
+    assert not client.write_multiple
+    assert not client.read_back_failed
+
+    async def async_requests():
+        client = AsyncGrowattModbus(connection_type='tcp', host='127.0.0.1', register_map='SPH_TL3_3000_10000')
+        client.client = device = _Fc06OnlyDevice(awaitable=True)
+        client.write_multiple = True
+        return await client.write_batch({122: 1, 123: 0}), device.requests
+
+    results, requests = asyncio.run(async_requests())
+    assert results == {122: True, 123: True}
+    assert requests == [('fc16', 122, [1, 0]), ('fc06', 122, 1), ('fc06', 123, 0)]
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Tests for the shared Modbus connection pool"""
+
+import logging
+
+from custom_components.growatt_modbus.connection_pool import (
+    acquire_connection,
+    connection_key,
+    release_connection,
+)
+
+
+class _Transport:
+    """Stands in for a pymodbus client (only close() is used here)"""
+
+    def close(self):
+        pass
+
+
+def test_clients_on_one_link_share_its_transport(caplog):
+    key = connection_key('serial', device='/dev/ttyTEST0')
+    first = acquire_connection(key, _Transport, {'baudrate': 9600, 'timeout': 10})
+    with caplog.at_level(logging.WARNING):
+        second = acquire_connection(key, _Transport, {'baudrate': 9600, 'timeout': 10})
+    try:
+        assert second is first and first.users == 2
+        assert not caplog.records
+    finally:
+        release_connection(second)
+        release_connection(first)
+
+
+def test_joining_with_other_settings_warns(caplog):
+    key = connection_key('serial', device='/dev/ttyTEST1')
+    first = acquire_connection(key, _Transport, {'baudrate': 9600, 'timeout': 10})
+    with caplog.at_level(logging.WARNING):
+        second = acquire_connection(key, _Transport, {'baudrate': 115200, 'timeout': 10})
+    try:
+        assert second is first
+        assert first.settings == {'baudrate': 9600, 'timeout': 10}
+        assert len(caplog.records) == 1
+        assert 'baudrate 9600 (configured 115200)' in caplog.records[0].getMessage()
+    finally:
+        release_connection(second)
+        release_connection(first)
+
+
+def test_released_link_is_recreated_with_new_settings():
+    key = connection_key('serial', device='/dev/ttyTEST2')
+    release_connection(acquire_connection(key, _Transport, {'baudrate': 9600}))
+    connection = acquire_connection(key, _Transport, {'baudrate': 19200})
+    try:
+        assert connection.settings == {'baudrate': 19200}
+    finally:
+        release_connection(connection)
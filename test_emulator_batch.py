@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""BatchSimulator.step against InverterSimulator.update() with fixed noise"""
+
+import random
+from datetime import datetime
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from emulator.batch import STATE_FIELDS, BatchSimulator
+from emulator.models import InverterModel
+from emulator.replay import SimulationClock
+from emulator.simulator import InverterSimulator
+
+# Single phase without battery, three phase with PV3, hybrids with battery
+MODELS = ('min_3000_6000_tl_x', 'mod_6000_15000tl3_x', 'sph_3000_6000', 'sph_tl3_3000_10000')
+START = datetime(2025, 1, 1, 5, 0)
+STEP = 60.0
+STEPS = 26 * 60   # past midnight, so the daily totals are reset once
+
+
+class _MidpointRandom(random.Random):
+    """Noise fixed at the middle of its range"""
+
+    def uniform(self, a, b):
+        return (a + b) / 2
+
+
+class _MidpointGenerator:
+    """numpy.random.Generator stand-in with the same fixed noise"""
+
+    def uniform(self, low, high, size):
+        return np.full(size, (low + high) / 2)
+
+
+def _simulators(clock):
+    sims = []
+    for key in MODELS:
+        sim = InverterSimulator(InverterModel(key), clock=clock, rng=_MidpointRandom(0), start=START)
+        sim.house_load = 3000.0
+        sims.append(sim)
+    return sims
+
+
+def _flatten(values, prefix=''):
+    flat = {}
+    for key, value in values.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{prefix}{key}."))
+        else:
+            flat[prefix + key] = value
+    return flat
+
+
+def test_batch_step_matches_update():
+    clock = SimulationClock(START.timestamp())
+    scalar = _simulators(clock)
+    batched = _simulators(clock)
+    batch = BatchSimulator(batched, rng=_MidpointGenerator())
+
+    for _ in range(STEPS):
+        clock.advance(STEP)
+        for sim in scalar:
+            sim.update(render=False)
+        batch.step(clock())
+
+    for expected, actual in zip(scalar, batched):
+        model = expected.model.profile_key
+        for field in STATE_FIELDS:
+            assert getattr(actual, field) == pytest.approx(getattr(expected, field), rel=1e-9, abs=1e-9), (model, field)
+        assert actual.last_midnight == expected.last_midnight
+
+        expected_values, actual_values = _flatten(expected.values), _flatten(actual.values)
+        assert set(actual_values) == set(expected_values), model
+        for key, value in expected_values.items():
+            if not isinstance(value, float):
+                assert actual_values[key] == value, (model, key)
+                continue
+            # update() computes currents from the voltages of the previous update;
+            # with fixed noise only the battery voltage (from the SOC) moves between steps
+            tolerance = 1e-2 if key == 'currents.battery' else 1e-9
+            assert actual_values[key] == pytest.approx(value, rel=tolerance, abs=1e-9), (model, key)
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Tests for the in-memory poll history"""
+
+import math
+
+from custom_components.growatt_modbus.data import GrowattData
+from custom_components.growatt_modbus.history import SampleHistory
+
+START = 1_700_000_000.0
+
+
+def _history(values, capacity=10, interval=10.0, stale_at=()):
+    """History of pv_total_power/battery_soc samples taken every interval seconds"""
+    history = SampleHistory(('pv_total_power', 'battery_soc'), capacity)
+    for index, value in enumerate(values):
+        data = GrowattData(pv_total_power=float(value), battery_soc=50.0)
+        stale = ('pv_total_power',) if index in stale_at else ()
+        history.append(data, START + index * interval, stale)
+    return history
+
+
+def _now(count, interval=10.0):
+    return START + (count - 1) * interval
+
+
+def test_ring_wraps_around_keeping_the_newest_samples():
+    history = _history(range(25), capacity=10)
+    assert len(history) == 10
+    window = history.window('pv_total_power', 3600, _now(25))
+    assert [value for _, value in window] == [float(value) for value in range(15, 25)]
+    assert [timestamp for timestamp, _ in window] == [START + index * 10.0 for index in range(15, 25)]
+
+
+def test_window_cutoff():
+    history = _history(range(10))
+    # Samples at now-30 .. now; the one at exactly the cutoff is included
+    stats = history.stats('pv_total_power', 30, _now(10))
+    assert (stats.count, stats.first, stats.last) == (4, 6.0, 9.0)
+    assert (stats.minimum, stats.maximum, stats.mean) == (6.0, 9.0, 7.5)
+    assert history.stats('pv_total_power', 5, _now(10) + 6) is None
+
+
+def test_stale_fields_are_nan_and_left_out():
+    history = _history([100, 200, 300, 400], stale_at={1, 2})
+    assert math.isnan(history._columns['pv_total_power'][1])
+    stats = history.stats('pv_total_power', 3600, _now(4))
+    assert (stats.count, stats.mean, stats.first, stats.last) == (2, 250.0, 100.0, 400.0)
+    # Other fields of the same polls were fresh
+    assert history.stats('battery_soc', 3600, _now(4)).count == 4
+
+
+def test_ramp_rate():
+    history = _history([100, 150, 250])
+    assert history.stats('pv_total_power', 3600, _now(3)).ramp_rate == 7.5
+    # None with fewer than two samples
+    assert history.stats('pv_total_power', 0, _now(3)).ramp_rate is None
+    assert _history([100]).stats('pv_total_power', 3600, START).ramp_rate is None
+    assert _history([100, 150], stale_at={1}).stats('pv_total_power', 3600, _now(2)).ramp_rate is None
+
+
+def test_summary_skips_unknown_and_empty_fields():
+    history = _history([100], stale_at={0})
+    assert history.stats('ac_power', 3600, START) is None
+    assert set(history.summary(3600, START)) == {'battery_soc'}
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for field-level change tracking and the inputs of calculated sensors"""
+
+import ast
+import os
+
+import pytest
+
+from custom_components.growatt_modbus.data import GrowattData
+from custom_components.growatt_modbus.publish import (
+    CALCULATED_SENSOR_INPUTS,
+    ChangeTracker,
+    sensor_input_fields,
+)
+
+SENSOR_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'custom_components', 'growatt_modbus', 'sensor.py')
+UNRELATED_FIELD = 'inverter_temp'
+
+
+def _calculated_sensor_reads():
+    """Data fields read by every calculated sensor branch of sensor.py's native_value"""
+    with open(SENSOR_PY, encoding='utf-8') as source:
+        tree = ast.parse(source.read())
+    reads = {}
+    for node in ast.walk(tree):
+        # if/elif self._sensor_key == "<key>": ... getattr(data, "<field>", ...)
+        if not (isinstance(node, ast.If) and isinstance(node.test, ast.Compare)
+                and isinstance(node.test.left, ast.Attribute) and node.test.left.attr == '_sensor_key'):
+            continue
+        key = node.test.comparators[0].value
+        reads[key] = {
+            call.args[1].value
+            for statement in node.body for call in ast.walk(statement)
+            if isinstance(call, ast.Call) and getattr(call.func, 'id', None) == 'getattr'
+            and isinstance(call.args[0], ast.Name) and call.args[0].id == 'data'
+        }
+    return reads
+
+
+def test_inputs_cover_every_field_a_calculated_sensor_reads():
+    reads = _calculated_sensor_reads()
+    for key, inputs in CALCULATED_SENSOR_INPUTS.items():
+        assert reads[key] <= inputs, key
+        assert UNRELATED_FIELD not in inputs
+
+
+@pytest.mark.parametrize('sensor_key', sorted(CALCULATED_SENSOR_INPUTS))
+def test_calculated_sensor_publishes_when_an_input_changes(sensor_key):
+    inputs = sensor_input_fields(sensor_key, 'calculated')
+    tracker = ChangeTracker(deadband=1.0)
+    data = GrowattData()
+    tracker.update(data)
+
+    for field in sorted(inputs):
+        setattr(data, field, getattr(data, field) + 100.0)
+        assert not inputs.isdisjoint(tracker.update(data)), field
+
+    setattr(data, UNRELATED_FIELD, getattr(data, UNRELATED_FIELD) + 10.0)
+    changed = tracker.update(data)
+    assert changed == {UNRELATED_FIELD}
+    assert inputs.isdisjoint(changed)
+
+
+def test_plain_sensor_depends_on_its_field():
+    assert sensor_input_fields('pv1_power', 'pv1_power') == {'pv1_power'}
+    # Calculated sensors without known inputs update on every poll
+    assert sensor_input_fields('last_update', 'calculated') is None
+
+
+def test_first_update_reports_every_field():
+    data = GrowattData()
+    assert ChangeTracker(5.0).update(data) == set(data.as_dict())
+
+
+def test_deadband_is_relative():
+    tracker = ChangeTracker(deadband=5.0)
+    data = GrowattData(pv_total_power=1000.0, ac_power=10.0)
+    tracker.update(data)
+
+    data.pv_total_power, data.ac_power = 1040.0, 10.6
+    # 4% of 1000 is inside the deadband, 6% of 10 is not
+    assert tracker.update(data) == {'ac_power'}
+
+
+def test_drift_is_measured_against_the_published_value():
+    tracker = ChangeTracker(deadband=5.0)
+    data = GrowattData(pv_total_power=1000.0)
+    tracker.update(data)
+
+    for value in (1030.0, 1045.0):
+        data.pv_total_power = value
+        assert tracker.update(data) == set()
+    # 3% + 2% + 1.5% since the last published 1000 - published now
+    data.pv_total_power = 1060.0
+    assert tracker.update(data) == {'pv_total_power'}
+    data.pv_total_power = 1070.0
+    assert tracker.update(data) == set()
+
+
+def test_int_and_energy_fields_are_exempt():
+    tracker = ChangeTracker(deadband=50.0)
+    data = GrowattData(status=1, energy_total=12345.6, pv_total_power=1000.0)
+    tracker.update(data)
+
+    data.status, data.energy_total, data.pv_total_power = 2, 12345.7, 1001.0
+    assert tracker.update(data) == {'status', 'energy_total'}
+
+
+def test_reset_publishes_everything_again():
+    tracker = ChangeTracker(deadband=5.0)
+    data = GrowattData()
+    tracker.update(data)
+    assert tracker.update(data) == set()
+    tracker.reset()
+    assert tracker.update(data) == set(data.as_dict())
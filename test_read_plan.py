@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""Tests for the compiled read plans and the poll built on them"""
+
+import time
+from itertools import combinations
+
+import pytest
+
+from custom_components.growatt_modbus import growatt_modbus
+from custom_components.growatt_modbus.const import REGISTER_MAPS, POLL_TIER_FAST
+from custom_components.growatt_modbus.growatt_modbus import GrowattModbusBase, STALE_MAX_AGE
+from custom_components.growatt_modbus.read_plan import (
+    ALL_TIERS,
+    get_read_plan,
+    link_cost_for,
+    _holding_register_tiers,
+    _input_register_tiers,
+)
+from custom_components.growatt_modbus.pacing import MODBUS_EXCEPTION_ILLEGAL_ADDRESS
+
+LINKS = (link_cost_for('tcp'), link_cost_for('serial', 9600), link_cost_for('serial', 115200))
+TIER_SETS = [frozenset(tiers) for size in (1, 2) for tiers in combinations(sorted(ALL_TIERS), size)]
+
+
+def _covered(blocks):
+    return {addr for block in blocks for addr in range(block.start, block.end + 1)}
+
+
+@pytest.mark.parametrize('register_map', sorted(REGISTER_MAPS))
+def test_tier_plans_are_subsets_of_the_full_plan(register_map):
+    """A block covers the same registers whichever tiers are polled"""
+    input_tiers = _input_register_tiers(REGISTER_MAPS[register_map].get('input_registers', {}))
+    for link in LINKS:
+        full = get_read_plan(register_map, link)
+        for tiers in TIER_SETS:
+            plan = get_read_plan(register_map, link, tiers)
+            assert set(plan.blocks) <= set(full.blocks)
+            # Every input register of a polled tier the full plan reads is still read
+            covered = _covered(plan.input_blocks)
+            wanted = {addr for addr, tier in input_tiers.items() if tier in tiers}
+            assert wanted & _covered(full.input_blocks) <= covered
+
+
+@pytest.mark.parametrize('register_map', sorted(REGISTER_MAPS))
+def test_bridged_blocks_carry_their_defined_runs(register_map):
+    """The parts of a block read exactly its defined addresses, without gaps"""
+    registers = REGISTER_MAPS[register_map]
+    defined = {
+        'input': set(_input_register_tiers(registers.get('input_registers', {}))),
+        'holding': set(_holding_register_tiers(registers.get('holding_registers', {}))),
+    }
+    for block in get_read_plan(register_map, link_cost_for('tcp')).blocks:
+        wanted = {addr for addr in range(block.start, block.end + 1) if addr in defined[block.register_type]}
+        if wanted == _covered([block]):
+            assert block.parts == ()
+            continue
+        assert len(block.parts) > 1
+        assert _covered(block.parts) == wanted
+        assert sum(part.count for part in block.parts) == len(wanted)
+        assert all(part.required == block.required and part.parts == () for part in block.parts)
+
+
+def _value(address):
+    """Register value the fake device answers for an address"""
+    return (address * 7 + 3) & 0x3FF
+
+
+def _run_poll(client, tiers=None, fail=(), defined=None, reads=None):
+    """
+    Drive one poll, answering every block except those containing an address
+    in fail (no response), or an address not in defined (Illegal Data Address).
+    """
+    poll = client._poll(tiers)
+    try:
+        block = next(poll)
+        while True:
+            if reads is not None:
+                reads.append((block.register_type, block.start, block.end))
+            if any(block.register_type == kind and block.start <= address <= block.end for kind, address in fail):
+                registers = None
+            elif defined is not None and not _covered([block]) <= defined[block.register_type]:
+                client.last_exception_code = MODBUS_EXCEPTION_ILLEGAL_ADDRESS
+                registers = None
+            else:
+                registers = [_value(address) for address in range(block.start, block.end + 1)]
+            block = poll.send(registers)
+    except StopIteration as done:
+        return done.value
+
+
+BATTERY_FIELDS = ('battery_soc', 'battery_voltage', 'charge_power')
+
+
+def test_failed_block_keeps_values_read_by_any_plan():
+    """Values read by a full poll survive a failure in a tier-only poll (and the next full poll)"""
+    client = GrowattModbusBase(register_map='SPH_TL3_3000_10000')
+    full = _run_poll(client)
+    expected = {field: getattr(full, field) for field in BATTERY_FIELDS}
+    assert all(expected.values())
+
+    fast = _run_poll(client, {POLL_TIER_FAST}, fail={('input', 1000)})
+    assert {field: getattr(fast, field) for field in BATTERY_FIELDS} == expected
+    assert set(BATTERY_FIELDS) <= client.last_poll_report.stale_fields
+
+    again = _run_poll(client, fail={('input', 1000)})
+    assert {field: getattr(again, field) for field in BATTERY_FIELDS} == expected
+    assert set(BATTERY_FIELDS) <= client.last_poll_report.stale_fields
+
+
+def test_stale_values_expire(monkeypatch):
+    """Values older than STALE_MAX_AGE are dropped instead of reported as stale"""
+    clock = [1000.0]
+    monkeypatch.setattr(growatt_modbus.time, 'monotonic', lambda: clock[0])
+    client = GrowattModbusBase(register_map='SPH_TL3_3000_10000')
+    _run_poll(client)
+
+    clock[0] += STALE_MAX_AGE + 1
+    data = _run_poll(client, fail={('input', 1000)})
+    assert [getattr(data, field) for field in BATTERY_FIELDS] == [0, 0, 0]
+    assert not set(BATTERY_FIELDS) & client.last_poll_report.stale_fields
+
+
+def test_refused_bridged_block_is_read_as_its_parts():
+    """A device refusing undefined addresses loses no data, and no range is learned as unsupported"""
+    name = 'MIN_TL_XH_3000_10000_V201'
+    registers = REGISTER_MAPS[name]
+    defined = {
+        'input': set(registers['input_registers']),
+        'holding': set(_holding_register_tiers(registers.get('holding_registers', {}))),
+    }
+    reference = _run_poll(GrowattModbusBase(register_map=name))
+
+    client = GrowattModbusBase(register_map=name)
+    reads = []
+    data = _run_poll(client, defined=defined, reads=reads)
+    assert data is not None and data.pv_total_power == reference.pv_total_power
+    assert data.battery_soc == reference.battery_soc
+    assert client.refreshed_tiers == ALL_TIERS
+    assert client.unsupported_blocks.skipped == []
+    assert ('input', 3000, 3106) in reads
+
+    # Later polls read the parts straight away
+    reads.clear()
+    for _ in range(3):
+        assert _run_poll(client, defined=defined, reads=reads) is not None
+    assert ('input', 3000, 3106) not in reads
+    assert client.unsupported_blocks.skipped == []
+
+
+def test_skipped_part_does_not_skip_its_bridged_block():
+    """Ranges learned before a restart only skip the parts they cover"""
+    name = 'MIN_TL_XH_3000_10000_V201'
+    client = GrowattModbusBase(register_map=name)
+    bridged = next(block for block in client._read_plan.input_blocks if block.start == 3000)
+    refused = bridged.parts[-1]
+    client.unsupported_blocks.restore({f"input:{refused.start}-{refused.end}": {"level": 1}}, time.monotonic())
+
+    reads = []
+    assert _run_poll(client, reads=reads) is not None
+    assert ('input', bridged.start, bridged.end) not in reads
+    assert ('input', refused.start, refused.end) not in reads
+    assert all(('input', part.start, part.end) in reads for part in bridged.parts[:-1])
+
+
+def _timed_poll(client, clock, deadline):
+    """Drive one poll where every read takes exactly its expected transaction time"""
+    link = client._read_plan.link
+    reads = []
+    poll = client._poll(None, deadline)
+    try:
+        block = next(poll)
+        while True:
+            clock[0] += link.transaction_time(block.count)
+            reads.append((block, clock[0]))
+            block = poll.send([_value(address) for address in range(block.start, block.end + 1)])
+    except StopIteration as done:
+        return reads, done.value
+
+
+def test_optional_block_is_not_started_if_it_cannot_finish_by_the_deadline(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(growatt_modbus.time, 'monotonic', lambda: clock[0])
+    client = GrowattModbusBase(register_map='SPH_TL3_3000_10000')
+    link = client._read_plan.link
+
+    started = clock[0]
+    reads, _ = _timed_poll(client, clock, None)
+    optional = [index for index, (block, _) in enumerate(reads) if not block.required]
+    assert len(optional) >= 2
+    # Deadline halfway through the second optional block
+    cut, cut_end = reads[optional[1]]
+    budget = cut_end - link.transaction_time(cut.count) / 2 - started
+
+    clock[0] += 100.0
+    deadline = clock[0] + budget
+    reads, data = _timed_poll(client, clock, deadline)
+    assert data is not None
+    assert len(reads) == optional[1]
+    assert all(end <= deadline for _, end in reads)
+    report = client.last_poll_report
+    assert report.overrun
+    assert report.unread_blocks[0] == f"{cut.register_type} {cut.start}-{cut.end}"
+
+
+def test_response_timeout_is_capped_at_the_deadline(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(growatt_modbus.time, 'monotonic', lambda: clock[0])
+    client = GrowattModbusBase(register_map='SPH_TL3_3000_10000', timeout=10)
+
+    assert client._response_timeout(None) is None             # required block
+    assert client._response_timeout(clock[0] + 30.0) is None   # configured timeout fits
+    assert client._response_timeout(clock[0] + 3.0) == 3.0
+    assert client._response_timeout(clock[0] - 1.0) == growatt_modbus.MIN_RESPONSE_TIMEOUT
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Tests for the unsupported register block cache"""
+
+from custom_components.growatt_modbus.read_plan import ReadBlock
+from custom_components.growatt_modbus.unsupported_blocks import (
+    FAILURES_TO_SKIP,
+    REPROBE_INTERVAL,
+    UnsupportedBlocks,
+)
+
+
+def _block(start, count, register_type='input'):
+    return ReadBlock(start, count, register_type, False, frozenset())
+
+
+def _learn(blocks, block, now=0.0):
+    for _ in range(FAILURES_TO_SKIP):
+        blocks.record(block, False, now, 2)
+
+
+def test_skipped_after_repeated_failures_until_reprobe():
+    blocks = UnsupportedBlocks()
+    block = _block(31000, 51)
+    blocks.record(block, False, 0.0, 2)
+    assert blocks.failing(block)
+    assert not blocks.skip(block, 1.0)
+
+    for _ in range(FAILURES_TO_SKIP - 1):
+        blocks.record(block, False, 0.0, 2)
+    assert blocks.skip(block, 1.0)
+    assert not blocks.skip(block, REPROBE_INTERVAL + 1)
+    assert blocks.skip(ReadBlock(31000, 51, 'input', True, frozenset()), 1.0) is False
+
+
+def test_matched_by_overlap_not_geometry():
+    """A block of another plan covering a skipped range is skipped and fails fast"""
+    blocks = UnsupportedBlocks()
+    _learn(blocks, _block(31000, 51))
+
+    merged = _block(31000, 120)
+    assert blocks.skip(merged, 1.0)
+    assert blocks.failing(merged)
+    assert blocks.failing(_block(31050, 1))
+    assert not blocks.failing(_block(31051, 10))
+    assert not blocks.failing(_block(31000, 51, 'holding'))
+
+
+def test_other_geometry_takes_over_history():
+    blocks = UnsupportedBlocks()
+    _learn(blocks, _block(31000, 51))
+    # Re-probed with the geometry of another plan, and still failing
+    blocks.record(_block(31000, 120), False, REPROBE_INTERVAL + 1, 2)
+    assert blocks.skipped == ["input 31000-31119 (code 2)"]
+    assert blocks.as_dict()["input:31000-31119"]["level"] == 2
+
+
+def test_success_clears_overlapping_ranges():
+    blocks = UnsupportedBlocks()
+    _learn(blocks, _block(31000, 51))
+    _learn(blocks, _block(31200, 23))
+    blocks.record(_block(31020, 10), True, 1.0)
+    assert blocks.skipped == ["input 31200-31222 (code 2)"]
+
+
+def test_stored_by_address_range():
+    blocks = UnsupportedBlocks()
+    _learn(blocks, _block(31000, 51))
+    data = blocks.as_dict()
+    assert data == {"input:31000-31050": {"level": 1, "exception_code": 2}}
+
+    restored = UnsupportedBlocks()
+    restored.restore(data, 0.0)
+    assert restored.skip(_block(31040, 80), 1.0)
+
+
+def test_restore_accepts_count_keys():
+    """Keys stored before ranges were used ("type:start:count")"""
+    restored = UnsupportedBlocks()
+    restored.restore({
+        "input:31000:51": {"level": 2, "exception_code": 2},
+        "bogus": {"level": 1},
+        "input:31300-31322": {"level": 0},
+    }, 0.0)
+    assert restored.skipped == ["input 31000-31050 (code 2)"]
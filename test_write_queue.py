@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Tests for the coalescing holding register write queue"""
+
+import asyncio
+import gc
+
+import pytest
+
+from custom_components.growatt_modbus.growatt_modbus import GrowattModbusBase
+from custom_components.growatt_modbus.write_queue import (
+    MAX_REGISTERS_PER_WRITE,
+    WriteQueue,
+    plan_write_runs,
+)
+
+DEBOUNCE = 0.05
+MAX_DELAY = 0.2
+
+
+class _Device:
+    """Records every batch the queue flushes"""
+
+    def __init__(self, fail=(), error=None):
+        self.batches = []
+        self.fail = set(fail)
+        self.error = error
+
+    async def flush(self, writes):
+        self.batches.append((asyncio.get_running_loop().time(), dict(writes)))
+        if self.error is not None:
+            raise self.error
+        return {register: register not in self.fail for register in writes}
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_plan_merges_adjacent_registers():
+    writes = {21: 3, 20: 2, 23: 5, 122: 1, 123: 0}
+    assert plan_write_runs(writes) == [(20, [2, 3]), (23, [5]), (122, [1, 0])]
+
+
+def test_plan_splits_at_the_function_16_limit():
+    writes = {register: register for register in range(MAX_REGISTERS_PER_WRITE + 2)}
+    runs = plan_write_runs(writes)
+    assert [(start, len(values)) for start, values in runs] == [(0, MAX_REGISTERS_PER_WRITE), (MAX_REGISTERS_PER_WRITE, 2)]
+
+
+def test_plan_without_write_multiple_writes_one_register_each():
+    assert plan_write_runs({20: 2, 21: 3}, write_multiple=False) == [(20, [2]), (21, [3])]
+    # Function 16 is opt-in per profile
+    client = GrowattModbusBase(register_map='SPH_TL3_3000_10000')
+    assert client._write_runs({122: 1, 123: 0}) == [(122, [1]), (123, [0])]
+
+
+def test_writes_within_the_debounce_are_one_batch():
+    device = _Device()
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        started = asyncio.get_running_loop().time()
+        first = asyncio.ensure_future(queue.write(20, 1))
+        await asyncio.sleep(DEBOUNCE / 2)
+        results = await asyncio.gather(first, queue.write(21, 2))
+        return started, results
+
+    started, results = _run(scenario())
+    assert results == [True, True]
+    assert [writes for _, writes in device.batches] == [{20: 1, 21: 2}]
+    # Flushed a full debounce after the last write
+    assert device.batches[0][0] - started >= DEBOUNCE * 1.5
+
+
+def test_last_value_wins():
+    device = _Device()
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        return await asyncio.gather(queue.write(20, 1), queue.write(20, 7))
+
+    assert _run(scenario()) == [True, True]
+    assert [writes for _, writes in device.batches] == [{20: 7}]
+
+
+def test_continuous_writes_are_flushed_after_max_delay():
+    device = _Device()
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        started = asyncio.get_running_loop().time()
+        pending = []
+        for value in range(int(MAX_DELAY / (DEBOUNCE / 2)) + 4):
+            pending.append(asyncio.ensure_future(queue.write(20, value)))
+            await asyncio.sleep(DEBOUNCE / 2)
+        await asyncio.gather(*pending)
+        return started
+
+    started = _run(scenario())
+    assert len(device.batches) >= 2
+    assert device.batches[0][0] - started == pytest.approx(MAX_DELAY, abs=DEBOUNCE)
+
+
+def test_failures_reach_the_waiters_of_their_registers():
+    device = _Device(fail={21})
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        return await asyncio.gather(queue.write(20, 1), queue.write(21, 2), queue.write(21, 3))
+
+    assert _run(scenario()) == [True, False, False]
+
+
+def test_flush_exception_fails_every_waiter():
+    device = _Device(error=ConnectionError("link down"))
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        results = await asyncio.gather(queue.write(20, 1), queue.write(21, 2))
+        # The queue keeps working after a failed batch
+        device.error = None
+        return results, await queue.write(22, 3)
+
+    assert _run(scenario()) == ([False, False], True)
+
+
+def test_timer_flush_task_is_kept_until_done():
+    release = None
+
+    async def slow_flush(writes):
+        await release.wait()
+        return {register: True for register in writes}
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        queue = WriteQueue(slow_flush, DEBOUNCE, MAX_DELAY)
+        pending = asyncio.ensure_future(queue.write(20, 1))
+        await asyncio.sleep(DEBOUNCE * 2)
+        running = len(queue._tasks)
+        gc.collect()
+        release.set()
+        result = await pending
+        await asyncio.sleep(0)
+        return running, result, len(queue._tasks)
+
+    assert _run(scenario()) == (1, True, 0)
+
+
+def test_cancelled_flush_answers_its_waiters():
+    async def hanging_flush(writes):
+        await asyncio.Event().wait()
+
+    async def scenario():
+        queue = WriteQueue(hanging_flush, DEBOUNCE, MAX_DELAY)
+        pending = asyncio.ensure_future(queue.write(20, 1))
+        await asyncio.sleep(DEBOUNCE * 2)
+        for task in list(queue._tasks):
+            task.cancel()
+        return await asyncio.wait_for(pending, 1.0)
+
+    assert _run(scenario()) is False
+
+
+def test_shutdown_writes_what_is_queued_and_refuses_later_writes():
+    device = _Device()
+
+    async def scenario():
+        queue = WriteQueue(device.flush, DEBOUNCE, MAX_DELAY)
+        pending = asyncio.ensure_future(queue.write(20, 1))
+        await asyncio.sleep(0)
+        await queue.async_shutdown()
+        # The debounce timer did not fire a second flush
+        await asyncio.sleep(DEBOUNCE * 2)
+        return await pending, await queue.write(21, 2), queue._timer, queue._tasks
+
+    assert _run(scenario()) == (True, False, None, set())
+    assert [writes for _, writes in device.batches] == [{20: 1}]